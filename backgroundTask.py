@@ -0,0 +1,97 @@
+import threading
+import queue
+
+class TaskCancelled(Exception):
+    '''
+    Raised inside of the worker thread by the progress callback when the task was cancelled
+    '''
+    pass
+
+class BackgroundTask():
+    '''
+    Runs function in a worker thread so tkinter main loop is not blocked. Function gets progressCallback keyword argument - its calls are passed to the
+    main loop through a queue (tkinter widgets must not be used from other threads) and it raises TaskCancelled when the task was cancelled.
+    Result of the function is handed back to the main loop with onDone callback.
+    '''
+    POLL_INTERVAL = 50 # ms
+
+    def __init__(self, widget, function, args=(), onProgress=None, onDone=None, onError=None):
+        '''
+        Creates BackgroundTask instance. Attributes:
+            self.widget - tkinter widget used for polling the queue with after()
+            self.function - function executed in worker thread. It must accept progressCallback keyword argument
+            self.args - positional arguments of the function
+            self.onProgress - function called in the main loop with arguments passed to progressCallback
+            self.onDone - function called in the main loop with result of the function
+            self.onError - function called in the main loop with exception raised by the function
+            self.events - queue of (eventType, data) passed from worker thread to the main loop
+            self.cancelEvent - threading.Event set when the task is cancelled
+        '''
+        self.widget = widget
+        self.function = function
+        self.args = args
+        self.onProgress = onProgress
+        self.onDone = onDone
+        self.onError = onError
+        self.events = queue.Queue()
+        self.cancelEvent = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        '''
+        Starts worker thread and polling of the events queue
+        '''
+        self.thread.start()
+        self.widget.after(BackgroundTask.POLL_INTERVAL, self._poll)
+
+    def cancel(self):
+        '''
+        Cancels the task. Callbacks are not called after cancelling and worker thread stops at the next progressCallback call
+        '''
+        self.cancelEvent.set()
+
+    def isCancelled(self):
+        return self.cancelEvent.is_set()
+
+    def _reportProgress(self, *args):
+        '''
+        progressCallback passed to the function. Runs in worker thread
+        '''
+        if self.cancelEvent.is_set():
+            raise TaskCancelled()
+        self.events.put(('progress', args))
+
+    def _run(self):
+        '''
+        Body of worker thread
+        '''
+        try:
+            result = self.function(*self.args, progressCallback=self._reportProgress)
+            self.events.put(('done', result))
+        except TaskCancelled:
+            pass
+        except Exception as e:
+            self.events.put(('error', e))
+
+    def _poll(self):
+        '''
+        Passes events from worker thread to the callbacks. Runs in the main loop until the task is finished or cancelled
+        '''
+        while not self.cancelEvent.is_set():
+            try:
+                eventType, data = self.events.get_nowait()
+            except queue.Empty:
+                self.widget.after(BackgroundTask.POLL_INTERVAL, self._poll)
+                return
+
+            if eventType == 'progress':
+                if self.onProgress:
+                    self.onProgress(*data)
+            elif eventType == 'done':
+                if self.onDone:
+                    self.onDone(data)
+                return
+            elif eventType == 'error':
+                if self.onError:
+                    self.onError(data)
+                return
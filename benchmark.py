@@ -0,0 +1,280 @@
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy') # rendering does not need a window
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import pygame
+import boardGenerator
+import schematicLoader
+import camcadFileLoader
+import gencadFileLoader
+import obpPlusPlusv7FileLoader
+import drawBoardEngine
+
+class BoardBenchmark():
+    '''
+    Benchmark of parsing and rendering. Synthetic boards (boardGenerator.SyntheticBoardGenerator) of every size are written in every format and measured:
+    stages of the loader (sections of the file and matching of parsed data), Board.__init__, every render* pass of both sides, renderImage with and
+    without cached tiles, findComponentUsingClick, findComponentUsingName and hand-off of the frame to tkinter (BoardNavigator.drawBoard).
+    Every measurement is repeated and reported as min, median and max time in seconds, so results can be saved as JSON and compared.
+    '''
+    FORMATS = ('.cad', '.gcd', '.tgz')
+    RENDER_PASSES = ('renderBoard', 'renderHoles', 'renderTestPoints', 'renderComponents')
+    QUERIES_COUNT = 1000 # number of calls of findComponentUsingClick and findComponentUsingName in one measurement
+
+    def __init__(self, partsCounts=(1000, 10000, 100000), netsCount=10000, formats=FORMATS, repeat=3, seed=0, directory=None, testPointPrefix='TP'):
+        '''
+        Creates BoardBenchmark instance. Attributes:
+            self.partsCounts - sizes of generated boards (number of parts)
+            self.netsCount - number of nets of generated boards
+            self.formats - extensions of generated files ('.cad', '.gcd', '.tgz')
+            self.repeat - number of repetitions of every measurement
+            self.seed - seed of generated boards and queries
+            self.directory - directory of generated files (None -> temporary directory removed after the benchmark)
+            self.testPointPrefix - prefix of names of test points
+        '''
+        self.partsCounts = tuple(partsCounts)
+        self.netsCount = netsCount
+        self.formats = tuple(formats)
+        self.repeat = repeat
+        self.seed = seed
+        self.directory = directory
+        self.testPointPrefix = testPointPrefix
+
+    @staticmethod
+    def _getStatistics(times):
+        return {'min': min(times), 'median': statistics.median(times), 'max': max(times), 'repeat': len(times)}
+
+    def _measure(self, function, *args):
+        '''
+        Calls the function self.repeat times. Returns result of the last call and statistics of its times
+        '''
+        times = []
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            result = function(*args)
+            times.append(time.perf_counter() - start)
+        return result, BoardBenchmark._getStatistics(times)
+
+    def _measureStages(self, function, *args):
+        '''
+        Calls the function self.repeat times. The function must return dict (stageName: seconds). Returns statistics of every stage
+        '''
+        stageTimes = {}
+        for _ in range(self.repeat):
+            for stageName, seconds in function(*args).items():
+                stageTimes.setdefault(stageName, []).append(seconds)
+        return {stageName: BoardBenchmark._getStatistics(times) for stageName, times in stageTimes.items()}
+
+    @staticmethod
+    def _timeLoaderStages(filePath, testPointPrefix):
+        '''
+        Loads the file in the same steps as loadSchematic method of its loader. Returns dict (stageName: seconds) - 'section {name}' stages are
+        measured with progressCallback (time between beginnings of sections, the last section ends when the file is read), other stages are methods
+        that match parsed data
+        '''
+        stages = {}
+        sectionStarts = []
+        progressCallback = lambda sectionName, stepNumber, stepsCount: sectionStarts.append((sectionName, time.perf_counter()))
+
+        def timeStage(stageName, function, *args, **kwargs):
+            start = time.perf_counter()
+            result = function(*args, **kwargs)
+            stages[stageName] = time.perf_counter() - start
+            return result
+
+        def addSectionStages(end):
+            for i, (sectionName, start) in enumerate(sectionStarts):
+                sectionEnd = sectionStarts[i + 1][1] if i + 1 < len(sectionStarts) else end
+                stages[f'section {sectionName}'] = sectionEnd - start
+
+        extension = os.path.splitext(filePath)[1].lower()
+        if extension == '.cad':
+            loader = camcadFileLoader.CamCADLoader()
+            loader.openFile(filePath, '', progressCallback)
+            addSectionStages(time.perf_counter())
+            timeStage('getNets', loader.getNets)
+            timeStage('getPads', loader.getPads)
+            timeStage('getComponents', loader.getComponents)
+            timeStage('getPackages', loader.getPackages)
+            timeStage('getBoardOutlines', loader.getBoardOutlines)
+            timeStage('getHoles', loader.getHoles)
+        elif extension == '.gcd':
+            loader = gencadFileLoader.GenCADLoader()
+            loader.openFile(filePath, '', progressCallback)
+            addSectionStages(time.perf_counter())
+            timeStage('getNets', loader.getNets)
+            timeStage('getShapes', loader.getShapes)
+            timeStage('getComponents', loader.getComponents)
+            timeStage('getHoles', loader.getHoles)
+            timeStage('getBoardOutlines', loader.getBoardOutlines)
+        elif extension == '.tgz':
+            loader = obpPlusPlusv7FileLoader.OdbPlusPlusv7FileLoader(testPointPrefix)
+            loader.getFile(filePath, '')
+            loader.readFile(progressCallback)
+            addSectionStages(time.perf_counter())
+            boardOutlines = timeStage('getBoardOutlines', loader.getBoardOutlines)
+            maxX = timeStage('findComponentLayerScale', loader.findComponentLayerScale)
+            scalingFactor = boardOutlines['AREA'][1][0] / maxX if 'profile' not in loader.dimensionFile else 1
+            _, pins = timeStage('getComponents', loader.getComponents, scalingFactor=scalingFactor)
+            timeStage('getNets', loader.getNets, pins)
+            timeStage('getHoles', loader.getHoles)
+        return stages
+
+    @staticmethod
+    def _timeRenderPasses(board, side):
+        '''
+        Renders static layer of the side pass by pass (like Board.renderStaticLayer) into surface of the board size. Returns dict (passName: seconds)
+        '''
+        surface = pygame.Surface((drawBoardEngine.Board.WIDTH, drawBoardEngine.Board.HEIGHT))
+        stages = {}
+        for passName in BoardBenchmark.RENDER_PASSES:
+            start = time.perf_counter()
+            getattr(board, passName)(surface, side)
+            stages[passName] = time.perf_counter() - start
+        return stages
+
+    @staticmethod
+    def _renderImage(board, side, surface, clearTiles):
+        '''
+        Renders the frame like BoardNavigator.drawBoard (createLayers -> updateLayers -> renderImage). If clearTiles is True tiles of static layer are rendered again
+        '''
+        if clearTiles:
+            board.clearStaticLayers()
+        board.createLayers(side)
+        board.updateLayers((side, (False, (None, None))), (None, drawBoardEngine.Board.GRAY), [])
+        board.renderImage(surface)
+
+    def _measurePerCall(self, function, argumentsList):
+        '''
+        Calls the function with every arguments of argumentsList self.repeat times. Returns statistics of mean time of one call
+        '''
+        def callAll():
+            for arguments in argumentsList:
+                function(*arguments)
+        _, callsStatistics = self._measure(callAll)
+        return {key: value / len(argumentsList) if key != 'repeat' else value for key, value in callsStatistics.items()}
+
+    def _createFramePresenter(self):
+        '''
+        Returns tkinter root and framePresenter.FramePresenter of the board size or (None, None) if tkinter cannot create a window (e.g. no display)
+        '''
+        try:
+            import tkinter as tk
+            import framePresenter
+            root = tk.Tk()
+            root.withdraw()
+        except Exception:
+            return None, None
+        size = drawBoardEngine.Board.WIDTH, drawBoardEngine.Board.HEIGHT
+        canvas = tk.Canvas(root, width=size[0], height=size[1])
+        return root, framePresenter.FramePresenter(canvas, size, (size[0] // 2, size[1] // 2))
+
+    def benchmarkBoard(self, components, nets, holes, boardOutlines, presenter=None):
+        '''
+        Measures Board.__init__, render passes, renderImage, finding components and (if presenter is given) frame hand-off to tkinter. Returns dict of results
+        '''
+        results = {}
+        board, results['Board.__init__'] = self._measure(drawBoardEngine.Board, components, nets, holes, boardOutlines, False, self.testPointPrefix)
+        results['batchRendering'] = board.batchRendering
+
+        results['renderPasses'] = {side: self._measureStages(BoardBenchmark._timeRenderPasses, board, side) for side in ('T', 'B')}
+
+        surface = pygame.Surface((drawBoardEngine.Board.WIDTH, drawBoardEngine.Board.HEIGHT))
+        _, results['renderImage (cold tiles)'] = self._measure(BoardBenchmark._renderImage, board, 'T', surface, True)
+        _, results['renderImage (cached tiles)'] = self._measure(BoardBenchmark._renderImage, board, 'T', surface, False)
+
+        ## queries - random points of the screen and random names (10% of them do not exist)
+        randomGenerator = random.Random(self.seed)
+        width, height = surface.get_size()
+        clicks = [(board.boardLayer, (randomGenerator.uniform(0, width), randomGenerator.uniform(0, height)), randomGenerator.choice('TB'))
+                  for _ in range(BoardBenchmark.QUERIES_COUNT)]
+        results['findComponentUsingClick'] = self._measurePerCall(board.findComponentUsingClick, clicks)
+
+        componentNames = list(components)
+        names = [(board.boardLayer, randomGenerator.choice(componentNames) if randomGenerator.random() > 0.1 else 'MISSING', False)
+                 for _ in range(BoardBenchmark.QUERIES_COUNT)]
+        results['findComponentUsingName'] = self._measurePerCall(board.findComponentUsingName, names)
+
+        ## BoardNavigator.drawBoard - frame rendered into the presenter surface and pasted into tkinter PhotoImage
+        if presenter:
+            _, results['drawBoard renderImage'] = self._measure(BoardBenchmark._renderImage, board, 'T', presenter.surface, False)
+            _, results['drawBoard present'] = self._measure(presenter.present)
+        else:
+            results['drawBoard renderImage'] = results['drawBoard present'] = None
+        return results
+
+    def run(self, progressCallback=None):
+        '''
+        Runs the benchmark. Returns dict with environment, parameters and list of results (one for every size and format)
+            progressCallback - function called before each file is measured with arguments (filePath, stepNumber, stepsCount)
+        '''
+        progress = progressCallback or (lambda filePath, stepNumber, stepsCount: None)
+        report = {'environment': {'python': platform.python_version(), 'platform': platform.platform(), 'processors': os.cpu_count(),
+                                  'pygame': pygame.version.ver, 'numpy': drawBoardEngine.numpy.__version__ if drawBoardEngine.numpy else None},
+                  'parameters': {'partsCounts': list(self.partsCounts), 'netsCount': self.netsCount, 'formats': list(self.formats), 'repeat': self.repeat,
+                                 'seed': self.seed, 'screen': [drawBoardEngine.Board.WIDTH, drawBoardEngine.Board.HEIGHT], 'queries': BoardBenchmark.QUERIES_COUNT},
+                  'results': []}
+
+        root, presenter = self._createFramePresenter()
+        temporaryDirectory = None if self.directory else tempfile.TemporaryDirectory()
+        directory = self.directory or temporaryDirectory.name
+        try:
+            os.makedirs(directory, exist_ok=True)
+            stepsCount = len(self.partsCounts) * len(self.formats)
+            for partsCount in self.partsCounts:
+                generator = boardGenerator.SyntheticBoardGenerator(partsCount, self.netsCount, self.seed, self.testPointPrefix)
+                for extension in self.formats:
+                    filePath = os.path.join(directory, f'synthetic_{partsCount}{extension}')
+                    progress(filePath, len(report['results']), stepsCount)
+                    result = {'format': extension, 'parts': partsCount, 'nets': self.netsCount}
+
+                    start = time.perf_counter()
+                    generator.write(filePath)
+                    result['generate'] = time.perf_counter() - start
+                    result['fileSize'] = os.path.getsize(filePath)
+
+                    result['loaderStages'] = self._measureStages(BoardBenchmark._timeLoaderStages, filePath, self.testPointPrefix)
+                    schematicData, result['loadSchematic'] = self._measure(lambda: schematicLoader.SchematicLoader.loadSchematic(filePath, testPointPrefix=self.testPointPrefix, useCache=False))
+                    components, nets, holes, boardOutlines, _, _ = schematicData
+                    result['components'], result['holes'] = len(components), len(holes)
+
+                    result.update(self.benchmarkBoard(components, nets, holes, boardOutlines, presenter))
+                    report['results'].append(result)
+        finally:
+            if temporaryDirectory:
+                temporaryDirectory.cleanup()
+            if root:
+                root.destroy()
+        return report
+
+def main(arguments=None):
+    '''
+    Command line interface of BoardBenchmark. Saves results as JSON file (or prints them if output is '-')
+    '''
+    parser = argparse.ArgumentParser(description='Benchmark of loaders and rendering with synthetic boards')
+    parser.add_argument('-p', '--parts', nargs='+', type=int, default=[1000, 10000, 100000], help='numbers of parts of generated boards (default: 1000 10000 100000)')
+    parser.add_argument('-n', '--nets', type=int, default=10000, help='number of nets of generated boards (default: 10000)')
+    parser.add_argument('-f', '--formats', nargs='+', choices=BoardBenchmark.FORMATS, default=BoardBenchmark.FORMATS, help='formats of generated files')
+    parser.add_argument('-r', '--repeat', type=int, default=3, help='repetitions of every measurement (default: 3)')
+    parser.add_argument('--seed', type=int, default=0, help='seed of generated boards (default: 0)')
+    parser.add_argument('-d', '--directory', default=None, help='directory for generated files (default: temporary directory)')
+    parser.add_argument('-o', '--output', default='benchmark.json', help='output JSON file, - for standard output (default: benchmark.json)')
+    arguments = parser.parse_args(arguments)
+
+    benchmark = BoardBenchmark(arguments.parts, arguments.nets, arguments.formats, arguments.repeat, arguments.seed, arguments.directory)
+    report = benchmark.run(lambda filePath, stepNumber, stepsCount: print(f'[{stepNumber + 1}/{stepsCount}] {filePath}', file=sys.stderr))
+
+    if arguments.output == '-':
+        json.dump(report, sys.stdout, indent=2)
+    else:
+        with open(arguments.output, 'w') as file:
+            json.dump(report, file, indent=2)
+
+if __name__ == '__main__':
+    main()
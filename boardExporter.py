@@ -0,0 +1,193 @@
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy') # rendering does not need a window
+import argparse
+import concurrent.futures
+import pygame
+import schematicLoader
+import drawBoardEngine
+
+class BoardExporter():
+    '''
+    Renders views of the board (top and bottom side) to image files without window (headless). Many schematic files are rendered in a process pool,
+    one file per process, so each CPU core loads and renders its own board.
+    '''
+    SIDE_NAMES = {'T': 'top', 'B': 'bottom'}
+    MAX_WORKERS = None # None -> number of processors
+
+    def __init__(self, size=(drawBoardEngine.Board.WIDTH, drawBoardEngine.Board.HEIGHT), sides=('T', 'B'), highlightedNets=(), markers=(),
+                 componentsCustomScale=1, forceHoles=False, testPointPrefix='TP', imageFormat='png'):
+        '''
+        Creates BoardExporter instance. Attributes:
+            self.size - (width, height) of exported images in px
+            self.sides - sides of the board that are exported ('T' and/or 'B')
+            self.highlightedNets - names of nets which components are marked with circles
+            self.markers - names of components, test points or holes pointed with marker
+            self.componentsCustomScale - scale of components' cases (see drawBoardEngine.Board.setComponentsCustomScale)
+            self.forceHoles - If true then holes have constant radius (see drawBoardEngine.Board)
+            self.testPointPrefix - Unique prefix that is common for all testpoints
+            self.imageFormat - extension of exported images (format is recognized by pygame.image.save)
+        '''
+        self.size = tuple(size)
+        self.sides = tuple(sides)
+        self.highlightedNets = tuple(highlightedNets)
+        self.markers = tuple(markers)
+        self.componentsCustomScale = componentsCustomScale
+        self.forceHoles = forceHoles
+        self.testPointPrefix = testPointPrefix
+        self.imageFormat = imageFormat
+
+    @staticmethod
+    def getOutputName(filePath):
+        '''
+        Returns name of images of the file without side name: '{file name}_{extension}', so files of different formats do not overwrite images of each other
+        '''
+        baseName, extension = os.path.splitext(os.path.basename(filePath))
+        return f'{baseName}_{extension[1:]}' if extension else baseName
+
+    @staticmethod
+    def getOutputNames(filePaths):
+        '''
+        Returns dict (filePath: output name) of many files. Output names are relative to the common directory of the files, so images of files with the same
+        name in different directories are saved in the same subdirectories of the output directory. Files which images would overwrite images of a previous
+        file (names that differ only in letter case are treated as equal) are mapped to ValueError
+        '''
+        directories = [os.path.dirname(os.path.abspath(filePath)) for filePath in filePaths]
+        commonDirectory = os.path.commonpath(directories) if directories else ''
+
+        outputNames = {}
+        usedNames = {}
+        for filePath, directory in zip(filePaths, directories):
+            outputName = os.path.normpath(os.path.join(os.path.relpath(directory, commonDirectory), BoardExporter.getOutputName(filePath)))
+            if outputName.lower() in usedNames:
+                outputNames[filePath] = ValueError(f'images would overwrite images of {usedNames[outputName.lower()]}')
+            else:
+                outputNames[filePath] = outputName
+                usedNames[outputName.lower()] = filePath
+        return outputNames
+
+    def exportFile(self, filePath, outputDirectory, outputName=None):
+        '''
+        Loads schematic file and saves image of each side to outputDirectory as '{output name}_{side name}.{format}'. Returns list of saved file paths
+            filePath - path of schematic file (any format recognized by schematicLoader.SchematicLoader)
+            outputDirectory - directory of images. It is created if it does not exist
+            outputName - name of images without side name, may contain subdirectories (None -> getOutputName(filePath))
+        '''
+        schematicData = schematicLoader.SchematicLoader.loadSchematic(os.path.abspath(filePath), testPointPrefix=self.testPointPrefix)
+        if schematicData is None:
+            raise ValueError('unknown format of schematic file')
+        components, nets, holes, boardOutlines, _, _ = schematicData
+
+        ## size of the view is read by Board constructor (base scale and offsets)
+        previousSize = drawBoardEngine.Board.WIDTH, drawBoardEngine.Board.HEIGHT
+        drawBoardEngine.Board.WIDTH, drawBoardEngine.Board.HEIGHT = self.size
+        try:
+            board = drawBoardEngine.Board(components, nets, holes, boardOutlines, self.forceHoles, self.testPointPrefix)
+            board.setComponentsCustomScale(self.componentsCustomScale)
+
+            outputPath = os.path.join(outputDirectory, outputName or BoardExporter.getOutputName(filePath))
+            os.makedirs(os.path.dirname(outputPath), exist_ok=True)
+            _, netBoardComponents = board.buildNetIndexes()
+            imagePaths = []
+            for side in self.sides:
+                imagePath = f'{outputPath}_{BoardExporter.SIDE_NAMES[side]}.{self.imageFormat}'
+                pygame.image.save(self.renderSide(board, side, netBoardComponents), imagePath)
+                imagePaths.append(imagePath)
+        finally:
+            drawBoardEngine.Board.WIDTH, drawBoardEngine.Board.HEIGHT = previousSize
+        return imagePaths
+
+    def renderSide(self, board, side, netBoardComponents=None):
+        '''
+        Renders default view of one side of the board with highlighted nets and markers. Returns pygame surface
+            board - drawBoardEngine.Board instance created with Board.WIDTH, Board.HEIGHT equal to self.size
+            side - 'T' or 'B'
+            netBoardComponents - components of nets returned by board.buildNetIndexes (None -> indexes are built, pass them when rendering many sides)
+        '''
+        surface = pygame.Surface(self.size)
+        board.createLayers(side)
+
+        ## components (and test points) of highlighted nets
+        if netBoardComponents is None:
+            _, netBoardComponents = board.buildNetIndexes()
+        netComponents = []
+        for netName in self.highlightedNets:
+            netComponents += [(component.coords, component.side) for component in netBoardComponents.get(netName, [])]
+
+        markerData = False, (None, None)
+        board.updateLayers((side, markerData), (None, drawBoardEngine.Board.GRAY), netComponents)
+        board.renderImage(surface)
+
+        ## markers - holes go through the board, so they are pointed on both sides
+        offsetX, offsetY = board.xMoveOffset, board.yMoveOffset
+        for markerName in self.markers:
+            (markerX, markerY), markerSide = board.findComponentUsingName(board.boardLayer, markerName, ignoreCase=True)
+            if markerSide is None:
+                markerX, markerY = board.findHoleUsingName(board.boardLayer, markerName, invertX=side == 'T')
+            elif markerSide != side:
+                continue
+            if markerX is not None:
+                board.renderMarker(surface, (markerX + offsetX, markerY + offsetY))
+        return surface
+
+    def exportFiles(self, filePaths, outputDirectory, workers=MAX_WORKERS):
+        '''
+        Exports images of many schematic files in a process pool. Returns dict (filePath: list of saved image paths or exception raised while exporting the file),
+        so one broken file does not stop the export of the others. Images are named by getOutputNames - files which images would overwrite images of
+        another file are not exported and their result is ValueError
+            filePaths - paths of schematic files
+            outputDirectory - directory of images
+            workers - number of processes (None -> number of processors, 1 -> files are exported in this process)
+        '''
+        outputNames = BoardExporter.getOutputNames(list(dict.fromkeys(filePaths)))
+        results = {filePath: outputName for filePath, outputName in outputNames.items() if isinstance(outputName, Exception)}
+        outputNames = {filePath: outputName for filePath, outputName in outputNames.items() if filePath not in results}
+        if workers == 1:
+            for filePath, outputName in outputNames.items():
+                try:
+                    results[filePath] = self.exportFile(filePath, outputDirectory, outputName)
+                except Exception as exception:
+                    results[filePath] = exception
+            return results
+
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(self.exportFile, filePath, outputDirectory, outputName): filePath for filePath, outputName in outputNames.items()}
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    results[futures[future]] = future.result()
+                except Exception as exception:
+                    results[futures[future]] = exception
+        return results
+
+def main(arguments=None):
+    '''
+    Command line interface of BoardExporter. Returns exit code (0 - all files exported, 1 - some files failed)
+    '''
+    parser = argparse.ArgumentParser(description='Exports images of top and bottom side of schematic files without window')
+    parser.add_argument('files', nargs='+', help='schematic files (.cad, .gcd, .tgz, .bnb)')
+    parser.add_argument('-o', '--output', default='Export', help='output directory (default: Export)')
+    parser.add_argument('-s', '--size', nargs=2, type=int, default=(drawBoardEngine.Board.WIDTH, drawBoardEngine.Board.HEIGHT), metavar=('WIDTH', 'HEIGHT'), help='resolution of images in px')
+    parser.add_argument('--sides', nargs='+', choices=('T', 'B'), default=('T', 'B'), help='exported sides (default: T B)')
+    parser.add_argument('-n', '--net', action='append', default=[], dest='nets', help='highlighted net (can be repeated)')
+    parser.add_argument('-m', '--marker', action='append', default=[], dest='markers', help='component, test point or hole pointed with marker (can be repeated)')
+    parser.add_argument('--scale', type=float, default=1, help='scale of components\' cases')
+    parser.add_argument('--force-holes', action='store_true', help='draw holes with constant radius')
+    parser.add_argument('--prefix', default='TP', help='prefix of test points (default: TP)')
+    parser.add_argument('--format', default='png', help='format of images (default: png)')
+    parser.add_argument('-j', '--jobs', type=int, default=BoardExporter.MAX_WORKERS, help='number of processes (default: number of processors)')
+    arguments = parser.parse_args(arguments)
+
+    exporter = BoardExporter(arguments.size, arguments.sides, arguments.nets, arguments.markers, arguments.scale, arguments.force_holes, arguments.prefix, arguments.format)
+    results = exporter.exportFiles(arguments.files, arguments.output, arguments.jobs)
+
+    exitCode = 0
+    for filePath in arguments.files:
+        result = results[filePath]
+        if isinstance(result, Exception):
+            print(f'{filePath}: {type(result).__name__}: {result}')
+            exitCode = 1
+        else:
+            print(f'{filePath}: {", ".join(result)}')
+    return exitCode
+
+if __name__ == '__main__':
+    raise SystemExit(main())
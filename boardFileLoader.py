@@ -0,0 +1,400 @@
+import os
+import sys
+import mmap
+import array
+import struct
+import math
+import argparse
+import collections.abc
+import boardObjects
+
+class BoardFileLoader():
+    '''
+    Loader of the native board file (.bnb). Data is stored in fixed-width columns (like boardObjects.BoardModel) and texts are stored once in
+    a string table (offsets + utf-8 data) and referenced by index. File is opened with mmap and stays mapped while the loaded components are used:
+    components are returned as BoardFileComponents, which columns are read by drawBoardEngine.Board without copying, so only pages that are read are loaded
+    and texts are decoded on first use.
+    Layout of the file:
+        header - magic, version, byte order, number of columns
+        columns directory - (name, typecode, offset, count) of every column
+        columns data - every column starts at offset aligned to 8 bytes
+    '''
+    FILE_EXTENSION = '.bnb'
+    MAGIC = b'BNBOARD\0'
+    VERSION = 2
+    HEADER = struct.Struct('<8sHH4xI')
+    COLUMN_ENTRY = struct.Struct('<32s8sQQ')
+    ALIGNMENT = 8
+    NONE_INDEX = 0xFFFFFFFF # string index of None values. None coords are stored as NaN
+    COMPONENT_COLUMNS = ('NAME_INDEX', 'SIDE_INDEX', 'CASE_NAME_INDEX', 'SHAPE_INDEX', 'ANGLE_TEXT_INDEX', 'X', 'Y', 'ANGLE', 'CASE_X1', 'CASE_Y1', 'CASE_X2', 'CASE_Y2')
+    MODEL_COLUMNS = {'nameIndex': 'NAME_INDEX', 'sideIndex': 'SIDE_INDEX', 'caseNameIndex': 'CASE_NAME_INDEX', 'shapeIndex': 'SHAPE_INDEX', 'x': 'X', 'y': 'Y',
+                     'angle': 'ANGLE', 'caseX1': 'CASE_X1', 'caseY1': 'CASE_Y1', 'caseX2': 'CASE_X2', 'caseY2': 'CASE_Y2'} # boardObjects.BoardModel column: file column
+
+    def __init__(self):
+        '''
+        Creates BoardFileLoader instance. Attributes:
+            self.file, self.mmap - opened file and its memory map
+            self.columns - dict of columns in file (columnName: (typecode, offset, count))
+            self.views - list of memoryviews of self.mmap. They must be released before the map is closed
+            self.stringOffsets, self.stringDataOffset - column of offsets of texts in the string table and offset of the string table in file
+            self.strings - list of decoded texts of the string table (None if text was not decoded yet)
+            self.stringTable - sequence of texts (decoded on first use) used by boardObjects.BoardModel of the file
+        '''
+        self.file = None
+        self.mmap = None
+        self.columns = {}
+        self.views = []
+        self.stringOffsets = None
+        self.stringDataOffset = 0
+        self.strings = []
+        self.stringTable = BoardFileStrings(self)
+
+    def loadSchematic(self, name, path='Schematic', progressCallback=None):
+        '''
+        Opens a .bnb file and returns components (BoardFileComponents - read-only dict read from the mapped columns), dict of nets, dict of holes and
+        list of board vertexes. File stays mapped until the components are released. For manual processig of file use (openFile, getComponents, getNets,
+        getHoles, getBoardOutlines, close methods)
+            progressCallback - function called before each group of columns is read with arguments (groupName, stepNumber, stepsCount)
+        '''
+        progress = progressCallback or (lambda groupName, stepNumber, stepsCount: None)
+        self.openFile(name, path)
+        try:
+            progress('COMPONENTS', 0, 4)
+            components = self.getComponents()
+            progress('NETS', 1, 4)
+            nets = self.getNets()
+            progress('HOLES', 2, 4)
+            holes = self.getHoles()
+            progress('BOARD', 3, 4)
+            boardOutlines = self.getBoardOutlines()
+        except BaseException:
+            self.close()
+            raise
+
+        return components, nets, holes, boardOutlines, None, None
+
+    def openFile(self, name, path='Schematic'):
+        '''
+        Opens a .bnb file with mmap and reads directory of columns. Raises ValueError if the file is not a board file of known version
+        '''
+        filePath = os.path.join(os.getcwd(), path, name)
+        self.file = open(filePath, 'rb')
+        try:
+            self.mmap = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, isLittleEndian, columnsCount = BoardFileLoader.HEADER.unpack_from(self.mmap, 0)
+            if magic != BoardFileLoader.MAGIC or version != BoardFileLoader.VERSION:
+                raise ValueError(f'{name} is not a board file of version {BoardFileLoader.VERSION}')
+            if bool(isLittleEndian) != (sys.byteorder == 'little'):
+                raise ValueError(f'{name} was saved with different byte order')
+
+            for i in range(columnsCount):
+                entryOffset = BoardFileLoader.HEADER.size + i * BoardFileLoader.COLUMN_ENTRY.size
+                columnName, typecode, offset, count = BoardFileLoader.COLUMN_ENTRY.unpack_from(self.mmap, entryOffset)
+                self.columns[columnName.rstrip(b'\0').decode('ascii')] = typecode.rstrip(b'\0').decode('ascii'), offset, count
+        except BaseException:
+            self.close()
+            raise
+
+        self.stringOffsets = self.getColumn('STRING_OFFSETS')
+        self.stringDataOffset = self.columns['STRING_DATA'][1]
+        self.strings = [None] * (len(self.stringOffsets) - 1)
+
+    def close(self):
+        '''
+        Releases views of the columns and closes the file. Components returned by getComponents cannot be read after closing
+        '''
+        for view in reversed(self.views):
+            view.release()
+        self.views = []
+        if self.mmap is not None:
+            self.mmap.close()
+            self.mmap = None
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def getColumn(self, columnName):
+        '''
+        Returns column as a memoryview of the mapped file (no data is copied). Valid until close is called
+        '''
+        typecode, offset, count = self.columns[columnName]
+        itemSize = struct.calcsize(typecode)
+        view = memoryview(self.mmap)[offset:offset + count * itemSize]
+        columnView = view.cast(typecode)
+        self.views += [view, columnView]
+        return columnView
+
+    def getString(self, index):
+        '''
+        Returns text of the string table (None for NONE_INDEX). Texts are decoded on first use
+        '''
+        if index == BoardFileLoader.NONE_INDEX:
+            return None
+        text = self.strings[index]
+        if text is None:
+            start = self.stringDataOffset + self.stringOffsets[index]
+            end = self.stringDataOffset + self.stringOffsets[index + 1]
+            text = self.mmap[start:end].decode('utf-8')
+            self.strings[index] = text
+        return text
+
+    @staticmethod
+    def _float(value):
+        return None if math.isnan(value) else value
+
+    def getBoardModel(self):
+        '''
+        Returns boardObjects.BoardModel which columns are memoryviews of the component columns (no data is copied). Valid until close is called
+        '''
+        columns = {columnName: self.getColumn('COMPONENT_' + fileColumnName) for columnName, fileColumnName in BoardFileLoader.MODEL_COLUMNS.items()}
+        return boardObjects.BoardModel.fromColumns(self.stringTable, columns)
+
+    def getComponents(self):
+        '''
+        Returns BoardFileComponents - read-only dict of components (componentName: [(x, y), side, angle, case]), where case is
+        [caseName, caseShape, (x1, y1), (x2, y2)]. Components saved without case have only 3 items. Angle has the same type as in the saved data
+        (text for CamCAD and GenCAD, float for ODB++). Items are read from the mapped columns when they are used
+        '''
+        return BoardFileComponents(self, self.getBoardModel(), self.getColumn('COMPONENT_ANGLE_TEXT_INDEX'))
+
+    def getNets(self):
+        '''
+        Returns dict of nets (netName:{component:[pins]})
+        '''
+        netNames = self.getColumn('NET_NAME_INDEX')
+        netStarts = self.getColumn('NET_START')
+        nodeComponents = self.getColumn('NODE_COMPONENT_INDEX')
+        nodePins = self.getColumn('NODE_PIN_INDEX')
+
+        nets = {}
+        for i, netNameIndex in enumerate(netNames):
+            net = nets[self.getString(netNameIndex)] = {}
+            for node in range(netStarts[i], netStarts[i + 1]):
+                componentName = self.getString(nodeComponents[node])
+                if componentName not in net:
+                    net[componentName] = []
+                net[componentName].append(self.getString(nodePins[node]))
+        return nets
+
+    def getHoles(self):
+        '''
+        Returns dict of holes (holeName: [(x1, y1), (x2, y2)...])
+        '''
+        holeNames = self.getColumn('HOLE_NAME_INDEX')
+        holeStarts = self.getColumn('HOLE_START')
+        holeX = self.getColumn('HOLE_X')
+        holeY = self.getColumn('HOLE_Y')
+
+        holes = {}
+        for i, holeNameIndex in enumerate(holeNames):
+            holes[self.getString(holeNameIndex)] = [(holeX[j], holeY[j]) for j in range(holeStarts[i], holeStarts[i + 1])]
+        return holes
+
+    def getBoardOutlines(self):
+        '''
+        Returns dict {'AREA':[(x1, y1), (x2, y2)], 'LINES':[[(x11, y11), (x12, y12)], [(x21, y21), (x22, y22)], ...], 'ARCS':[[(x11, y11), (x12, y12), (x13, y13)], ...]}
+        '''
+        area = self.getColumn('OUTLINE_AREA')
+        lines = self.getColumn('OUTLINE_LINES')
+        arcs = self.getColumn('OUTLINE_ARCS')
+
+        boardOutlines = {'AREA':[], 'LINES':[], 'ARCS':[]}
+        boardOutlines['AREA'] = [(area[i], area[i + 1]) for i in range(0, len(area), 2)]
+        boardOutlines['LINES'] = [[(lines[i], lines[i + 1]), (lines[i + 2], lines[i + 3])] for i in range(0, len(lines), 4)]
+        boardOutlines['ARCS'] = [[(arcs[i], arcs[i + 1]), (arcs[i + 2], arcs[i + 3]), (arcs[i + 4], arcs[i + 5])] for i in range(0, len(arcs), 6)]
+        return boardOutlines
+
+    @staticmethod
+    def saveSchematic(filePath, components, nets, holes, boardOutlines):
+        '''
+        Saves data returned by schematic loaders to .bnb file
+            components - dict of components (componentName: [(x, y), side, angle, case]), where case is [caseName, caseShape, (x1, y1), (x2, y2)]
+            nets - dict of nets (netName:{component:[pins]})
+            holes - dict of holes (holeName: [(x1, y1), (x2, y2)...])
+            boardOutlines - dict {'AREA':[(x1, y1), (x2, y2)], 'LINES':[...], 'ARCS':[...]}
+        '''
+        strings = []
+        stringIndexes = {}
+        def stringIndex(text):
+            if text is None:
+                return BoardFileLoader.NONE_INDEX
+            if text not in stringIndexes:
+                stringIndexes[text] = len(strings)
+                strings.append(text)
+            return stringIndexes[text]
+
+        def toFloat(value):
+            return float('nan') if value is None else float(value)
+
+        ## components - angles given as text are stored also in the string table, so they are loaded with the same type. Angle column is read by
+        ## boardObjects.BoardModel, so texts that are not numbers are stored as 0 (like BoardModel.addComponent)
+        componentColumns = [array.array('I') for _ in range(5)] + [array.array('d') for _ in range(7)]
+        for componentName in components:
+            (x, y), side, angle = components[componentName][:3]
+            angleText = angle if isinstance(angle, str) else None
+            try:
+                angle = toFloat(angle)
+            except ValueError:
+                angle = 0.0
+            try:
+                caseName, caseShape, (x1, y1), (x2, y2) = components[componentName][3]
+            except IndexError:
+                caseName, caseShape, (x1, y1), (x2, y2) = None, None, (0, 0), (0, 0)
+
+            row = (stringIndex(str(componentName)), stringIndex(side), stringIndex(caseName), stringIndex(caseShape), stringIndex(angleText),
+                   toFloat(x), toFloat(y), angle, x1, y1, x2, y2)
+            for column, value in zip(componentColumns, row):
+                column.append(value)
+        columns = {'COMPONENT_' + columnName: column for columnName, column in zip(BoardFileLoader.COMPONENT_COLUMNS, componentColumns)}
+
+        ## nets - nodes of every net are stored in one block of node columns
+        columns['NET_NAME_INDEX'] = array.array('I', [stringIndex(str(netName)) for netName in nets])
+        columns['NET_START'] = array.array('Q', [0])
+        columns['NODE_COMPONENT_INDEX'] = array.array('I')
+        columns['NODE_PIN_INDEX'] = array.array('I')
+        for netName in nets:
+            for componentName, pins in nets[netName].items():
+                for pin in pins:
+                    columns['NODE_COMPONENT_INDEX'].append(stringIndex(str(componentName)))
+                    columns['NODE_PIN_INDEX'].append(stringIndex(str(pin)))
+            columns['NET_START'].append(len(columns['NODE_PIN_INDEX']))
+
+        ## holes
+        columns['HOLE_NAME_INDEX'] = array.array('I', [stringIndex(str(holeName)) for holeName in holes])
+        columns['HOLE_START'] = array.array('Q', [0])
+        columns['HOLE_X'] = array.array('d')
+        columns['HOLE_Y'] = array.array('d')
+        for holeName in holes:
+            for x, y in holes[holeName]:
+                columns['HOLE_X'].append(x)
+                columns['HOLE_Y'].append(y)
+            columns['HOLE_START'].append(len(columns['HOLE_X']))
+
+        ## board outlines - flattened coords
+        columns['OUTLINE_AREA'] = array.array('d', [coord for point in boardOutlines.get('AREA', []) for coord in point])
+        columns['OUTLINE_LINES'] = array.array('d', [coord for line in boardOutlines.get('LINES', []) for point in line for coord in point])
+        columns['OUTLINE_ARCS'] = array.array('d', [coord for arc in boardOutlines.get('ARCS', []) for point in arc for coord in point])
+
+        ## string table
+        encodedStrings = [text.encode('utf-8') for text in strings]
+        columns['STRING_OFFSETS'] = array.array('Q', [0])
+        for encodedString in encodedStrings:
+            columns['STRING_OFFSETS'].append(columns['STRING_OFFSETS'][-1] + len(encodedString))
+        columns['STRING_DATA'] = array.array('B', b''.join(encodedStrings))
+
+        BoardFileLoader._writeColumns(filePath, columns)
+
+    @staticmethod
+    def _writeColumns(filePath, columns):
+        '''
+        Writes header, columns directory and columns data to the file
+            columns - dict (columnName: array.array)
+        '''
+        alignment = BoardFileLoader.ALIGNMENT
+        def align(offset):
+            return (offset + alignment - 1) // alignment * alignment
+
+        directory = []
+        offset = align(BoardFileLoader.HEADER.size + len(columns) * BoardFileLoader.COLUMN_ENTRY.size)
+        for columnName, column in columns.items():
+            directory.append(BoardFileLoader.COLUMN_ENTRY.pack(columnName.encode('ascii'), column.typecode.encode('ascii'), offset, len(column)))
+            offset = align(offset + len(column) * column.itemsize)
+
+        with open(filePath, 'wb') as file:
+            file.write(BoardFileLoader.HEADER.pack(BoardFileLoader.MAGIC, BoardFileLoader.VERSION, sys.byteorder == 'little', len(columns)))
+            file.write(b''.join(directory))
+            for column in columns.values():
+                file.write(b'\0' * (align(file.tell()) - file.tell()))
+                column.tofile(file)
+
+class BoardFileStrings():
+    '''
+    Read-only sequence of texts of the string table of BoardFileLoader. Texts are decoded on first use, NONE_INDEX gives None
+    '''
+    def __init__(self, loader):
+        self.loader = loader
+
+    def __len__(self):
+        return len(self.loader.strings)
+
+    def __getitem__(self, index):
+        return self.loader.getString(index)
+
+class BoardFileComponents(collections.abc.Mapping):
+    '''
+    Read-only dict of components (componentName: [(x, y), side, angle, case]) of a mapped board file (see BoardFileLoader.getComponents). Items are created
+    from the columns only when they are read. Columns are available as self.model (boardObjects.BoardModel), which drawBoardEngine.Board uses directly
+    '''
+    def __init__(self, loader, model, angleTextIndexes):
+        '''
+        Creates BoardFileComponents instance. Attributes:
+            self.loader - BoardFileLoader with opened file (kept, so the file stays mapped)
+            self.model - boardObjects.BoardModel with columns of the file
+            self.angleTextIndexes - column of string indexes of angles saved as texts (NONE_INDEX if angle was a number)
+            self.rows - dict (componentName: row of self.model) created on first use (None before)
+        '''
+        self.loader = loader
+        self.model = model
+        self.angleTextIndexes = angleTextIndexes
+        self.rows = None
+
+    def _getRows(self):
+        if self.rows is None:
+            self.rows = {self.model.strings[nameIndex]: row for row, nameIndex in enumerate(self.model.nameIndex)}
+        return self.rows
+
+    def __len__(self):
+        return len(self.model)
+
+    def __iter__(self):
+        return iter(self._getRows())
+
+    def __contains__(self, componentName):
+        return componentName in self._getRows()
+
+    def __getitem__(self, componentName):
+        row = self._getRows()[componentName]
+        model = self.model
+        if self.angleTextIndexes[row] != BoardFileLoader.NONE_INDEX:
+            angle = model.strings[self.angleTextIndexes[row]]
+        else:
+            angle = BoardFileLoader._float(model.angle[row])
+
+        component = [(BoardFileLoader._float(model.x[row]), BoardFileLoader._float(model.y[row])), model.strings[model.sideIndex[row]], angle]
+        if model.shapeIndex[row] != BoardFileLoader.NONE_INDEX:
+            component.append([model.strings[model.caseNameIndex[row]], model.strings[model.shapeIndex[row]],
+                              (model.caseX1[row], model.caseY1[row]), (model.caseX2[row], model.caseY2[row])])
+        return component
+
+def main(arguments=None):
+    '''
+    Command line interface of saving board files - converts schematic files to .bnb files. Returns exit code (0 - all files saved, 1 - some files failed)
+    '''
+    import schematicLoader # imported here - schematicLoader imports this module
+
+    parser = argparse.ArgumentParser(description='Saves schematic files as board files (.bnb) that are opened without parsing')
+    parser.add_argument('files', nargs='+', help='schematic files (.cad, .gcd, .tgz)')
+    parser.add_argument('-o', '--output', help='output directory (default: directory of each schematic file)')
+    parser.add_argument('--prefix', default='TP', help='prefix of test points (default: TP)')
+    arguments = parser.parse_args(arguments)
+
+    exitCode = 0
+    for filePath in arguments.files:
+        outputDirectory = arguments.output or os.path.dirname(os.path.abspath(filePath))
+        boardFilePath = os.path.join(outputDirectory, os.path.splitext(os.path.basename(filePath))[0] + BoardFileLoader.FILE_EXTENSION)
+        try:
+            if os.path.abspath(boardFilePath) == os.path.abspath(filePath):
+                raise ValueError('file is already a board file')
+            schematicData = schematicLoader.SchematicLoader.loadSchematic(os.path.abspath(filePath), testPointPrefix=arguments.prefix)
+            if schematicData is None:
+                raise ValueError('unknown format of schematic file')
+            os.makedirs(outputDirectory, exist_ok=True)
+            BoardFileLoader.saveSchematic(boardFilePath, *schematicData[:4])
+            print(f'{filePath}: {boardFilePath}')
+        except Exception as exception:
+            print(f'{filePath}: {type(exception).__name__}: {exception}')
+            exitCode = 1
+    return exitCode
+
+if __name__ == '__main__':
+    raise SystemExit(main())
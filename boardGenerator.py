@@ -0,0 +1,260 @@
+import array
+import io
+import math
+import os
+import random
+import tarfile
+import mathFunctions
+
+class SyntheticBoardGenerator():
+    '''
+    Generates synthetic board of given size and writes it as CamCAD (.cad), GenCAD (.gcd) or ODB++ (.tgz) file. Parts are placed on a grid (with random
+    offsets) on both sides of the board. Every TEST_POINT_STEP-th part is a test point (one pin), every THT_STEP-th part is a through hole component and
+    the other parts are SMD components (two pins). Pins are connected to random nets, GROUND_RATIO of them to the ground net.
+    The same seed always gives the same board, so results of the benchmarks can be compared.
+    '''
+    PITCH = 0.1 # distance between parts
+    PIN_OFFSET = 0.02 # distance of pins from the center of the part
+    TEST_POINT_STEP = 5
+    THT_STEP = 10
+    GROUND_RATIO = 0.1
+    MECH_HOLES_OFFSET = 0.05 # distance of mechanical holes from board corners
+    ANGLES = (0, 90, 180, 270)
+
+    def __init__(self, partsCount=1000, netsCount=10000, seed=0, testPointPrefix='TP'):
+        '''
+        Creates SyntheticBoardGenerator instance. Parts are kept in arrays (index of the part is its id), names are made from ids when files are written.
+        Attributes:
+            self.partsCount, self.netsCount - number of parts and nets
+            self.testPointPrefix - prefix of names of test points
+            self.width, self.height - dimensions of the board
+            self.partsX, self.partsY - coords of parts
+            self.partsSide - side of parts (b'T' or b'B' for each part)
+            self.partsAngle - rotation of parts (index of self.ANGLES)
+            self.pinsStart - index of the first pin of the part in self.pinsNet (pins of part i are pinsStart[i]:pinsStart[i + 1])
+            self.pinsNet - net of every pin
+        '''
+        self.partsCount = partsCount
+        self.netsCount = netsCount
+        self.testPointPrefix = testPointPrefix
+        randomGenerator = random.Random(seed)
+
+        columnsCount = max(1, math.ceil(math.sqrt(partsCount)))
+        rowsCount = max(1, math.ceil(partsCount / columnsCount))
+        self.width = columnsCount * SyntheticBoardGenerator.PITCH
+        self.height = rowsCount * SyntheticBoardGenerator.PITCH
+
+        self.partsX = array.array('d')
+        self.partsY = array.array('d')
+        self.partsSide = bytearray()
+        self.partsAngle = bytearray()
+        self.pinsStart = array.array('I', [0])
+        self.pinsNet = array.array('I')
+        for i in range(partsCount):
+            column, row = i % columnsCount, i // columnsCount
+            self.partsX.append((column + randomGenerator.uniform(0.3, 0.7)) * SyntheticBoardGenerator.PITCH)
+            self.partsY.append((row + randomGenerator.uniform(0.3, 0.7)) * SyntheticBoardGenerator.PITCH)
+            self.partsSide.append(randomGenerator.choice(b'TB'))
+            self.partsAngle.append(randomGenerator.randrange(len(SyntheticBoardGenerator.ANGLES)))
+
+            for _ in range(1 if self.isTestPoint(i) else 2):
+                isGround = randomGenerator.random() < SyntheticBoardGenerator.GROUND_RATIO
+                self.pinsNet.append(0 if isGround else randomGenerator.randrange(netsCount))
+            self.pinsStart.append(len(self.pinsNet))
+
+    def isTestPoint(self, partID):
+        return partID % SyntheticBoardGenerator.TEST_POINT_STEP == 0
+
+    def isTHT(self, partID):
+        return not self.isTestPoint(partID) and partID % SyntheticBoardGenerator.THT_STEP == 1
+
+    def getPartName(self, partID):
+        if self.isTestPoint(partID):
+            return f'{self.testPointPrefix}{partID}'
+        elif self.isTHT(partID):
+            return f'J{partID}'
+        return f'{"RC"[partID % 2]}{partID}'
+
+    @staticmethod
+    def getNetName(netID):
+        return 'GND' if netID == 0 else f'NET{netID}'
+
+    def getPins(self, partID):
+        '''
+        Returns list of (pinNumber, (x, y), netID) of the part. Pins of components are placed symmetrically around the center and rotated with the part
+        '''
+        x, y = self.partsX[partID], self.partsY[partID]
+        angle = SyntheticBoardGenerator.ANGLES[self.partsAngle[partID]]
+        pinsStart, pinsEnd = self.pinsStart[partID], self.pinsStart[partID + 1]
+        pinsCount = pinsEnd - pinsStart
+
+        pins = []
+        for pinIndex in range(pinsCount):
+            offset = 0 if pinsCount == 1 else (2 * pinIndex - 1) * SyntheticBoardGenerator.PIN_OFFSET
+            pinX, pinY = mathFunctions.rotatePoint((offset, 0), angle)
+            pins.append((str(pinIndex + 1), (x + pinX, y + pinY), self.pinsNet[pinsStart + pinIndex]))
+        return pins
+
+    def _getNetPins(self):
+        '''
+        Returns ids of all pins ordered by net (files list pins net by net) and list of part ids of the pins
+        '''
+        pinsPart = array.array('I')
+        for partID in range(self.partsCount):
+            pinsPart.extend([partID] * (self.pinsStart[partID + 1] - self.pinsStart[partID]))
+        pinIDs = sorted(range(len(self.pinsNet)), key=self.pinsNet.__getitem__)
+        return pinIDs, pinsPart
+
+    def _iterNetPins(self):
+        '''
+        Generator of (netID, partID, pinNumber, (x, y)) of all pins ordered by net
+        '''
+        pinIDs, pinsPart = self._getNetPins()
+        for pinID in pinIDs:
+            partID = pinsPart[pinID]
+            pinNumber, pinCoords, netID = self.getPins(partID)[pinID - self.pinsStart[partID]]
+            yield netID, partID, pinNumber, pinCoords
+
+    def getMechHoles(self):
+        '''
+        Returns list of (holeName, (x, y)) of mechanical holes placed in the corners of the board
+        '''
+        offset = SyntheticBoardGenerator.MECH_HOLES_OFFSET
+        corners = (offset, offset), (self.width - offset, offset), (self.width - offset, self.height - offset), (offset, self.height - offset)
+        return [(f'HOLE{i + 1}', coords) for i, coords in enumerate(corners)]
+
+    def getOutlineLines(self):
+        '''
+        Returns list of [(x1, y1), (x2, y2)] lines of rectangular board outline
+        '''
+        corners = (0, 0), (self.width, 0), (self.width, self.height), (0, self.height)
+        return [[corners[i], corners[(i + 1) % 4]] for i in range(4)]
+
+    def writeCamCAD(self, filePath):
+        '''
+        Writes the board as CamCAD file (.cad). Values are separated by commas without spaces
+        '''
+        with open(filePath, 'w') as file:
+            file.write(';CAMCAD synthetic board\n')
+            file.write(f':BOARDINFO\n1,synthetic,0,0,{self.width:.5f},{self.height:.5f}\n:ENDBOARDINFO\n')
+
+            file.write(':PARTLIST\n')
+            for partID in range(self.partsCount):
+                angle = SyntheticBoardGenerator.ANGLES[self.partsAngle[partID]]
+                file.write(f'{partID},{self.getPartName(partID)},PN{partID % 100},{self.partsX[partID]:.5f},{self.partsY[partID]:.5f},{chr(self.partsSide[partID])},{angle}\n')
+            file.write(':ENDPARTLIST\n')
+
+            ## pad ids: 1 - SMD pad, 2 - test point, 3 - through hole pin (pin side 'A' - all layers)
+            file.write(':NETLIST\n')
+            for i, (netID, partID, pinNumber, (x, y)) in enumerate(self._iterNetPins()):
+                side = chr(self.partsSide[partID])
+                pinSide, padID = ('A', 3) if self.isTHT(partID) else (side, 2 if self.isTestPoint(partID) else 1)
+                file.write(f'{i},{self.getNetName(netID)},{self.getPartName(partID)},{pinNumber},{x:.5f},{y:.5f},{side},{pinSide},{padID}\n')
+            file.write(':ENDNETLIST\n')
+
+            file.write(':PACKAGES\nSMD2,SMD,0.04,0.032\nTHT2,THT,0.04,0.032\n:ENDPACKAGES\n')
+            file.write(':PAD\n1,SMD,RECT,-0.02,-0.016,0.02,0.016\n2,TESTPOINT,CIRCLE,0,0,0.05,0.05\n3,THT,CIRCLE,0,0,0.03,0.03\n:ENDPAD\n')
+
+            file.write(':BOARDOUTLINE\n')
+            for i, ((x1, y1), (x2, y2)) in enumerate(self.getOutlineLines()):
+                file.write(f'{i + 1},{x1:.5f},{y1:.5f},{x2:.5f},{y2:.5f}\n')
+            file.write(':ENDBOARDOUTLINE\n')
+
+    def writeGenCAD(self, filePath):
+        '''
+        Writes the board as GenCAD file (.gcd)
+        '''
+        with open(filePath, 'w') as file:
+            file.write('$HEADER\nGENCAD 1.4\nUSER "synthetic board"\nUNITS INCH\nORIGIN 0 0\n$ENDHEADER\n')
+
+            file.write('$BOARD\n')
+            for (x1, y1), (x2, y2) in self.getOutlineLines():
+                file.write(f'LINE {x1:.5f} {y1:.5f} {x2:.5f} {y2:.5f}\n')
+            file.write('$ENDBOARD\n')
+
+            ## pins of the last shape are not read as holes, so through hole shape is not the last one
+            offset = SyntheticBoardGenerator.PIN_OFFSET
+            file.write('$SHAPES\n')
+            file.write(f'SHAPE THT2\nINSERT thmt\nPIN 1 P {-offset} 0 TOP 0 0\nPIN 2 P {offset} 0 TOP 0 0\n')
+            file.write(f'SHAPE SMD2\nINSERT smd\nPIN 1 P {-offset} 0 TOP 0 0\nPIN 2 P {offset} 0 TOP 0 0\n')
+            file.write('SHAPE TESTPOINT\nINSERT smd\nPIN 1 P 0 0 TOP 0 0\n')
+            file.write('$ENDSHAPES\n')
+
+            file.write('$COMPONENTS\n')
+            for partID in range(self.partsCount):
+                shapeName = 'TESTPOINT' if self.isTestPoint(partID) else 'THT2' if self.isTHT(partID) else 'SMD2'
+                layer = 'TOP' if self.partsSide[partID] == ord('T') else 'BOTTOM'
+                angle = SyntheticBoardGenerator.ANGLES[self.partsAngle[partID]]
+                file.write(f'COMPONENT {self.getPartName(partID)}\nPLACE {self.partsX[partID]:.5f} {self.partsY[partID]:.5f}\nLAYER {layer}\nROTATION {angle}\nSHAPE {shapeName}\n')
+            file.write('$ENDCOMPONENTS\n')
+
+            file.write('$SIGNALS\n')
+            previousNetID = None
+            for netID, partID, pinNumber, _ in self._iterNetPins():
+                if netID != previousNetID:
+                    file.write(f'SIGNAL {self.getNetName(netID)}\n')
+                    previousNetID = netID
+                file.write(f'NODE {self.getPartName(partID)} {pinNumber}\n')
+            file.write('$ENDSIGNALS\n')
+
+            file.write('$MECH\n')
+            for holeName, (x, y) in self.getMechHoles():
+                file.write(f'{holeName} {x:.5f} {y:.5f}\n')
+            file.write('$ENDMECH\n')
+
+    def writeOdbPlusPlus(self, filePath):
+        '''
+        Writes the board as ODB++ archive (.tgz) with components files of both sides, netlist, drill (through hole pins) and outline files
+        '''
+        sideLines = {'T': ['UNITS=INCH', ''], 'B': ['UNITS=INCH', '']}
+        drillLines = ['UNITS=INCH', '$0 r40', '@0 .drill']
+        for partID in range(self.partsCount):
+            side = chr(self.partsSide[partID])
+            lines = sideLines[side]
+            angle = SyntheticBoardGenerator.ANGLES[self.partsAngle[partID]]
+            lines.append(f'# CMP {partID}')
+            lines.append(f'CMP {partID} {self.partsX[partID]:.5f} {self.partsY[partID]:.5f} {angle} N {self.getPartName(partID)} PN{partID % 100} ;0=1')
+            for pinNumber, (x, y), netID in self.getPins(partID):
+                lines.append(f'TOP {int(pinNumber) - 1} {x:.5f} {y:.5f} 0 N 0 0 {pinNumber}')
+                if self.isTHT(partID):
+                    drillLines.append(f'P {x:.5f} {y:.5f} 0 P 0 0 ;0={netID},1=0')
+            lines.append('')
+
+        ## names of nets used by drill file
+        drillLines[3:3] = [f'&{netID} {self.getNetName(netID)}' for netID in range(self.netsCount)]
+
+        netListLines = ['H optimize n staggered n'] + [f'${netID} {self.getNetName(netID)}' for netID in range(self.netsCount)]
+        for netID, _, _, (x, y) in self._iterNetPins():
+            netListLines.append(f'{netID} 0.01 {x:.5f} {y:.5f} T e e')
+
+        outlineLines = ['UNITS=INCH'] + [f'L {x1:.5f} {y1:.5f} {x2:.5f} {y2:.5f} r1 P 0' for (x1, y1), (x2, y2) in self.getOutlineLines()]
+        profileLines = ['UNITS=INCH', 'S P 0', 'OB 0 0 I', f'OS {self.width:.5f} 0', f'OS {self.width:.5f} {self.height:.5f}', f'OS 0 {self.height:.5f}', 'OS 0 0', 'OE', 'SE']
+
+        members = [('odbjob/misc/info', ['JOB_NAME=synthetic']),
+                   ('odbjob/steps/pcb/profile', profileLines),
+                   ('odbjob/steps/pcb/layers/comp_+_top/components', sideLines['T']),
+                   ('odbjob/steps/pcb/layers/comp_+_bot/components', sideLines['B']),
+                   ('odbjob/steps/pcb/layers/drill/features', drillLines),
+                   ('odbjob/steps/pcb/layers/outline/features', outlineLines),
+                   ('odbjob/steps/pcb/netlists/cadnet/netlist', netListLines)]
+        with tarfile.open(filePath, 'w:gz') as file:
+            for memberName, lines in members:
+                data = ('\n'.join(lines) + '\n').encode('utf-8')
+                memberInfo = tarfile.TarInfo(memberName)
+                memberInfo.size = len(data)
+                file.addfile(memberInfo, io.BytesIO(data))
+
+    def write(self, filePath):
+        '''
+        Writes the board in format recognized by extension of filePath (.cad, .gcd or .tgz)
+        '''
+        writers = {'.cad': self.writeCamCAD, '.gcd': self.writeGenCAD, '.tgz': self.writeOdbPlusPlus}
+        extension = os.path.splitext(filePath)[1].lower()
+        if extension not in writers:
+            raise ValueError(f'unknown format of synthetic board file: {extension}')
+        writers[extension](filePath)
+
+if __name__ == '__main__':
+    generator = SyntheticBoardGenerator(partsCount=1000, netsCount=300)
+    for fileName in ('synthetic.cad', 'synthetic.gcd', 'synthetic.tgz'):
+        generator.write(os.path.join(os.getcwd(), 'Schematic', fileName))
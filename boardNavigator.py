@@ -2,11 +2,10 @@ import tkinter as tk
 import tkinter.ttk as ttk
 from tkinter import messagebox, filedialog
 from tkinter import font
-from PIL import Image, ImageTk
 from idlelib.tooltip import Hovertip
 from datetime import datetime
 import os
-import pygame
+import traceback
 import keyboard
 import math
 
@@ -15,11 +14,27 @@ import drawBoardEngine
 import mathFunctions
 import settingsGUI
 import aboutGUI
+import framePresenter
+import redrawScheduler
+import backgroundTask
+import nameSearch
+import virtualListbox
+import frameProfiler
 
 class BoardNavigator(tk.Tk):
     BASE_MARGIN = 90  # px 
+    SEARCH_RESULTS_LIMIT = 50 # max number of names shown in componentsListBox while typing in findComponentByNameEntry
+    PROFILE_FILE = 'profile.json' # histograms of frameProfiler (saved in current working directory)
+    PROFILER_OVERLAY_STAGES = ('frame', 'createLayers', 'markerLookup', 'updateLayers', 'renderImage', 'renderBoard', 'renderHoles', 'renderTestPoints',
+                               'renderComponents', 'blit tiles', 'render overlays', 'present', 'present PIL', 'present PhotoImage', 'present canvas')
 
-    def __init__(self, master=None):
+    def __init__(self, master=None, maxFPS=drawBoardEngine.Board.FPS, profile=False):
+        '''
+        Creates BoardNavigator instance. Arguments:
+            master - parent widget
+            maxFPS - max number of board redraws per second. Redraw requests made between frames are merged into one redraw
+            profile - if True stages of drawing and loading are measured (see frameProfiler.FrameProfiler). Profiler can be toggled with F12
+        '''
         super().__init__()
         self.resizable(False,False)
         self.title('Board Navigator')
@@ -28,17 +43,22 @@ class BoardNavigator(tk.Tk):
         ## variables
         # board variables
         self.filePath = ''
-        self.image = None
         drawBoardEngine.Board.WIDTH = 1200
         drawBoardEngine.Board.HEIGHT = 700
         self.canvasOffset = (drawBoardEngine.Board.WIDTH // 2, drawBoardEngine.Board.HEIGHT // 2)
-        self.drawSurface = pygame.Surface((drawBoardEngine.Board.WIDTH, drawBoardEngine.Board.HEIGHT))
         self.board = None
         self.components = None
         self.nets = None
         self.holes = None
         self.boardOutlines = None
+        self.componentPins = {}
+        self.netBoardComponents = {}
+        self.searchIndex = None
+        self.listboxItems = []
+        self.listboxIndexes = {}
+        self.populatedNetTreeItems = set()
         self.netComponents = []
+        self.loadingTask = None
 
         # drawing variables
         self.sideQueue = ['B', 'T']
@@ -49,6 +69,7 @@ class BoardNavigator(tk.Tk):
         self.markerData = None, (None, None), None, False
         self.cursor = False, None
         self.mouseCoords = None, None
+        self.isZoomChanged = False
 
         # settings
         self.componentsCustomScale = 1.0
@@ -94,6 +115,7 @@ class BoardNavigator(tk.Tk):
         self.componentsLabel = tk.Label(self.netsFrame, text='List of components')
         self.componentsListBox = tk.Listbox(self.netsFrame, width=35, height=14, selectmode='browse')
         self.componentsScrollbar = tk.Scrollbar(self.netsFrame, command=self.scrollComponents)
+        self.componentsList = virtualListbox.VirtualListbox(self.componentsListBox, self.componentsScrollbar)
         self.componentPinsLabel = tk.Label(self.netsFrame, text='Pins of selected component')
         self.componentPinsTree = ttk.Treeview(self.netsFrame, height=10, selectmode='browse', columns=('Pin', 'Net'), show='headings')
         self.componentPinsTree.column('#1', width=105)
@@ -102,6 +124,10 @@ class BoardNavigator(tk.Tk):
 
         # board frame
         self.imageCanvas = tk.Canvas(self.boardFrame, width=drawBoardEngine.Board.WIDTH, height=drawBoardEngine.Board.HEIGHT, bg='black')
+        self.framePresenter = framePresenter.FramePresenter(self.imageCanvas, (drawBoardEngine.Board.WIDTH, drawBoardEngine.Board.HEIGHT), self.canvasOffset)
+        self.profiler = frameProfiler.FrameProfiler(profile, os.path.join(os.getcwd(), BoardNavigator.PROFILE_FILE))
+        self.framePresenter.profiler = self.profiler
+        self.redrawScheduler = redrawScheduler.RedrawScheduler(self, self.redrawBoard, maxFPS)
 
         # find component frame
         self.findComponentByNameInfoLabel = tk.Label(self.findComponentFrame, text='Find component with its name')
@@ -114,7 +140,6 @@ class BoardNavigator(tk.Tk):
 
         ## scrollbar parameters
         self.netTree.config(yscrollcommand=self.netTreeScrollbar.set)
-        self.componentsListBox.config(yscrollcommand=self.componentsScrollbar.set)
         self.componentPinsTree.config(yscrollcommand=self.componentPinsScrollBar.set)
 
         ## position
@@ -180,6 +205,8 @@ class BoardNavigator(tk.Tk):
         self.bind('<ButtonPress-1>', self.handleCursorClick)
         self.bind('<ButtonRelease-1>', self.handleCurosrRelease)
         self.bind('<Return>', self.handleEnter)
+        self.findComponentByNameEntry.bind('<KeyRelease>', lambda event: self.updateSearchResults())
+        self.netTree.bind('<<TreeviewOpen>>', lambda event: self.netTreeOpened())
         self.bind('<KeyPress-Shift_L>', lambda event: self.handleShift('press'))
         self.bind('<KeyRelease-Shift_L>', lambda event: self.handleShift('release'))
         self.bind('<MouseWheel>', lambda event: self.handleScrollWheel(event))
@@ -200,6 +227,7 @@ class BoardNavigator(tk.Tk):
         self.bind('<V>', lambda event: self.clearNet())
         self.bind('<Control-o>', lambda event: self.loadSchematic())
         self.bind('<Control-O>', lambda event: self.loadSchematic())
+        self.bind('<F12>', lambda event: self.toggleProfiler())
 
     def _selectNetTreeItem(self, netName):
         '''
@@ -207,6 +235,7 @@ class BoardNavigator(tk.Tk):
             netName - name of the net of currently drawn pcb
         '''
         ## scroll to net and open it        
+        self.populateNetTreeBranch(netName)
         self.netTree.item(netName, open=True)
         self.netTree.see(netName)
         
@@ -409,13 +438,7 @@ class BoardNavigator(tk.Tk):
         ## clicked on net name
         except IndexError:
             netName = ''.join(currentItem)
-            selectedNetComponents = list(self.nets[netName].keys())
-
-            componentList = []
-            searchList = self.board.components + self.board.testPoints
-            for component in searchList:
-                if component.name in selectedNetComponents:
-                    componentList.append((component.coords, component.side))
+            componentList = [(component.coords, component.side) for component in self.netBoardComponents.get(netName, [])]
 
             markerData = None, (None, None), None, False
             self.updateBoardLayer(netComponents=componentList, markerData=markerData)
@@ -470,7 +493,7 @@ class BoardNavigator(tk.Tk):
         '''
         #print(self.filePath)
         path = os.path.join(os.getcwd(), 'Schematic')
-        schematicFile = filedialog.askopenfilename(title='Open schematic file', initialdir=path, filetypes=(('All files','*.*'), ('CAMCAD file','*.cad'), ('GENCAD file','*.gcd')))
+        schematicFile = filedialog.askopenfilename(title='Open schematic file', initialdir=path, filetypes=(('All files','*.*'), ('CAMCAD file','*.cad'), ('GENCAD file','*.gcd'), ('ODB++ file','*.tgz'), ('Board Navigator file','*.bnb')))
         self.filePath = schematicFile        
 
         self.componentsCustomScale = 1
@@ -482,7 +505,8 @@ class BoardNavigator(tk.Tk):
 
     def loadSchematic(self, path=None, forceHoles=False, testPointPrefix='TP'):
         '''
-        Creates drawBoardEngine.Board instance and draws board on screen
+        Starts loading of the schematic file and creating of drawBoardEngine.Board instance in the background task, so the window is not frozen
+        during parsing. Progress is shown in the window title and load button cancels loading. Board is drawn by _finishLoading when data is ready
             path - path of the schematic file
             forceHoles = True/False - if True holes have constant radius else they are scaled according to the testpoints' radius
             testPointPrefix - prefix that all testpoints begin with
@@ -491,74 +515,151 @@ class BoardNavigator(tk.Tk):
         if not path:
             return
 
+        ## stop previous loading and drawing of the previous board
+        self.cancelLoading()
+        self.redrawScheduler.cancel()
+        self.setBoardControlsState('disabled')
+
         ## clear data when file changed
+        self.board = None
         self.components = None
         self.nets = None
         self.holes = None
         self.boardOutlines = None
+        self.componentPins = {}
+        self.netBoardComponents = {}
+        self.searchIndex = None
+        self.listboxItems = []
 
         ## clear label, listbox and treeviews
         self.findComponentByClickLabel['text'] = ''
         self.findComponentByClickLabel['bg'] = 'SystemButtonFace'
-        self.componentsListBox.delete(0, tk.END)
+        self.setListBoxItems([])
         for net in self.netTree.get_children():
             self.netTree.delete(net)
+        self.populatedNetTreeItems = set()
         for item in self.componentPinsTree.get_children():
             self.componentPinsTree.delete(item)
 
-        ## process schematic file
+        ## process schematic file in worker thread
         if self.filePath:
-            try:
-                self.components, self.nets, self.holes, self.boardOutlines, _, _ = schematicLoader.SchematicLoader.loadSchematic(self.filePath, testPointPrefix)
-            except (TypeError, IndexError, ValueError) as e:
-                currentDateTime = datetime.now()
-                currentDateTime = currentDateTime.strftime("%d.%m.%Y_%H-%M-%S")
-                with open(f'Crash {currentDateTime}.txt', 'w') as log:
-                    message = f'Error loading file: {self.filePath}.\nReason:{e.args}'
-                    log.write(message)
-            self.board = drawBoardEngine.Board(self.components, self.nets, self.holes, self.boardOutlines, forceHoles, testPointPrefix)
-            self.board.setComponentsCustomScale(self.componentsCustomScale)
-
-            self.setDefaultView()
-
-            ## add items of treeview
-            for netName in sorted(self.nets):
-                components = sorted(self.nets[netName].keys())
-                self.treeAddMainBranch(components, netName)
-                for component in components:
-                    pins = sorted(self.nets[netName][component])
-                    branchID = f'{netName}\t{component}'
-                    self.treeAddSubBranch(pins, branchID)
-
-            ## add items to componentsListbox
-            componentsList = [component for component in self.components]
-            holesList = [hole for hole in self.holes]
-            listboxItems = sorted(set([component for component in componentsList + holesList]))
-
-            for i, item in enumerate(listboxItems):
-                self.componentsListBox.insert(i, item)
-
-            ## set drawn side label to bottom
-            if self.side == 'B':
-                self.currentlyDrawnSideLabel['text'] = 'BOTTOM'
-
-            ## enable buttons
-            self.settingsButton['state'] = 'normal'
-            self.moveButton['state'] = 'normal'
-            self.zoomButton['state'] = 'normal'
-            self.rotateButton['state'] = 'normal'
-            self.changeSideButton['state'] = 'normal'
-            self.clearMarkerButton['state'] = 'normal'
-            self.defaultViewButton['state'] = 'normal'
-            self.findComponentByNameEntry['state'] = 'normal'
-            self.findComponentByNameButton['state'] = 'normal'
-            self.clearNetButton['state'] = 'normal'
-            self.netCollapseButton['state'] = 'normal'
+            self.loadFileButton.config(text='Cancel', command=self.cancelLoading)
+            args = self.filePath, forceHoles, testPointPrefix, self.componentsCustomScale, self.profiler
+            self.loadingTask = backgroundTask.BackgroundTask(self, BoardNavigator._loadBoardData, args, onProgress=self._showLoadingProgress,
+                                                             onDone=self._finishLoading, onError=self._handleLoadingError)
+            self.loadingTask.start()
+
+    @staticmethod
+    def _loadBoardData(filePath, forceHoles, testPointPrefix, componentsCustomScale, profiler, progressCallback):
+        '''
+        Body of the loading task (runs in worker thread, so it must not use tkinter). Parses the file, creates drawBoardEngine.Board instance and
+        indexes of nets and names. Returns components, nets, holes, boardOutlines, board, componentPins, netBoardComponents, searchIndex.
+        Every section of the loader and every following step is measured by the profiler as 'load {sectionName}'
+        '''
+        progressCallback = profiler.sectionTimer(progressCallback)
+        components, nets, holes, boardOutlines, _, _ = schematicLoader.SchematicLoader.loadSchematic(filePath, testPointPrefix=testPointPrefix, progressCallback=progressCallback)
+
+        progressCallback('board', 0, 1)
+        board = drawBoardEngine.Board(components, nets, holes, boardOutlines, forceHoles, testPointPrefix)
+        board.setComponentsCustomScale(componentsCustomScale)
+
+        progressCallback('indexes', 0, 1)
+        componentPins, netBoardComponents = board.buildNetIndexes()
+
+        searchNames = [(name, 'TESTPOINT' if name.startswith(testPointPrefix) else 'COMPONENT') for name in components]
+        searchNames += [(name, 'HOLE') for name in holes] + [(name, 'NET') for name in nets]
+        searchIndex = nameSearch.NameSearchIndex(searchNames)
+        progressCallback.finish()
+        return components, nets, holes, boardOutlines, board, componentPins, netBoardComponents, searchIndex
+
+    def _showLoadingProgress(self, sectionName, stepNumber, stepsCount):
+        '''
+        Shows progress of the loading task in the window title
+        '''
+        self.title(f'Board Navigator - loading {sectionName} ({stepNumber + 1}/{stepsCount})')
+
+    def _resetLoadingState(self):
+        '''
+        Restores window title and load button changed by loadSchematic
+        '''
+        self.loadingTask = None
+        self.title('Board Navigator')
+        self.loadFileButton.config(text='Load file', command=self.openFile)
+
+    def cancelLoading(self):
+        '''
+        Cancels loading of the schematic started by loadSchematic. Board controls stay disabled until another board is loaded
+        '''
+        if self.loadingTask:
+            self.loadingTask.cancel()
+            self._resetLoadingState()
+            self.setBoardControlsState('disabled')
+
+    def _handleLoadingError(self, error):
+        '''
+        Called in the main loop when the loading task raised an exception. Writes crash log with traceback and shows that the file could not be loaded
+            error - exception raised in worker thread (any type - e.g. missing section of ODB++ file or OSError)
+        '''
+        self._resetLoadingState()
+        self.setBoardControlsState('disabled')
+
+        currentDateTime = datetime.now()
+        currentDateTime = currentDateTime.strftime("%d.%m.%Y_%H-%M-%S")
+        logName = f'Crash {currentDateTime}.txt'
+        try:
+            with open(logName, 'w') as log:
+                message = f'Error loading file: {self.filePath}.\nReason:{error.args}\n\n'
+                log.write(message + ''.join(traceback.format_exception(type(error), error, error.__traceback__)))
+        except OSError:
+            logName = None
+
+        details = f'Details were saved to {logName}.' if logName else 'Crash log could not be saved.'
+        messagebox.showerror('Loading failed', f'File {self.filePath} could not be loaded.\n{type(error).__name__}: {error}\n{details}', parent=self)
+
+    def setBoardControlsState(self, state):
+        '''
+        Enables or disables buttons and entry that need a loaded board (they are disabled while the board is loaded and after failed or cancelled loading)
+            state - 'normal' or 'disabled'
+        '''
+        for widget in (self.settingsButton, self.moveButton, self.zoomButton, self.rotateButton, self.changeSideButton, self.clearMarkerButton,
+                       self.defaultViewButton, self.findComponentByNameEntry, self.findComponentByNameButton, self.clearNetButton, self.netCollapseButton):
+            widget['state'] = state
+
+    def _finishLoading(self, boardData):
+        '''
+        Called in the main loop when the loading task is done. Draws the board and fills treeview and listbox
+            boardData - components, nets, holes, boardOutlines, board, componentPins, netBoardComponents, searchIndex
+        '''
+        self._resetLoadingState()
+        self.components, self.nets, self.holes, self.boardOutlines, self.board, self.componentPins, self.netBoardComponents, self.searchIndex = boardData
+        self.board.profiler = self.profiler
+
+        self.setDefaultView()
+
+        ## add items of treeview - only nets, their components and pins are added when branch is opened
+        for netName in sorted(self.nets):
+            self.treeAddLazyBranch('', netName, netName)
+
+        ## add items to componentsListbox
+        componentsList = [component for component in self.components]
+        holesList = [hole for hole in self.holes]
+        self.listboxItems = sorted(set([component for component in componentsList + holesList]))
+        self.setListBoxItems(self.listboxItems)
+
+        ## set drawn side label to bottom
+        if self.side == 'B':
+            self.currentlyDrawnSideLabel['text'] = 'BOTTOM'
+
+        ## enable buttons
+        self.setBoardControlsState('normal')
 
     def toggleMode(self, mode):
         '''
         Sets current mode to move, rotate or zoom. Changes color of corresponding button
         '''
+        if not self.board:
+            return
+
         if mode == 'move' and self.board:
             self.isMoveBoard = not self.isMoveBoard
             color = '#' + ''.join(str(hex(num)) for num in self.board.RED).replace('0x', '')
@@ -631,6 +732,14 @@ class BoardNavigator(tk.Tk):
             self.findComponentByClickLabel['text'] = ''
             self.findComponentByClickLabel['bg'] = 'SystemButtonFace'
 
+    def toggleProfiler(self):
+        '''
+        Enables or disables frame profiler (overlay with times of drawing stages and histograms saved to BoardNavigator.PROFILE_FILE)
+        '''
+        self.profiler.setEnabled(not self.profiler.enabled)
+        if self.board:
+            self.redrawScheduler.requestRedraw()
+
     def clearNet(self):
         '''
         Clears marked net components by overwriting self.netComponents with []
@@ -642,6 +751,9 @@ class BoardNavigator(tk.Tk):
         '''
         Resets current state of the board to default view by setting move offsets to 0 and zoom coefficient to 1
         '''
+        if not self.board:
+            return
+
         self.isMoveBoard = False
         self.moveButton['bg'] = 'SystemButtonFace'
         self.isRotate = False
@@ -662,10 +774,29 @@ class BoardNavigator(tk.Tk):
         '''
         Get component name from Entry. Draw marker if component exists
         '''
-        componentName = self.findComponentByNameEntry.get()
-        componentName = componentName.upper()
+        if not self.board:
+            return
 
-        isMarkerOnDrawnSide, markerCoords, _, isHole = self.findComponentByName(componentName)
+        query = self.findComponentByNameEntry.get()
+        componentName = self.board.findComponentName(query, ignoreCase=True)
+        isHole = False
+
+        ## name of hole or net
+        if componentName is None:
+            bestMatch = self.searchIndex.search(query, limit=1)
+            if bestMatch and bestMatch[0][0].lower() == query.lower():
+                name, kind = bestMatch[0]
+                if kind == 'NET':
+                    self.collapseNetTree()
+                    self._selectNetTreeItem(name)
+                    self.netTreeClicked()
+                    return
+                elif kind == 'HOLE':
+                    componentName, isHole = name, True
+
+        if componentName is None:
+            componentName = query.upper()
+        isMarkerOnDrawnSide, markerCoords, _, isHole = self.findComponentByName(componentName, isHole)
         
 
         ## if component exists generate pins table
@@ -690,13 +821,8 @@ class BoardNavigator(tk.Tk):
         If componentName is not passed as attribute method reads from Entry. Otherwise uses passed componentName
         '''
         if isHole:
-            for hole in self.board.holes:
-                if hole.name == componentName:
-                    xList = [x for x, y in hole.coords]
-                    yList = [y for x, y in hole.coords]
-                    xMid, yMid = sum(xList) / len(xList), sum(yList) / len(yList)
-                    componentSide = 'B'
-                    componentCoords = self.board.screenPoint(self.board.boardLayer, (xMid, yMid), self.side == 'T')
+            componentCoords = self.board.findHoleUsingName(self.board.boardLayer, componentName, self.side == 'T')
+            componentSide = 'B' if componentName in self.board.holeCentroids else None
         else:
             componentCoords, componentSide = self.board.findComponentUsingName(self.board.boardLayer, componentName)
         
@@ -705,7 +831,8 @@ class BoardNavigator(tk.Tk):
 
     def updateBoardLayer(self, changeSide=False, deltaVector=None, markerData=None, cursor=None, zoom=None, event=None, netComponents=[], forceChange=False):
         '''
-        Interface for drawBoard method and modifies class atributes (self.sideQueue, self.side, self.moveVector, self.markerData, self.cursor)
+        Interface for drawBoard method and modifies class atributes (self.sideQueue, self.side, self.moveVector, self.markerData, self.cursor). Changes are
+        applied immediately, but the board is drawn by self.redrawScheduler, so many calls between two frames result in one redraw
             changeSide = True/ False
             deltaVector - tuple of (deltaX, deltaY) axis relative offsets
             markerData - True/False(True means that marker will be drawn), coords, componentName, isHole
@@ -747,7 +874,17 @@ class BoardNavigator(tk.Tk):
                 self.netComponents = []
             else:
                 self.netComponents = netComponents
-        
+
+        ## keep layer of the current view for coords calculations made before the redraw
+        self.board.createLayers(self.side)
+        self.isZoomChanged = self.isZoomChanged or zoomChanged
+        self.redrawScheduler.requestRedraw()
+
+    def redrawBoard(self):
+        '''
+        Callback of self.redrawScheduler. Draws the board with current state of class attributes
+        '''
+        zoomChanged, self.isZoomChanged = self.isZoomChanged, False
         self.drawBoard(self.side, self.markerData, self.cursor, zoomChanged, self.netComponents)
 
     def drawBoard(self, side, markerData, cursor, zoomChanged, netComponents):
@@ -761,46 +898,39 @@ class BoardNavigator(tk.Tk):
             zoomChanged = True/False - if True the marker position is recalculated
             netComponents = sequence of ((x, y), side) (x, y are coords from file to be recalculated into the screenPoint)
 
-        1. Update all layers (create layers, update marker)
-        2. Blit layers into one surface
-        3. Convert: pygame surface -> RGB byte string -> PIL image -> ImageTk
-        4. Update canvas
+        1. Update all layers (get static layer, update marker and overlays)
+        2. Blit static layer and render overlays into one surface
+        3. Paste the surface into PhotoImage shown on the canvas (see framePresenter.FramePresenter)
         '''
         markerSide, markerCoords, componentName, isHole = markerData
+        profiler = self.profiler
+        profiler.beginFrame()
 
-        ## 1. create pygame surfaces
-        self.board.createLayers()
+        ## 1. get pre-rendered static layer of the side (rendered only when side, zoom or rotation changed)
+        with profiler.measure('createLayers'):
+            self.board.createLayers(side)
 
         ## update marker (if compoonent is a hole then forcefully draw it)
-        if componentName:
-            markerData = self.findComponentByName(componentName, isHole)
-            markerSide, markerCoords, _, isHole = markerData
-            markerSide = markerSide or isHole
+        with profiler.measure('markerLookup'):
+            if componentName:
+                markerData = self.findComponentByName(componentName, isHole)
+                markerSide, markerCoords, _, isHole = markerData
+                markerSide = markerSide or isHole
 
         ## update surfaces
         boardLayerData = side, (markerSide, markerCoords)
-        self.board.updateLayers(boardLayerData, cursor, netComponents)
-
-        ## 2. blit into one surface
-        self.board.renderImage(self.drawSurface)
-
-        ## 3.convert pygame surface to PhotoImage
-        rawImageString = pygame.image.tostring(self.drawSurface, 'RGB')
-        imagePIL = Image.frombytes('RGB',
-                                   (drawBoardEngine.Board.WIDTH, drawBoardEngine.Board.HEIGHT),
-                                   rawImageString)
-        self.image = ImageTk.PhotoImage(image=imagePIL)
+        with profiler.measure('updateLayers'):
+            self.board.updateLayers(boardLayerData, cursor, netComponents)
 
-        ## 4. update canvas
-        self.imageCanvas.create_image(self.canvasOffset, image=self.image)
+        ## 2. blit into one surface (render passes of static layer are measured while missing tiles are rendered)
+        with profiler.measure('renderImage'):
+            self.board.renderImage(self.framePresenter.surface)
+        profiler.renderOverlay(self.framePresenter.surface, BoardNavigator.PROFILER_OVERLAY_STAGES)
 
-    def treeAddMainBranch(self, branchValues, branchName):
-        '''
-        Adds main branch to self.netTree (ttk Treeview) with subelements ID as '{parent}\t{value}' eg. parent is 'Europe', subelement is 'France' then ID will be 'Europe   France'
-        '''
-        parent = self.netTree.insert("", 'end', branchName, text=branchName)
-        for value in branchValues:
-            self.netTree.insert(parent, 'end', f'{parent}\t{value}', text=value)
+        ## 3. update canvas
+        with profiler.measure('present'):
+            self.framePresenter.present()
+        profiler.endFrame()
 
     def treeAddSubBranch(self, subbranchVales, parentBranchID):
         '''
@@ -812,17 +942,48 @@ class BoardNavigator(tk.Tk):
             except tk._tkinter.TclError:
                 pass
 
+    def treeAddLazyBranch(self, parentBranchID, branchID, text):
+        '''
+        Adds branch to self.netTree (ttk Treeview) with one empty placeholder subelement (ID '{branchID}\t'), so the branch can be opened.
+        Real subelements are added by self.populateNetTreeBranch when the branch is opened
+        '''
+        self.netTree.insert(parentBranchID, 'end', branchID, text=text)
+        self.netTree.insert(branchID, 'end', f'{branchID}\t', text='')
+
+    def populateNetTreeBranch(self, branchID):
+        '''
+        Replaces placeholder of the branch of self.netTree with its subelements - components of the net or pins of the component in the net.
+        Does nothing if the branch was already populated
+            branchID - 'net' or 'net\tcomponent'
+        '''
+        if branchID in self.populatedNetTreeItems or not self.netTree.exists(f'{branchID}\t'):
+            return
+        self.populatedNetTreeItems.add(branchID)
+        self.netTree.delete(f'{branchID}\t')
+
+        netName, _, componentName = branchID.partition('\t')
+        netComponents = self.nets.get(netName, {})
+        ## net branch - add components
+        if not componentName:
+            for component in sorted(netComponents):
+                self.treeAddLazyBranch(branchID, f'{branchID}\t{component}', component)
+        ## component branch - add pins
+        else:
+            self.treeAddSubBranch(sorted(netComponents.get(componentName, [])), branchID)
+
+    def netTreeOpened(self):
+        '''
+        Adds subelements of the branch of self.netTree that is being opened (<<TreeviewOpen>> is generated for focused item)
+        '''
+        self.populateNetTreeBranch(self.netTree.focus())
+
     def collapseNetTree(self):
         '''
-        Collapses all items of self.netTree
+        Collapses all items of self.netTree. Only populated branches can be opened, so other ones are skipped
         '''
-        mainBranch = self.netTree.get_children()
-        for branchName in mainBranch:
-            self.netTree.selection_remove(branchName)
-            subBranch = self.netTree.get_children(branchName)
-            for itemName in subBranch:
-                self.netTree.item(itemName, open=False)
-            self.netTree.item(branchName, open=False)
+        self.netTree.selection_remove(self.netTree.selection())
+        for itemName in self.populatedNetTreeItems:
+            self.netTree.item(itemName, open=False)
     
     def openBranchNetTree(self, componentName):
         '''
@@ -830,21 +991,15 @@ class BoardNavigator(tk.Tk):
             componentName - name of component to be found in nets
         '''
         self.collapseNetTree()
-        for netName in self.nets:
-            if componentName in self.nets[netName]:
-                self._selectNetTreeItem(netName)
+        for netName in dict.fromkeys(self.componentPins.get(componentName, {}).values()):
+            self._selectNetTreeItem(netName)
 
     def generatePinsTable(self, componentName):
         '''
         Generates ttk treeview table for pins of the component PIN -> NET_NAME.
             componentName - name of component to be found in nets
         '''
-        pinsData = []
-        for net in self.nets:
-            if componentName in self.nets[net]:
-                pinsData.append((self.nets[net][componentName], net))
-        
-        pinsData = sorted(pinsData, key=lambda x: x[0])
+        pinsData = sorted(self.componentPins.get(componentName, {}).items(), key=lambda x: x[0])
         self.componentPinsTree.heading('Pin', text='Pin')
         self.componentPinsTree.heading('Net', text='Net')
 
@@ -880,13 +1035,35 @@ class BoardNavigator(tk.Tk):
         '''
         Check if item is in listbox and see it (scroll + highlight)
         '''
-        try:
-            self.componentsListBox.selection_clear(0, tk.END)
-            itemIndex = list(self.componentsListBox.get(0, tk.END)).index(componentName)
-            self.componentsListBox.see(itemIndex)
-            self.componentsListBox.select_set(itemIndex)
-        except ValueError:
-            pass
+        if componentName in self.listboxIndexes:
+            itemIndex = self.listboxIndexes[componentName]
+            self.componentsList.see(itemIndex)
+            self.componentsList.select(itemIndex)
+        else:
+            self.componentsList.clearSelection()
+
+    def setListBoxItems(self, items):
+        '''
+        Replaces items of componentsListBox and updates self.listboxIndexes (item: index in listbox). Only visible rows are inserted to the listbox
+        '''
+        self.componentsList.setItems(items)
+        self.listboxIndexes = {item: i for i, item in enumerate(items)}
+
+    def updateSearchResults(self):
+        '''
+        Shows names of components and holes that match text of findComponentByNameEntry in componentsListBox - ranked by self.searchIndex
+        (exact -> prefix -> fuzzy matches). All items are shown when the entry is empty
+        '''
+        if not self.searchIndex:
+            return
+
+        query = self.findComponentByNameEntry.get()
+        if query:
+            results = self.searchIndex.search(query, limit=BoardNavigator.SEARCH_RESULTS_LIMIT)
+            items = list(dict.fromkeys([name for name, kind in results if kind != 'NET']))
+        else:
+            items = self.listboxItems
+        self.setListBoxItems(items)
 
     def scrollNets(self, *args):
         '''
@@ -898,7 +1075,7 @@ class BoardNavigator(tk.Tk):
         '''
         Assigns scrollbar to self.componentsListBox
         '''
-        self.componentsListBox.yview(*args)
+        self.componentsList.yview(*args)
     
     def scrollPins(self, *args):
         '''
@@ -1,10 +1,12 @@
 import math
+import array
 import mathFunctions
 
 class BoardObject():
     '''
     Parent class for board objects(holes, test points, components).
     '''
+    __slots__ = ('name', 'coords')
     COLLISION_TOLERANCE = 0.005
     def __init__(self, name=None, coords=None):
         '''
@@ -26,6 +28,8 @@ class BoardObject():
         return x1 + x2, y1 + y2
 
 class Component(BoardObject):
+    __slots__ = ('side',)
+
     def __init__(self, name=None, coords=None, side=None):
         '''
         Child class for BoardObject. Can be used to store holes data. Attributes:
@@ -57,96 +61,275 @@ class Component(BoardObject):
                     return True
         return False
 
-    def setCustomCaseScale(self, scale):
+class BoardModel():
+    '''
+    Column storage of components and test points. Every component is a single row of the model. Numeric data is stored in array.array columns and
+    texts (names, sides, case names and case shapes) are stored once in self.strings and referenced by index. Model can also be created from existing
+    columns (fromColumns), e.g. from memoryviews of a mapped board file, without copying them.
+    '''
+    COLUMN_NAMES = ('nameIndex', 'sideIndex', 'caseNameIndex', 'shapeIndex', 'x', 'y', 'angle', 'caseX1', 'caseY1', 'caseX2', 'caseY2')
+    CASE_COLUMN_NAMES = ('caseX1', 'caseY1', 'caseX2', 'caseY2')
+
+    def __init__(self):
         '''
-        Updates case dimension by multiplying each point by given scale and calls __init__ to update parameters
-            scale - int or float
+        Creates BoardModel instance. Attributes:
+            self.strings - list of unique texts used by the model
+            self.stringIndexes - dict (text: index in self.strings)
+            self.nameIndex, self.sideIndex, self.caseNameIndex, self.shapeIndex - columns of indexes in self.strings
+            self.x, self.y - columns of component coords
+            self.angle - column of rotation angles in degrees
+            self.caseX1, self.caseY1, self.caseX2, self.caseY2 - columns of case dimensions (see ComponentRectangle and ComponentCircle)
         '''
-        x1, y1 = self.coords1
-        x2, y2 = self.coords2
+        self.strings = []
+        self.stringIndexes = {}
 
-        scaledCoords1 = x1 * scale, y1 * scale
-        scaledCoords2 = x2 * scale, y2 * scale
-        self.__init__(self.name, self.coords, self.side, (self.caseName, self.caseShape, scaledCoords1, scaledCoords2))
+        self.nameIndex = array.array('l')
+        self.sideIndex = array.array('l')
+        self.caseNameIndex = array.array('l')
+        self.shapeIndex = array.array('l')
+        self.x = array.array('d')
+        self.y = array.array('d')
+        self.angle = array.array('d')
+        self.caseX1 = array.array('d')
+        self.caseY1 = array.array('d')
+        self.caseX2 = array.array('d')
+        self.caseY2 = array.array('d')
 
+    @classmethod
+    def fromColumns(cls, strings, columns):
+        '''
+        Creates model which columns are given sequences (data is not copied). Rows cannot be added to such model. Columns that are not array.array
+        (e.g. read-only memoryviews) are copied to arrays only when they are changed (see setCaseScale)
+            strings - sequence of texts indexed by the index columns
+            columns - dict (columnName: column) with all BoardModel.COLUMN_NAMES. All columns have the same length
+        '''
+        model = cls()
+        model.strings = strings
+        model.stringIndexes = None
+        for columnName in BoardModel.COLUMN_NAMES:
+            setattr(model, columnName, columns[columnName])
+        return model
+
+    def getColumns(self):
+        '''
+        Returns dict (columnName: column) of all columns (see fromColumns)
+        '''
+        return {columnName: getattr(self, columnName) for columnName in BoardModel.COLUMN_NAMES}
+
+    def __len__(self):
+        return len(self.nameIndex)
 
-class ComponentRectangle(Component):
-    def __init__(self, name=None, coords=None, side=None, case=None, angle=0):
+    def _stringIndex(self, text):
         '''
-        Child class of Component. Can be used to stored component with rectangular shape. Attributes:
+        Returns index of text in self.strings. Text is added to self.strings if it is not there yet
+        '''
+        try:
+            return self.stringIndexes[text]
+        except KeyError:
+            self.stringIndexes[text] = len(self.strings)
+            self.strings.append(text)
+            return self.stringIndexes[text]
+
+    def addComponent(self, name, coords, side, case, angle=0):
+        '''
+        Adds row to the model and returns view of it (ComponentRectangle or ComponentCircle depending on caseShape)
+            name - name of the component
+            coords - (x, y)
+            side - side of the component
             case = (caseName, caseShape, (x1, y1), (x2, y2))
-                caseName - string with case name
-                caseShape - 'RECT' or 'CIRCLE'
-                (x1, x2), (x2, y2) - coords of vertexes that are opposite on the same diagonal ((top, left), (botttom, right))
-            angle - rotation angle of rectangle in degrees
-            name, coords, side are explained in Component class
+            angle - rotation angle in degrees
+        '''
+        caseName, caseShape, coords1, coords2 = case
+        x, y = coords
+        x1, y1 = coords1
+        x2, y2 = coords2
+        try:
+            angle = float(angle)
+        except ValueError:
+            angle = 0.0
+
+        self.nameIndex.append(self._stringIndex(name))
+        self.sideIndex.append(self._stringIndex(side))
+        self.caseNameIndex.append(self._stringIndex(caseName))
+        self.shapeIndex.append(self._stringIndex(caseShape))
+        self.x.append(x)
+        self.y.append(y)
+        self.angle.append(angle)
+        self.caseX1.append(x1)
+        self.caseY1.append(y1)
+        self.caseX2.append(x2)
+        self.caseY2.append(y2)
 
-            self.points - list of points of the rectangle after rotation. Used to draw a polygon (rotated rectangle)
-            self.collisionArea - tuple (minX, maxX), (minY, maxY). Used to detect collision with mouse click
+        return self.view(len(self) - 1)
+
+    def view(self, row):
+        '''
+        Returns view of the row - ComponentRectangle or ComponentCircle depending on caseShape
+            row - index of the row
         '''
-        super().__init__(name, coords, side)
-        self.angle = float(angle)
-        #print(name, coords, side, case, angle)
+        if self.strings[self.shapeIndex[row]] == 'CIRCLE':
+            return ComponentCircle(self, row)
+        return ComponentRectangle(self, row)
 
-        self.caseName, self.caseShape, self.coords1, self.coords2 = case
+    def setCaseScale(self, scale, rows=None):
+        '''
+        Updates case dimensions by multiplying them by given scale
+            scale - int or float
+            rows - sequence of rows to be scaled. If None then all rows are scaled
+        '''
+        if scale == 1:
+            return
+
+        ## columns that are not arrays (e.g. read-only memoryviews of a mapped board file) are copied first
+        for columnName in BoardModel.CASE_COLUMN_NAMES:
+            if not isinstance(getattr(self, columnName), array.array):
+                setattr(self, columnName, array.array('d', getattr(self, columnName)))
 
+        if rows is None:
+            rows = range(len(self))
+        for row in rows:
+            self.caseX1[row] *= scale
+            self.caseY1[row] *= scale
+            self.caseX2[row] *= scale
+            self.caseY2[row] *= scale
+
+
+class ComponentView(Component):
+    '''
+    Parent class for ComponentRectangle and ComponentCircle. Instance does not store any data, it only reads one row of BoardModel
+    '''
+    __slots__ = ('model', 'row')
+
+    def __init__(self, model, row):
+        '''
+        Creates view of the BoardModel row. Attributes:
+            self.model - BoardModel instance
+            self.row - index of the row in the model
+        '''
+        self.model = model
+        self.row = row
+
+    @property
+    def name(self):
+        return self.model.strings[self.model.nameIndex[self.row]]
+
+    @property
+    def coords(self):
+        return self.model.x[self.row], self.model.y[self.row]
+
+    @property
+    def side(self):
+        return self.model.strings[self.model.sideIndex[self.row]]
+
+    @property
+    def angle(self):
+        return self.model.angle[self.row]
+
+    @property
+    def caseName(self):
+        return self.model.strings[self.model.caseNameIndex[self.row]]
+
+    @property
+    def caseShape(self):
+        return self.model.strings[self.model.shapeIndex[self.row]]
+
+    @property
+    def coords1(self):
+        return self.model.caseX1[self.row], self.model.caseY1[self.row]
+
+    @property
+    def coords2(self):
+        return self.model.caseX2[self.row], self.model.caseY2[self.row]
+
+    def setCustomCaseScale(self, scale):
+        '''
+        Updates case dimension by multiplying each point by given scale
+            scale - int or float
+        '''
+        self.model.setCaseScale(scale, (self.row,))
+
+
+class ComponentRectangle(ComponentView):
+    '''
+    View of BoardModel row with rectangular shape. Attributes:
+        case = (caseName, caseShape, (x1, y1), (x2, y2))
+            caseName - string with case name
+            caseShape - 'RECT' or 'CIRCLE'
+            (x1, x2), (x2, y2) - coords of vertexes that are opposite on the same diagonal ((top, left), (botttom, right))
+        angle - rotation angle of rectangle in degrees
+        name, coords, side are explained in Component class
+
+        self.points - list of points of the rectangle after rotation. Used to draw a polygon (rotated rectangle)
+        self.collisionArea - tuple (minX, maxX), (minY, maxY). Used to detect collision with mouse click
+    '''
+    __slots__ = ()
+
+    @property
+    def points(self):
         x1, y1 = self.coords1
         x2, y2 = self.coords2
+        coords = self.coords
+        angle = self.angle
 
-        self.point1 = self._movePoint(self.coords, mathFunctions.rotatePoint((x1, y1), self.angle))
-        self.point2 = self._movePoint(self.coords, mathFunctions.rotatePoint((x2, y1), self.angle))
-        self.point3 = self._movePoint(self.coords, mathFunctions.rotatePoint((x2, y2), self.angle))
-        self.point4 = self._movePoint(self.coords, mathFunctions.rotatePoint((x1, y2), self.angle))
-        self.points = [self.point1, self.point2, self.point3, self.point4]
+        point1 = self._movePoint(coords, mathFunctions.rotatePoint((x1, y1), angle))
+        point2 = self._movePoint(coords, mathFunctions.rotatePoint((x2, y1), angle))
+        point3 = self._movePoint(coords, mathFunctions.rotatePoint((x2, y2), angle))
+        point4 = self._movePoint(coords, mathFunctions.rotatePoint((x1, y2), angle))
+        return [point1, point2, point3, point4]
 
-        xCoordList = [point[0] for point in self.points]
+    @property
+    def collisionArea(self):
+        points = self.points
+        xCoordList = [point[0] for point in points]
         toleranceX = abs(min(xCoordList)) * BoardObject.COLLISION_TOLERANCE
 
         minX, maxX = min(xCoordList) - toleranceX , max(xCoordList) + toleranceX
 
-        yCoordList =[point[1] for point in self.points]
+        yCoordList =[point[1] for point in points]
         toleranceY = abs(min(yCoordList)) * BoardObject.COLLISION_TOLERANCE
         minY, maxY = min(yCoordList) - toleranceY, max(yCoordList) + toleranceY
 
-        self.collisionArea = ((minX, maxX), (minY, maxY))
+        return ((minX, maxX), (minY, maxY))
 
-class ComponentCircle(Component):
-    def __init__(self, name=None, coords=None, side=None, case=None, angle=0):
-        '''
-        Child class of Component. Can be used to stored component with circle shape. Attributes:
-            case = (caseName, caseShape, (x1, y1), (x2, y2))
-                caseName - string with case name
-                caseShape - 'RECT' or 'CIRCLE'
-                (x1, x2), (x2, y2) - coords of points that describe diameter
-            angle - rotation angle (not used)
-            name, coords, side are explained in Component class
-
-            self.radius - radius of the circle
-            self.collisionArea - tuple (minX, maxX), (minY, maxY). Used to detect collision with mouse click
-        '''
-        super().__init__(name, coords, side)
+class ComponentCircle(ComponentView):
+    '''
+    View of BoardModel row with circle shape. Attributes:
+        case = (caseName, caseShape, (x1, y1), (x2, y2))
+            caseName - string with case name
+            caseShape - 'RECT' or 'CIRCLE'
+            (x1, x2), (x2, y2) - coords of points that describe diameter
+        angle - rotation angle (not used)
+        name, coords, side are explained in Component class
 
-        self.caseName, self.caseShape, self.coords1, self.coords2 = case
+        self.radius - radius of the circle
+        self.collisionArea - tuple (minX, maxX), (minY, maxY). Used to detect collision with mouse click
+    '''
+    __slots__ = ()
 
+    @property
+    def radius(self):
         x1, y1 = self.coords1
         x2, y2 = self.coords2
+        return math.sqrt((x1 - x2)**2 + (y1 - y2)**2)
 
-        self.radius = math.sqrt((x1 - x2)**2 + (y1 - y2)**2)
-
+    @property
+    def collisionArea(self):
+        radius = self.radius
         centerX, centerY = self.coords
-        toleranceX = abs(centerX - self.radius) * BoardObject.COLLISION_TOLERANCE
-        toleranceY = abs(centerY - self.radius) * BoardObject.COLLISION_TOLERANCE
+        toleranceX = abs(centerX - radius) * BoardObject.COLLISION_TOLERANCE
+        toleranceY = abs(centerY - radius) * BoardObject.COLLISION_TOLERANCE
 
-        minX, minY = centerX - self.radius - toleranceX, (centerY - self.radius) - toleranceY
-        width = height = 2 * self.radius
+        minX, minY = centerX - radius - toleranceX, (centerY - radius) - toleranceY
+        width = height = 2 * radius
         maxX, maxY = (minX + width) + toleranceX, (minY + height) + toleranceX
-        self.collisionArea = ((minX, maxX), (minY, maxY))
+        return ((minX, maxX), (minY, maxY))
 
 
 if __name__ == '__main__':
-    a = ComponentRectangle('R1', (0, 0), 'B', ['AP_rect39.37x78.74', 'RECT', (0.079, 0.039), (0.039, 0.02)], 0)
+    model = BoardModel()
+    a = model.addComponent('R1', (0, 0), 'B', ['AP_rect39.37x78.74', 'RECT', (0.079, 0.039), (0.039, 0.02)], 0)
     a.setCustomCaseScale(2)
-    b = ComponentCircle('TP1', (5, 5), 'B', ['AP_rect39.37x78.74', 'CIRCLE', (0.025, 0.025), (0.05, 0.05)], 0)
+    b = model.addComponent('TP1', (5, 5), 'B', ['AP_rect39.37x78.74', 'CIRCLE', (0.025, 0.025), (0.05, 0.05)], 0)
     c = Component('Hole1', ((0, 0), (1, 1)))
 
     b.checkCollision((4.999, 4.999), 1)
@@ -3,42 +3,44 @@ import os
 class CamCADLoader():
     CIRCLE_DIMENSIONS = [(0.050, 0.050), (0.025, 0.025)]
     RECTANGLE_DIMENSIONS = [(-0.020, -0.016), (0.020, 0.016)] #[(0.039, 0.039), (0.013, 0.013)]
+    SECTIONS = ('CADFILEINFO', 'BOARDINFO', 'PARTLIST', 'NETLIST', 'PNDATA', 'TESTPOINT', 'PACKAGES', 'PAD', 'VARIANT', 'BOARDOUTLINE')
 
     def __init__(self):
         '''
         Creates CamCADLoader instance. Attributes:
-            self.sections - dict of sections in file (sectionName:[sectionStart, sectionEnd], where sectionStart, sectionEnd are line's numbers)
-            self.schematic  - list of lines in .cad file
+            self.sectionHandlers - dict of methods that parse lines of sections (sectionName: handler). Lines of other sections are skipped
             self.components - dict of components (componentName: [(x, y), side, case])
             self.holes - dict of TH holes (componentName: [(x, y), ...])
             self.nets - dict of nets (netName:{component:[pins]})
             self.pads - dict of pads (padName:[shape, (x1, y1), (x2, y2)])
-            Returns dict {'AREA':[(x1, y1), (x2, y2)], 'LINES':[[(x11, y11), (x12, y12)], [(x21, y21), (x22, y22)], ...], 'ARCS':[[(x11, y11), (x12, y12), (x13, y13)], ...]}
-        '''
-        self.sections = {'CADFILEINFO':[],
-                         'BOARDINFO':[],
-                         'PARTLIST':[],
-                         'NETLIST':[],
-                         'PNDATA':[],
-                         'TESTPOINT':[],
-                         'PACKAGES':[],
-                         'PAD':[],
-                         'VARIANT':[],
-                         'BOARDOUTLINE':[]}
-        self.schematic = []
+            self.partList - dict of components read from PARTLIST section (componentName: [(x, y), side, angle])
+            self.netListComponents - dict of components data read from NETLIST section (componentName: [(x, y), side, caseID, firstPinSide, nextPinSide, lastPinSide]),
+                                     where (x, y), side, caseID and firstPinSide are taken from the first line of the component, nextPinSide is the first 'T' or 'B'
+                                     pin side of the next lines and lastPinSide is pin side of the last line (None if component has only one line)
+            self.boardOutlines - dict {'AREA':[(x1, y1), (x2, y2)], 'LINES':[[(x11, y11), (x12, y12)], [(x21, y21), (x22, y22)], ...], 'ARCS':[[(x11, y11), (x12, y12), (x13, y13)], ...]}
+        '''
+        self.sectionHandlers = {'BOARDINFO': self._parseBoardInfoLine,
+                                'PARTLIST': self._parsePartListLine,
+                                'NETLIST': self._parseNetListLine,
+                                'PACKAGES': self._parsePackagesLine,
+                                'PAD': self._parsePadLine,
+                                'BOARDOUTLINE': self._parseBoardOutlineLine}
         self.components ={}
         self.holes ={}
         self.nets = {}
         self.pads = {}
         self.packages = {}
+        self.partList = {}
+        self.netListComponents = {}
         self.boardOutlines = {'AREA':[], 'LINES':[], 'ARCS':[]}
 
-    def loadSchematic(self, name, path='Schematic'):
+    def loadSchematic(self, name, path='Schematic', progressCallback=None):
         '''
         Opens a .cad file and returns dict of components, dict of nets, dict of pads and list of board vertexes. For manual processig of file use
         (openFile, getComponents, getNets, getPads, getPackages, getBoardOutlines, getHoles methods)
+            progressCallback - function called before each section is processed with arguments (sectionName, stepNumber, stepsCount)
         '''
-        self.openFile(name, path)
+        self.openFile(name, path, progressCallback)
         nets = self.getNets()
         pads = self.getPads()
         components = self.getComponents()
@@ -48,190 +50,220 @@ class CamCADLoader():
 
         return components, nets, holes, boardOutlines, pads, packages
 
-    def openFile(self, name, path='Schematic'):
+    def openFile(self, name, path='Schematic', progressCallback=None):
         '''
-        Opens a .cad file and creates a dict of sections (sectionName:[sectionStart, sectionEnd], where sectionStart, sectionEnd are line's numbers)
+        Opens a .cad file and parses it in one pass. Every line is split once and passed to the handler of its section (see self.sectionHandlers).
+        Lines are not stored - only parsed data is kept. If a section appears more than once, only its first occurrence is parsed.
+            progressCallback - function called at the beginning of each section with arguments (sectionName, stepNumber, stepsCount)
         '''
+        progress = progressCallback or (lambda sectionName, stepNumber, stepsCount: None)
+
         ## get file path
         filePath = os.path.join(os.getcwd(), path, name)
-        #print(filePath)
 
-        ## open file and get line numbers that start and end sections
+        ## open file and pass lines of sections to handlers
+        parsedSections = []
+        handler = None
         with open(filePath, 'r') as file:
-            for i, line in enumerate(file):
+            for line in file:
                 line = line.replace('\n','')
-                if line[1:] in self.sections or line[4:] in self.sections:
-                    key = line.replace(':','').replace('END','')
-                    self.sections[key].append(i)
-                self.schematic.append(line)
+                if line[1:] in CamCADLoader.SECTIONS:
+                    sectionName = line[1:]
+                    if sectionName not in parsedSections:
+                        progress(sectionName, len(parsedSections), len(CamCADLoader.SECTIONS))
+                        parsedSections.append(sectionName)
+                        handler = self.sectionHandlers.get(sectionName)
+                    continue
+                elif line[4:] in CamCADLoader.SECTIONS:
+                    handler = None
+                    continue
+
+                if handler:
+                    handler(line.split(','))
+
+    def _parsePartListLine(self, line):
+        '''
+        Parses line of PARTLIST section into self.partList
+            line - list of comma separated values
+        '''
+        try:
+            componentName = line[1].replace(' ', '')
+            try:
+                componentCoords = float(line[3]), float(line[4])
+            except ValueError:
+                componentCoords = None, None
+            componentSide = line[5]
+            componentAngle = line[-1]
+            self.partList[componentName] = [componentCoords, componentSide, componentAngle]
+        except IndexError:
+            pass
+
+    def _parseNetListLine(self, line):
+        '''
+        Parses line of NETLIST section. Updates nets, holes and casing data of the component (self.netListComponents) from the same split line
+            line - list of comma separated values
+        '''
+        ## nets
+        try:
+            netName = line[1].replace(' ', '')
+            componentName = line[2].replace(' ', '')
+            componentPin = line[3].replace(' ', '')
+
+            if netName not in self.nets:
+                self.nets[netName] = {}
+            if componentName not in self.nets[netName]:
+                self.nets[netName][componentName] = []
+            self.nets[netName][componentName].append(componentPin)
+        except IndexError:
+            pass
+
+        ## holes
+        try:
+            pinName = line[2].replace(' ', '')
+            componentCoords = float(line[4]), float(line[5])
+            pinSide = line[-2].replace(' ', '')
+            if pinSide not in ('T', 'B'):
+                if not pinName in self.holes:
+                    self.holes[pinName] = []
+                self.holes[pinName].append(componentCoords)
+        except IndexError:
+            pass
 
-        #print(self.schematic)
-        #print(self.sections)
+        ## casing and side of the component
+        try:
+            componentName = line[2].replace(' ', '')
+            componentCaseID = int(line[-1])
+            pinSide = line[-2].replace(' ', '')
+
+            if componentName not in self.netListComponents:
+                componentCoords = float(line[4]), float(line[5])
+                componentSide = line[6]
+                self.netListComponents[componentName] = [componentCoords, componentSide, componentCaseID, pinSide, None, None]
+            else:
+                componentData = self.netListComponents[componentName]
+                if componentData[4] is None and pinSide in ('T', 'B'):
+                    componentData[4] = pinSide
+                componentData[5] = pinSide
+        except IndexError:
+            pass
 
     def getComponents(self):
         '''
-        Gets components from self.schematic. Iterates over PARTLIST Section (component data) and NETLIST section (casing data).
+        Gets components from self.partList (component data) and self.netListComponents (casing data, components missing in PARTLIST). Use after getPads
         Returns dict of components (componentName: [(x, y), side, case], where case is [caseName, caseShape, coords1, coords2])
         '''
-        for i in self._getRange('PARTLIST'):
-            line = self.schematic[i].split(',')
-            try:
-                componentName = line[1].replace(' ', '')
-                try:
-                    componentCoords = float(line[3]), float(line[4])
-                except ValueError:
-                    componentCoords = None, None
-                componentSide = line[5]
-                componentAngle = line[-1]
-                self.components[componentName] = [componentCoords, componentSide, componentAngle]
-            except IndexError:
-                pass
-
-        #print(self.pads)
-        for i in self._getRange('NETLIST'):
-            line = self.schematic[i].split(',')
-            try:
-                componentName = line[2].replace(' ', '')
-                componentCaseID = int(line[-1])
-                componentSide = line[-2].replace(' ', '')
-
-                ## check if component is in dict and if it has proper coords
-                if not componentName in self.components:
-                    componentCoords = float(line[4]), float(line[5])
-                    componentSide = line[6]
-                    self.components[componentName] = [componentCoords, componentSide, 0]
-                elif self.components[componentName][0] == (None, None):
-                    componentCoords = float(line[4]), float(line[5])
-                    self.components[componentName][0] = componentCoords
-
-                ## update casing info
-                if len(self.components[componentName]) == 3:
-                    if componentCaseID in self.pads:
-                        self.components[componentName] += [self.pads[componentCaseID]]
-                    else:
-                        self.components[componentName] += [['_','CIRCLE'] + CamCADLoader.CIRCLE_DIMENSIONS]
-
-                ##
-                if self.components[componentName][1] not in ('T', 'B'):
-                    self.components[componentName][1] = componentSide
-            except IndexError:
-                pass
+        for componentName, componentData in self.partList.items():
+            self.components[componentName] = list(componentData)
+
+        for componentName, (componentCoords, componentSide, componentCaseID, firstPinSide, nextPinSide, lastPinSide) in self.netListComponents.items():
+            ## check if component is in dict and if it has proper coords. Side of components missing in PARTLIST is taken from the first line, so side
+            ## of its pin is skipped
+            if not componentName in self.components:
+                self.components[componentName] = [componentCoords, componentSide, 0]
+                firstPinSide = componentSide
+            elif self.components[componentName][0] == (None, None):
+                self.components[componentName][0] = componentCoords
+
+            ## update casing info
+            if len(self.components[componentName]) == 3:
+                if componentCaseID in self.pads:
+                    self.components[componentName] += [self.pads[componentCaseID]]
+                else:
+                    self.components[componentName] += [['_','CIRCLE'] + CamCADLoader.CIRCLE_DIMENSIONS]
+
+            ## side of the first pin that is placed on 'T' or 'B' if side of the component is unknown
+            for pinSide in (self.components[componentName][1], firstPinSide, nextPinSide, lastPinSide):
+                if pinSide is not None:
+                    self.components[componentName][1] = pinSide
+                if pinSide in ('T', 'B'):
+                    break
 
         return self.components
 
     def getHoles(self):
         '''
-        Gets holes from self.schematic. Iterates over NETLIST Section.
-        Returns dict of holes (holeName: [(x1, y1), (x2, y2)...])
+        Returns dict of holes read from NETLIST section (holeName: [(x1, y1), (x2, y2)...])
         '''
-        for i in self._getRange('NETLIST'):
-            line = self.schematic[i].split(',')
-            try:
-                pinName = line[2].replace(' ', '')
-                pinType = line[3].replace(' ', '')
-                componentCoords = float(line[4]), float(line[5])
-                pinSide = line[-2].replace(' ', '')
-                if pinSide not in ('T', 'B'):
-                    if not pinName in self.holes:
-                        self.holes[pinName] = []
-                    self.holes[pinName].append(componentCoords)
-            except IndexError:
-                pass
-
         return self.holes
 
     def getNets(self):
         '''
-        Gets components from self.schematic. Iterates over NETLIST Section.
-        Returns dict of nets (netName:{component:[pins]})
+        Returns dict of nets read from NETLIST section (netName:{component:[pins]})
         '''
-        for i in self._getRange('NETLIST'):
-            line = self.schematic[i].split(',')
-            try:
-                netName = line[1].replace(' ', '')
-                componentName = line[2].replace(' ', '')
-                componentPin = line[3].replace(' ', '')
-
-                if netName not in self.nets:
-                    self.nets[netName] = {}
-                if componentName not in self.nets[netName]:
-                    self.nets[netName][componentName] = []
-                self.nets[netName][componentName].append(componentPin)
-            except IndexError:
-                pass
-
         return self.nets
 
-    def getPads(self):
+    def _parsePadLine(self, line):
         '''
-        Gets pads from self.schematic. Iterates over PAD Section. SHOULD RUN BEFORE getComponents
-        Returns dict of pads (padID:[padName, padShape, (x1, y1), (x2, y2)])
+        Parses line of PAD section into self.pads
+            line - list of comma separated values
         '''
-        for i in self._getRange('PAD'):
-            line = self.schematic[i].split(',')
-            try:
-                padID = int(line[0])
-                padName = line[1].replace(' ', '')
-                padShape = line[2].replace(' ', '')
-                padCoords1 = float(line[3]), float(line[4])
-                padCoords2 = float(line[5]), float(line[6])
-                #padCoords = [padCoords1, padCoords2]
-                padCoords = CamCADLoader.CIRCLE_DIMENSIONS if padShape == 'CIRCLE' else CamCADLoader.RECTANGLE_DIMENSIONS
-                self.pads[padID] = [padName, padShape] + padCoords
-            except (IndexError, ValueError):
-                pass
+        try:
+            padID = int(line[0])
+            padName = line[1].replace(' ', '')
+            padShape = line[2].replace(' ', '')
+            padCoords1 = float(line[3]), float(line[4])
+            padCoords2 = float(line[5]), float(line[6])
+            #padCoords = [padCoords1, padCoords2]
+            padCoords = CamCADLoader.CIRCLE_DIMENSIONS if padShape == 'CIRCLE' else CamCADLoader.RECTANGLE_DIMENSIONS
+            self.pads[padID] = [padName, padShape] + padCoords
+        except (IndexError, ValueError):
+            pass
 
+    def getPads(self):
+        '''
+        Returns dict of pads read from PAD section (padID:[padName, padShape, (x1, y1), (x2, y2)]). SHOULD RUN BEFORE getComponents
+        '''
         return self.pads
 
+    def _parsePackagesLine(self, line):
+        '''
+        Parses line of PACKAGES section into self.packages
+            line - list of comma separated values
+        '''
+        try:
+            packageName = line[0].replace(' ', '')
+            packageType = line[1].replace(' ', '')
+            packageCoords = float(line[2]), float(line[3])
+            self.packages[packageName] = [packageType, packageCoords]
+        except (IndexError, ValueError):
+            pass
+
     def getPackages(self):
         '''
-        Gets packges from self.schematic. Iterates over PAD Section.
-        Returns dict of packages (package:[type, (x, y)])
+        Returns dict of packages read from PACKAGES section (package:[type, (x, y)])
         '''
-        for i in self._getRange('PACKAGES'):
-            line = self.schematic[i].split(',')
-            try:
-                packageName = line[0].replace(' ', '')
-                packageType = line[1].replace(' ', '')
-                packageCoords = float(line[2]), float(line[3])
-                self.packages[packageName] = [packageType, packageCoords]
-            except (IndexError, ValueError):
-                pass
         return self.packages
 
-    def getBoardOutlines(self):
+    def _parseBoardInfoLine(self, line):
         '''
-        Gets components from self.schematic. Iterates over BOARDOUTLINE Section.
-        Returns dict {'AREA':[(x1, y1), (x2, y2)], 'LINES':[[(x11, y11), (x12, y12)], [(x21, y21), (x22, y22)], ...], 'ARCS':[[(x11, y11), (x12, y12), (x13, y13)], ...]}
+        Parses line of BOARDINFO section into self.boardOutlines['AREA']
+            line - list of comma separated values
         '''
-        for i in self._getRange('BOARDINFO'):
-            line = self.schematic[i].split(',')
-            try:
-                bottomLeftCorner = float(line[2]), float(line[3])
-                upperRightCorner = float(line[4]), float(line[5])
-                self.boardOutlines['AREA'] = [bottomLeftCorner, upperRightCorner]
-            except IndexError:
-                pass
-
-        for i in self._getRange('BOARDOUTLINE'):
-            line = self.schematic[i].split(',')
-            try:
-                coords1 = float(line[1]), float(line[2])
-                coords2 = float(line[3]), float(line[4])
-                self.boardOutlines['LINES'].append([coords1, coords2])
-            except IndexError:
-                pass
+        try:
+            bottomLeftCorner = float(line[2]), float(line[3])
+            upperRightCorner = float(line[4]), float(line[5])
+            self.boardOutlines['AREA'] = [bottomLeftCorner, upperRightCorner]
+        except IndexError:
+            pass
 
-        return self.boardOutlines
-
-    def _getRange(self, sectionName):
+    def _parseBoardOutlineLine(self, line):
         '''
-        Helper method for getting range of a section. Returns range
+        Parses line of BOARDOUTLINE section into self.boardOutlines['LINES']
+            line - list of comma separated values
         '''
-        rangeStart = self.sections[sectionName][0]
-        rangeEnd = self.sections[sectionName][1]
+        try:
+            coords1 = float(line[1]), float(line[2])
+            coords2 = float(line[3]), float(line[4])
+            self.boardOutlines['LINES'].append([coords1, coords2])
+        except IndexError:
+            pass
 
-        return range(rangeStart, rangeEnd)
+    def getBoardOutlines(self):
+        '''
+        Returns board outlines read from BOARDINFO and BOARDOUTLINE sections.
+        Returns dict {'AREA':[(x1, y1), (x2, y2)], 'LINES':[[(x11, y11), (x12, y12)], [(x21, y21), (x22, y22)], ...], 'ARCS':[[(x11, y11), (x12, y12), (x13, y13)], ...]}
+        '''
+        return self.boardOutlines
 
 if __name__ == '__main__':
     ## get data manually
@@ -248,7 +280,3 @@ if __name__ == '__main__':
     for key in a.components:
         #if a.components[key]:
         print(key, a.components[key])
-
-    ## get data with interface
-    b = CamCADLoader()
-    b.loadSchematic('gemis2.cad')
\ No newline at end of file
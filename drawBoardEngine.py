@@ -1,14 +1,26 @@
 import pygame
 import schematicLoader
 import math
+import bisect
 import boardObjects
 import mathFunctions
+import spatialIndex
+import tileRenderer
+import frameProfiler
+
+try:
+    import numpy
+except ImportError:
+    numpy = None # batch rendering is disabled without numpy
 
 pygame.font.init()
 
 class Board():
     WIDTH, HEIGHT = 1100, 750
     FPS = 60
+    MIN_ZOOM, MAX_ZOOM = 0.5, 20
+    TILE_SIZE = 256
+    TILES_MEMORY_BUDGET = 256 * 1024 * 1024 # bytes of cached pre-rendered tiles of static layer
 
     WHITE = 255, 255, 255
     YELLOW = 252, 186, 3
@@ -28,13 +40,15 @@ class Board():
     def __init__(self, components, nets, holes, boardOutlines, forceHoles=False, testPointPrefix='TP'):
         '''
         Creates Board instance. Arguments:
-            components - dict of components (componentName: [(x, y), side, case]), where case is a list [caseName, caseShape, (x1, y1), (x2, y2)]
+            components - dict of components (componentName: [(x, y), side, case]), where case is a list [caseName, caseShape, (x1, y1), (x2, y2)].
+                         Components of a board file (boardFileLoader.BoardFileComponents) are read directly from columns of the file (their model)
             nets - dict of nets (netName:{component:[pins]})
             holes - dict of holes (holeName: [(x1, y1), (x2, y2)...])
             boardOutlines - dict {'AREA':[(x1, y1), (x2, y2)], 'LINES':[[(x11, y11), (x12, y12)], [(x21, y21), (x22, y22)], ...], 'ARCS':[[(x11, y11), (x12, y12), (x13, y13)], ...]}
             forceHoles - If true then holes have constant radius, if False radius of holes is scaled 1.15 * testpoint's radius
             testPointPrefix - Unique prefix that is common for all testpoints
         '''
+        self.model = boardObjects.BoardModel()
         self.components = []
         self.testPoints = []
         self.nets = nets
@@ -44,7 +58,12 @@ class Board():
         self.forceHoles = forceHoles
         self.testPointPrefix = testPointPrefix
 
-        ## list of component instances
+        ## rows of the board model and lists of their views
+        fileModel = getattr(components, 'model', None)
+        if isinstance(fileModel, boardObjects.BoardModel):
+            self._addModelComponents(fileModel)
+            components = {}
+
         for component in components:
             coords = components[component][0]
             side = components[component][1]
@@ -52,12 +71,11 @@ class Board():
             try:
                 case = components[component][3]
             except IndexError:
-                case = None, None, None, None
+                continue
 
-            if case[1] == 'RECT':
-                newComponent = boardObjects.ComponentRectangle(component, coords, side, case, angle)
-            elif case[1] == 'CIRCLE':
-                newComponent = boardObjects.ComponentCircle(component, coords, side, case, angle)
+            if case[1] not in ('RECT', 'CIRCLE'):
+                continue
+            newComponent = self.model.addComponent(component, coords, side, case, angle)
 
             if component.startswith(self.testPointPrefix):
                 self.testPoints.append(newComponent)
@@ -69,7 +87,10 @@ class Board():
         self.maxRelativeDistance = 200
         self.boxOutlineWidth, self.boxOutlineHeight = 200, 150
         self.rotationAngle = 0
-        self.holeRadius = None
+        self.transformMatrices = {}
+        self.tileCache = tileRenderer.TileCache(Board.TILES_MEMORY_BUDGET)
+        self.overlayData = 'B', (None, (None, None)), (None, None), []
+        self.profiler = frameProfiler.FrameProfiler() # disabled - replaced by profiler of the application to measure render passes
 
         ## calculate base scale and midpoint
         self.baseScale = self._calculateBaseScale()
@@ -91,6 +112,34 @@ class Board():
         #print(f'base offsets:({self.xBaseOffset}, {self.yBaseOffset}), base scale={self.baseScale}, board area:{self.boardArea}, recalculated board area:(x=({xMin}, {xMax}), y=({yMin}, {yMax}))')
         self.i = 0
 
+        ## spatial indexes for finding components by click and for culling objects outside of rendered area
+        self._buildSpatialIndex()
+        self._buildOutlineIndex()
+
+        ## indexes for finding components and holes by name
+        self._buildNameIndex()
+
+        ## zoom-independent geometry of test points, components and holes of each side (numpy arrays for batch rendering)
+        self.batchRendering = numpy is not None
+        self._buildRenderArrays()
+
+    def _addModelComponents(self, model):
+        '''
+        Uses columns of the model (e.g. memoryviews of a mapped board file) as self.model without copying them and adds views of its rows with case
+        to self.testPoints and self.components. Columns are copied only when cases are scaled (see boardObjects.BoardModel.setCaseScale)
+            model - boardObjects.BoardModel
+        '''
+        self.model = boardObjects.BoardModel.fromColumns(model.strings, model.getColumns())
+        for row in range(len(self.model)):
+            if self.model.strings[self.model.shapeIndex[row]] not in ('RECT', 'CIRCLE'):
+                continue
+            newComponent = self.model.view(row)
+
+            if newComponent.name.startswith(self.testPointPrefix):
+                self.testPoints.append(newComponent)
+            else:
+                self.components.append(newComponent)
+
     def _calculateBaseScale(self):
         '''
         Calculates base scale factor. Returns base scaling factor
@@ -121,21 +170,302 @@ class Board():
         midY = (y1 + y2) / 2
         return midX, -midY
 
+    def _buildSpatialIndex(self):
+        '''
+        Builds a grid spatial index for each side of the board. Grid items are indexes of self.searchList (holes -> test points -> components),
+        so sorting found indexes gives the same priority as iterating over self.searchList. Holes are inserted into both sides as single points
+        because their collision area depends on the current scale.
+        '''
+        self.searchList = self.holes + self.testPoints + self.components # holes are first because TH has priority
+        cellSize = spatialIndex.SpatialGrid.calculateCellSize(self.boardArea, len(self.searchList))
+        self.spatialIndex = {'T': spatialIndex.SpatialGrid(cellSize), 'B': spatialIndex.SpatialGrid(cellSize)}
+
+        for i, component in enumerate(self.searchList):
+            if component.side is None:
+                for x, y in component.coords:
+                    for sideIndex in self.spatialIndex.values():
+                        sideIndex.insert(i, ((x, x), (y, y)))
+            elif component.side in self.spatialIndex:
+                self.spatialIndex[component.side].insert(i, component.collisionArea)
+        self.visibleItems = None, []
+
+    def _buildOutlineIndex(self):
+        '''
+        Builds a grid spatial index of board outlines. Grid items are tuples (outlineType, index) where outlineType is 'LINES' or 'ARCS' and index
+        is position in self.boardOutlines[outlineType]. Arcs are inserted with bounding box of their whole circle.
+        '''
+        outlinesCount = len(self.boardOutlines['LINES']) + len(self.boardOutlines['ARCS'])
+        cellSize = spatialIndex.SpatialGrid.calculateCellSize(self.boardArea, outlinesCount)
+        self.outlineIndex = spatialIndex.SpatialGrid(cellSize)
+
+        for i, (point1, point2) in enumerate(self.boardOutlines['LINES']):
+            (x1, y1), (x2, y2) = point1, point2
+            self.outlineIndex.insert(('LINES', i), ((min(x1, x2), max(x1, x2)), (min(y1, y2), max(y1, y2))))
+
+        for i, (point1, point2, point3) in enumerate(self.boardOutlines['ARCS']):
+            (x1, y1), (x3, y3) = point1, point3
+            radius = math.hypot(x1 - x3, y1 - y3)
+            self.outlineIndex.insert(('ARCS', i), ((x3 - radius, x3 + radius), (y3 - radius, y3 + radius)))
+
+    def _buildNameIndex(self):
+        '''
+        Builds indexes used for finding objects by name:
+            self.nameIndex - dict (componentName: component) of test points and components. If names repeat, the first object of
+                             self.testPoints + self.components is used
+            self.caseInsensitiveNames - dict (lowercase componentName: componentName)
+            self.holeCentroids - dict (holeName: (x, y)) - mean of coords of all holes of the name
+        '''
+        self.nameIndex = {}
+        for component in self.testPoints + self.components:
+            if isinstance(component.coords[0], float) and component.name not in self.nameIndex:
+                self.nameIndex[component.name] = component
+
+        self.caseInsensitiveNames = {}
+        for componentName in self.nameIndex:
+            if componentName.lower() not in self.caseInsensitiveNames:
+                self.caseInsensitiveNames[componentName.lower()] = componentName
+
+        self.holeCentroids = {}
+        for hole in self.holes:
+            xList = [x for x, y in hole.coords]
+            yList = [y for x, y in hole.coords]
+            self.holeCentroids[hole.name] = sum(xList) / len(xList), sum(yList) / len(yList)
+
+    def buildNetIndexes(self):
+        '''
+        Builds reverse indexes of self.nets, so finding pins of a component or components of a net does not scan all nets or all components. Returns:
+            componentPins - dict (componentName: {pin: netName})
+            netBoardComponents - dict (netName: [component, ...]), where component is a drawn component or test point of the board
+                                 (in order of self.components + self.testPoints)
+        '''
+        componentPins = {}
+        for netName in self.nets:
+            for componentName, pins in self.nets[netName].items():
+                if componentName not in componentPins:
+                    componentPins[componentName] = {}
+                for pin in pins:
+                    componentPins[componentName][pin] = netName
+
+        netBoardComponents = {}
+        for component in self.components + self.testPoints:
+            for netName in dict.fromkeys(componentPins.get(component.name, {}).values()):
+                if netName not in netBoardComponents:
+                    netBoardComponents[netName] = []
+                netBoardComponents[netName].append(component)
+
+        return componentPins, netBoardComponents
+
+    def _visibleBoardArea(self, surface, rect, invertX):
+        '''
+        Converts rectangle of the surface into board coords. Returns bounding box ((minX, maxX), (minY, maxY)) of the rotated rectangle
+            surface - pygame surface, tileRenderer.LayerTile or tileRenderer.TiledLayer
+            rect - (x, y, width, height) in the surface coords
+            invertX = True/False - mirrors X axis
+        '''
+        x, y, width, height = rect
+        inverseMatrix = mathFunctions.invertAffineMatrix(self._getSurfaceMatrix(surface, invertX))
+        corners = [mathFunctions.applyAffineMatrix(inverseMatrix, corner) for corner in ((x, y), (x + width, y), (x, y + height), (x + width, y + height))]
+        cornersX = [cornerX for cornerX, _ in corners]
+        cornersY = [cornerY for _, cornerY in corners]
+        return (min(cornersX), max(cornersX)), (min(cornersY), max(cornersY))
+
+    def _getVisibleItems(self, surface, side):
+        '''
+        Returns sorted list of self.searchList indexes of objects which bounding boxes overlap the surface (found with the spatial index of the side).
+        Surface is extended by the hole radius so that holes inserted as points are not cut on the edges. Result is cached until the surface matrix changes,
+        so render passes of the same surface query the index only once.
+            surface - pygame surface or tileRenderer.LayerTile
+            side - 'T' or 'B'
+        '''
+        if side not in self.spatialIndex:
+            return []
+
+        invertX = side=='T'
+        key = surface.get_size(), side, self._getSurfaceMatrix(surface, invertX)
+        if self.visibleItems[0] != key:
+            margin = self._getHoleRadius(side) + 1
+            width, height = surface.get_size()
+            area = self._visibleBoardArea(surface, (-margin, -margin, width + 2 * margin, height + 2 * margin), invertX)
+            self.visibleItems = key, sorted(self.spatialIndex[side].query(area))
+        return self.visibleItems[1]
+
+    def _getVisibleGroup(self, surface, side, groupName):
+        '''
+        Returns part of the sorted list of visible self.searchList indexes (see _getVisibleItems) that belongs to the group
+            surface - pygame surface or tileRenderer.LayerTile
+            side - 'T' or 'B'
+            groupName - 'HOLES', 'TESTPOINTS' or 'COMPONENTS'
+        '''
+        groupStart = {'HOLES': 0, 'TESTPOINTS': len(self.holes), 'COMPONENTS': len(self.holes) + len(self.testPoints)}[groupName]
+        groupEnd = {'HOLES': len(self.holes), 'TESTPOINTS': len(self.holes) + len(self.testPoints), 'COMPONENTS': len(self.searchList)}[groupName]
+
+        visibleItems = self._getVisibleItems(surface, side)
+        return visibleItems[bisect.bisect_left(visibleItems, groupStart):bisect.bisect_left(visibleItems, groupEnd)]
+
+    def _buildRenderArrays(self):
+        '''
+        Precomputes geometry of test points and components that does not depend on the view, so render passes only apply the transform of the current view
+        (see _getSurfaceMatrix). With numpy the geometry is built as contiguous arrays directly from the columns of self.model, otherwise as lists
+        (see _buildRenderLists). For each group ('TESTPOINTS', 'COMPONENTS') and side ('T', 'B') it stores tuple of:
+            rectangle corners - rotated case corners in board coords, array of shape (n, 4, 2)
+            circle centres - board coords, array of shape (m, 2)
+            circle radii - radii multiplied by base scale (radius on the surface is radius * zoomScale), array of shape (m,)
+            rectangle positions - array of shape (len(self.searchList),) with position of the rectangle in the rectangle corners array for each
+                                  self.searchList index (-1 if the object is not a rectangle of the group and side)
+            circle positions - the same as rectangle positions for circles
+        Radii of holes of each side are calculated here as well (self.holeRadii, see _calculateHoleRadius), so they do not depend on the order of render passes.
+        Must be called every time cases or base scale are changed.
+        '''
+        self.renderArrays = {}
+        self.holeRadii = {side: self._calculateHoleRadius(side) for side in ('T', 'B')}
+        if not self.batchRendering:
+            self._buildRenderLists()
+            return
+
+        ## columns of the model (without copying)
+        x, y = numpy.frombuffer(self.model.x), numpy.frombuffer(self.model.y)
+        angleRad = numpy.radians(numpy.frombuffer(self.model.angle))
+        x1, y1 = numpy.frombuffer(self.model.caseX1), numpy.frombuffer(self.model.caseY1)
+        x2, y2 = numpy.frombuffer(self.model.caseX2), numpy.frombuffer(self.model.caseY2)
+
+        groups = ('TESTPOINTS', self.testPoints, len(self.holes)), ('COMPONENTS', self.components, len(self.holes) + len(self.testPoints))
+        for groupName, group, groupStart in groups:
+            for side in ('T', 'B'):
+                rectangleIndexes = [groupStart + i for i, component in enumerate(group) if component.side == side and component.caseShape == 'RECT']
+                circleIndexes = [groupStart + i for i, component in enumerate(group) if component.side == side and component.caseShape == 'CIRCLE']
+                rectangleRows = numpy.array([self.searchList[i].row for i in rectangleIndexes], dtype=int)
+                circleRows = numpy.array([self.searchList[i].row for i in circleIndexes], dtype=int)
+
+                ## rotate case corners (x1, y1), (x2, y1), (x2, y2), (x1, y2) and move them to component coords
+                cornersX = numpy.stack([x1[rectangleRows], x2[rectangleRows], x2[rectangleRows], x1[rectangleRows]], axis=1)
+                cornersY = numpy.stack([y1[rectangleRows], y1[rectangleRows], y2[rectangleRows], y2[rectangleRows]], axis=1)
+                cos = numpy.cos(angleRad[rectangleRows])[:, None]
+                sin = numpy.sin(angleRad[rectangleRows])[:, None]
+                rectanglesArray = numpy.empty((len(rectangleRows), 4, 2))
+                rectanglesArray[..., 0] = cornersX * cos - cornersY * sin + x[rectangleRows][:, None]
+                rectanglesArray[..., 1] = cornersX * sin + cornersY * cos + y[rectangleRows][:, None]
+
+                centresArray = numpy.stack([x[circleRows], y[circleRows]], axis=1)
+                radiiArray = numpy.hypot(x1[circleRows] - x2[circleRows], y1[circleRows] - y2[circleRows]) * self.baseScale
+
+                ## positions of shapes in arrays for self.searchList indexes found by the spatial index
+                rectanglePositions = numpy.full(len(self.searchList), -1, dtype=int)
+                rectanglePositions[rectangleIndexes] = numpy.arange(len(rectangleIndexes))
+                circlePositions = numpy.full(len(self.searchList), -1, dtype=int)
+                circlePositions[circleIndexes] = numpy.arange(len(circleIndexes))
+                self.renderArrays[groupName, side] = rectanglesArray, centresArray, radiiArray, rectanglePositions, circlePositions
+
+    def _buildRenderLists(self):
+        '''
+        Builds the same geometry as _buildRenderArrays in lists (used without numpy). Rectangle corners are lists of 4 points, centres are (x, y) tuples
+        and positions are dicts (self.searchList index: position) of objects of the group and side
+        '''
+        groups = ('TESTPOINTS', self.testPoints, len(self.holes)), ('COMPONENTS', self.components, len(self.holes) + len(self.testPoints))
+        for groupName, group, groupStart in groups:
+            for side in ('T', 'B'):
+                rectangles, centres, radii = [], [], []
+                rectanglePositions, circlePositions = {}, {}
+                for i, component in enumerate(group, groupStart):
+                    if component.side != side:
+                        continue
+                    if component.caseShape == 'RECT':
+                        rectanglePositions[i] = len(rectangles)
+                        rectangles.append(component.points)
+                    elif component.caseShape == 'CIRCLE':
+                        circlePositions[i] = len(centres)
+                        centres.append(component.coords)
+                        radii.append(component.radius * self.baseScale)
+                self.renderArrays[groupName, side] = rectangles, centres, radii, rectanglePositions, circlePositions
+
+    def _screenPointsArray(self, surface, pointsArray, invertX=False):
+        '''
+        Vectorised version of screenPoint. Returns new array of screen coords with the same shape as pointsArray
+            surface - surface on which the points will be rendered
+            pointsArray - numpy array of shape (..., 2)
+            invertX = True/False - mirrors X axis
+        '''
+        a, b, c, d, e, f = self._getSurfaceMatrix(surface, invertX)
+        pointsX = pointsArray[..., 0]
+        pointsY = pointsArray[..., 1]
+
+        screenPoints = numpy.empty_like(pointsArray)
+        screenPoints[..., 0] = a * pointsX + c * pointsY + e
+        screenPoints[..., 1] = b * pointsX + d * pointsY + f
+        return screenPoints
+
+    def _renderShapesBatch(self, surface, groupName, side, fillColor, outlineColor):
+        '''
+        Renders visible rectangles and circles of the group with one vectorised transformation per shape type
+            surface - pygame surface
+            groupName - 'TESTPOINTS' or 'COMPONENTS'
+            side - 'T' or 'B'
+            fillColor, outlineColor - (R, G, B)
+        '''
+        invertX = side=='T'
+        rectanglesArray, centresArray, radiiArray, rectanglePositions, circlePositions = self.renderArrays[groupName, side]
+
+        ## select shapes found by the spatial index (positions are increasing, so the drawing order is kept)
+        visibleItems = numpy.array(self._getVisibleGroup(surface, side, groupName), dtype=int)
+        visibleRectangles = rectanglePositions[visibleItems]
+        visibleRectangles = visibleRectangles[visibleRectangles >= 0]
+        visibleCircles = circlePositions[visibleItems]
+        visibleCircles = visibleCircles[visibleCircles >= 0]
+        rectanglesArray = rectanglesArray[visibleRectangles]
+        centresArray, radiiArray = centresArray[visibleCircles], radiiArray[visibleCircles]
+
+        for screenPoints in self._screenPointsArray(surface, rectanglesArray, invertX).tolist():
+            pygame.draw.polygon(surface, fillColor, screenPoints)
+            pygame.draw.polygon(surface, outlineColor, screenPoints, width=1)
+
+        screenCentres = self._screenPointsArray(surface, centresArray, invertX).tolist()
+        screenRadii = (radiiArray * self.zoomScale).tolist()
+        for center, radius in zip(screenCentres, screenRadii):
+            pygame.draw.circle(surface, fillColor, center, radius)
+            pygame.draw.circle(surface, outlineColor, center, radius, width=1)
+
+    def _renderShapes(self, surface, groupName, side, fillColor, outlineColor):
+        '''
+        Renders visible rectangles and circles of the group one by one with precomputed geometry (see _buildRenderLists). Used without numpy
+            surface - pygame surface
+            groupName - 'TESTPOINTS' or 'COMPONENTS'
+            side - 'T' or 'B'
+            fillColor, outlineColor - (R, G, B)
+        '''
+        a, b, c, d, e, f = self._getSurfaceMatrix(surface, side=='T')
+        rectangles, centres, radii, rectanglePositions, circlePositions = self.renderArrays[groupName, side]
+
+        for i in self._getVisibleGroup(surface, side, groupName):
+            if i in rectanglePositions:
+                screenPoints = [(a * x + c * y + e, b * x + d * y + f) for x, y in rectangles[rectanglePositions[i]]]
+                pygame.draw.polygon(surface, fillColor, screenPoints)
+                pygame.draw.polygon(surface, outlineColor, screenPoints, width=1)
+            elif i in circlePositions:
+                x, y = centres[circlePositions[i]]
+                center = a * x + c * y + e, b * x + d * y + f
+                radius = radii[circlePositions[i]] * self.zoomScale
+                pygame.draw.circle(surface, fillColor, center, radius)
+                pygame.draw.circle(surface, outlineColor, center, radius, width=1)
+
     def renderBoard(self, surface, side='B'):
         '''
-        Rendes edges of the board into the surface
+        Rendes edges of the board that are inside of the surface (found with self.outlineIndex) into the surface
             Surface - pygame surface
             side - 'T' or 'B'
         '''
         invertX = side=='T'
+        width, height = surface.get_size()
+        visibleOutlines = sorted(self.outlineIndex.query(self._visibleBoardArea(surface, (-1, -1, width + 2, height + 2), invertX)))
+        visibleLines = [self.boardOutlines['LINES'][i] for outlineType, i in visibleOutlines if outlineType == 'LINES']
+        visibleArcs = [self.boardOutlines['ARCS'][i] for outlineType, i in visibleOutlines if outlineType == 'ARCS']
+
         ## draw lines
-        for point1, point2 in self.boardOutlines['LINES']:
+        for point1, point2 in visibleLines:
             screenCoords1 = self.screenPoint(surface, point1, invertX)
             screenCoords2 = self.screenPoint(surface, point2, invertX)
             pygame.draw.line(surface, Board.WHITE, screenCoords1, screenCoords2)
 
         ## draw arcs
-        for point1, point2, point3 in self.boardOutlines['ARCS']:
+        for point1, point2, point3 in visibleArcs:
             screenCoords1 = self.screenPoint(surface, point1, invertX)
             screenCoords2 = self.screenPoint(surface, point2, invertX)
             screenCoords3 = self.screenPoint(surface, point3, invertX)
@@ -151,68 +481,92 @@ class Board():
 
     def renderTestPoints(self, surface, side='B'):
         '''
-        Renders test points of the board into the surface
+        Renders test points of the board that are inside of the surface (found with the spatial index) into the surface
             Surface - pygame surface
             side - 'T' or 'B'
         '''
-        invertX = side=='T'
-        for testPoint in self.testPoints:
-            if testPoint.side == side:
-                x, y = testPoint.coords
-
-                ## draw proper shape
-                if testPoint.caseShape == 'RECT':
-                    screenPoints = [self.screenPoint(surface, point, invertX) for point in testPoint.points]
-                    pygame.draw.polygon(surface, Board.YELLOW, screenPoints)
-                    pygame.draw.polygon(surface, Board.YELLOW2, screenPoints, width=1)
-                elif testPoint.caseShape == 'CIRCLE':
-                    center = self.screenPoint(surface, (x, y), invertX)
-                    radius = testPoint.radius * self.baseScale * self.zoomScale
-                    pygame.draw.circle(surface, Board.YELLOW, center, radius)
-                    pygame.draw.circle(surface, Board.YELLOW2, center, radius, width=1)
-                    if not self.forceHoles:
-                        self.holeRadius = 1.15 * radius
+        if self.batchRendering:
+            self._renderShapesBatch(surface, 'TESTPOINTS', side, Board.YELLOW, Board.YELLOW2)
+        else:
+            self._renderShapes(surface, 'TESTPOINTS', side, Board.YELLOW, Board.YELLOW2)
 
     def renderComponents(self, surface, side='B'):
         '''
-        Rendes components of the board into the surface
+        Rendes components of the board that are inside of the surface (found with the spatial index) into the surface
             Surface - pygame surface
             side - 'T' or 'B'
         '''
-        invertX = side=='T'
-        for component in self.components:
-            if component.side == side:
-                x, y = component.coords
-
-                ## draw proper shape
-                if component.caseShape == 'RECT':
-                    screenPoints = [self.screenPoint(surface, point, invertX) for point in component.points]
-                    pygame.draw.polygon(surface, Board.GREEN2, screenPoints)
-                    pygame.draw.polygon(surface, Board.GREEN3, screenPoints, width=1)
-                elif component.caseShape == 'CIRCLE':
-                    center = self.screenPoint(surface, (x, y), invertX)
-                    radius = component.radius * self.baseScale * self.zoomScale
-                    pygame.draw.circle(surface, Board.GREEN2, center, radius)
-                    pygame.draw.circle(surface, Board.GREEN3, center, radius, width=1)
+        if self.batchRendering:
+            self._renderShapesBatch(surface, 'COMPONENTS', side, Board.GREEN2, Board.GREEN3)
+        else:
+            self._renderShapes(surface, 'COMPONENTS', side, Board.GREEN2, Board.GREEN3)
 
     def renderHoles(self, surface, side='B'):
         '''
-        Rendes holes of the board into the surface.
+        Rendes holes of the board that are inside of the surface (found with the spatial index) into the surface.
             Surface - pygame surface
             side - 'T' or 'B'
         '''
         invertX = side=='T'
-        for hole in self.holes:
-            for coords in hole.coords:
+        radius = self._getHoleRadius(side)
+        for i in self._getVisibleGroup(surface, side, 'HOLES'):
+            for coords in self.searchList[i].coords:
                 x, y = coords
-                if not self.forceHoles and self.holeRadius:
-                    radius = self.holeRadius
-                else:
-                    radius = 4 * self.zoomScale
                 screenCoords = self.screenPoint(surface, (x, y), invertX)
                 pygame.draw.circle(surface, Board.BLUE, screenCoords, radius)
                 pygame.draw.circle(surface, Board.BLUE2, screenCoords, radius, width=1)
 
+    def _getTransformMatrices(self, surfaceWidth, invertX, origin=(0, 0)):
+        '''
+        Returns cached affine matrices for the current view: matrix from board coords to surface coords and inverse matrix from screen coords (surface moved
+        by xMoveOffset, yMoveOffset) to board coords. Matrices are tuples (a, b, c, d, e, f) (see mathFunctions.invertAffineMatrix) and are calculated only
+        after the view has changed (zoom, rotation, move offsets, default view).
+            surfaceWidth - width of the surface on which points are rendered
+            invertX = True/False - mirrors X axis
+            origin - (x, y) position of the surface in the layer (see tileRenderer.LayerTile). Inverse matrix does not depend on it
+        '''
+        key = surfaceWidth, invertX, origin
+        if key not in self.transformMatrices:
+            ## base scale and base translation -> rotation around the midpoint -> zoom scaling
+            angleRad = math.radians(-self.rotationAngle if invertX else self.rotationAngle)
+            cos, sin = math.cos(angleRad), math.sin(angleRad)
+            midX, midY = self.translateMidPoint()
+            xMoved, yMoved = self.xBaseOffset - midX, self.yBaseOffset - midY
+
+            a = self.zoomScale * self.baseScale * cos
+            b = self.zoomScale * self.baseScale * sin
+            c = -self.zoomScale * self.baseScale * sin
+            d = self.zoomScale * self.baseScale * cos
+            e = self.zoomScale * (xMoved * cos - yMoved * sin + midX)
+            f = self.zoomScale * (xMoved * sin + yMoved * cos + midY)
+
+            ## mirror X axis
+            if invertX:
+                a, c, e = -a, -c, surfaceWidth - e
+
+            originX, originY = origin
+            matrix = a, b, c, d, e - originX, f - originY
+            screenMatrix = a, b, c, d, e + self.xMoveOffset, f + self.yMoveOffset
+            self.transformMatrices[key] = matrix, mathFunctions.invertAffineMatrix(screenMatrix)
+        return self.transformMatrices[key]
+
+    def _getSurfaceMatrix(self, surface, invertX):
+        '''
+        Returns matrix from board coords to coords of the surface. Surfaces that are parts of the layer (tileRenderer.LayerTile) are moved by their origin
+        and mirrored with the width of the whole layer
+            surface - pygame surface, tileRenderer.LayerTile or tileRenderer.TiledLayer
+            invertX = True/False - mirrors X axis
+        '''
+        layerWidth = getattr(surface, 'layerWidth', None) or surface.get_width()
+        origin = getattr(surface, 'origin', (0, 0))
+        return self._getTransformMatrices(layerWidth, invertX, origin)[0]
+
+    def _invalidateTransformMatrices(self):
+        '''
+        Clears cached transform matrices. Must be called every time zoomScale, rotationAngle or move offsets are changed
+        '''
+        self.transformMatrices = {}
+
     def screenPoint(self, surface, coords, invertX=False):
         '''
         Calculates point's coordinates related to screen. Returns recalculated tuple (screenX, screenY)
@@ -221,27 +575,8 @@ class Board():
             invertX = True/False - mirrors X axis
         '''
         pointX, pointY = coords
-
-        ## translation
-        pointXMoved = pointX * self.baseScale + self.xBaseOffset
-        pointYMoved = pointY * self.baseScale + self.yBaseOffset
-
-        midPointMoved = self.translateMidPoint()
-
-        ## rotation
-        if invertX:
-            pointXRotated, pointYRotated = mathFunctions.rotatePoint((pointXMoved, pointYMoved), -self.rotationAngle, rotationPoint=midPointMoved)
-        else:
-            pointXRotated, pointYRotated = mathFunctions.rotatePoint((pointXMoved, pointYMoved), self.rotationAngle, rotationPoint=midPointMoved)
-
-        ## scaling
-        screenPointX = pointXRotated * self.zoomScale
-        screenPointY = pointYRotated * self.zoomScale
-
-        if invertX:
-            screenPointX = surface.get_width() - screenPointX
-
-        return screenPointX, screenPointY
+        a, b, c, d, e, f = self._getSurfaceMatrix(surface, invertX)
+        return a * pointX + c * pointY + e, b * pointX + d * pointY + f
 
     def inverseScreenPoint(self, surface, screenCoords, invertX=False):
         '''
@@ -250,26 +585,8 @@ class Board():
             coords - tuple (x, y) to calculated into surface coords
             invertX = True/False - mirrors X axis
         '''
-        screenPointX, screenPointY = screenCoords
-        ## reverse move vector and zoom scale
-        if invertX:
-            screenPointX = surface.get_width() - screenPointX
-            pointX = (screenPointX + self.xMoveOffset) / self.zoomScale
-            angle = self.rotationAngle
-        else:
-            pointX = (screenPointX - self.xMoveOffset) / self.zoomScale
-            angle = -self.rotationAngle
-        pointY = (screenPointY - self.yMoveOffset) / self.zoomScale
-
-        ## reverse rotation
-        midPointMoved = self.translateMidPoint()
-        pointX, pointY = mathFunctions.rotatePoint((pointX, pointY), angle, rotationPoint=midPointMoved)
-
-        ## reverse base translation and base scale
-        pointX = (pointX - self.xBaseOffset) / self.baseScale
-        pointY = (pointY - self.yBaseOffset) / self.baseScale
-
-        return pointX, pointY
+        inverseMatrix = self._getTransformMatrices(surface.get_width(), invertX)[1]
+        return mathFunctions.applyAffineMatrix(inverseMatrix, screenCoords)
 
     def translateMidPoint(self):
         '''
@@ -298,38 +615,80 @@ class Board():
         points = point1, point2, point3, point4, point5, point6, point7
         pygame.draw.polygon(surface, Board.RED, points)
 
-    def renderBoardLayer(self, boardLayer, side, marker, netComponents):
+    def _calculateHoleRadius(self, side):
+        '''
+        Calculates radius of holes multiplied by base scale as 1.15 * radius of the last circular test point on the side. Returns radius or None
+        if there are no circular test points or if holes have constant radius (self.forceHoles)
+            side - 'T' or 'B'
+        '''
+        if self.forceHoles:
+            return None
+        for testPoint in reversed(self.testPoints):
+            if testPoint.side == side and testPoint.caseShape == 'CIRCLE':
+                return 1.15 * testPoint.radius * self.baseScale
+        return None
+
+    def _getHoleRadius(self, side):
         '''
-        Renders on surface board outline, components, holes and marker. (board ooutline -> Holes -> netComponents -> testpoints -> marker)
+        Returns radius of holes of the side in the current scale (precomputed radius, see _calculateHoleRadius, or constant 4 px at zoom 1)
+            side - 'T' or 'B'
+        '''
+        holeRadius = self.holeRadii.get(side)
+        return holeRadius * self.zoomScale if holeRadius else 4 * self.zoomScale
+
+    def renderStaticLayer(self, boardLayer, side):
+        '''
+        Renders on surface parts of the board that do not change when cursor, marker or net is changed. (board outline -> holes -> testpoints -> components)
             boardLayer - pygame surface
             side - side of the board ('T' or 'B')
-            marker = (renderMarker, coords) - tuple of True/False(should marker be rendered?) and coords of marker (coords of where to render marker)
+        '''
+        with self.profiler.measure('renderBoard'):
+            self.renderBoard(boardLayer, side)
+        with self.profiler.measure('renderHoles'):
+            self.renderHoles(boardLayer, side)
+        with self.profiler.measure('renderTestPoints'):
+            self.renderTestPoints(boardLayer, side)
+        with self.profiler.measure('renderComponents'):
+            self.renderComponents(boardLayer, side)
+
+    def renderOverlayLayer(self, surface, side, marker, netComponents, offset=(0, 0)):
+        '''
+        Renders overlays of the static layer - circles around netComponents and marker. (netComponents -> marker)
+            surface - pygame surface
+            side - side of the board ('T' or 'B')
+            marker = (renderMarker, coords) - tuple of True/False(should marker be rendered?) and coords of marker in board layer coords
             netComponents = sequence of ((x, y), side) (x, y are coords from file to be recalculated into the screenPoint)
+            offset - (x, y) position of the board layer on the surface
         '''
         isMarker, markerCoords = marker
 
-
-        self.renderBoard(boardLayer, side)
-        self.renderHoles(boardLayer, side)
         if netComponents:
-            self.renderNetComponents(boardLayer, side, netComponents)
-        self.renderTestPoints(boardLayer, side)
-        self.renderComponents(boardLayer, side)
+            self.renderNetComponents(surface, side, netComponents, offset)
         if isMarker:
-            self.renderMarker(boardLayer, markerCoords)
+            markerX, markerY = markerCoords
+            offsetX, offsetY = offset
+            self.renderMarker(surface, (markerX + offsetX, markerY + offsetY))
 
-    def createLayers(self):
+    def createLayers(self, side='B'):
         '''
-        Returns boardLayer (surface on which pcba is drawn) and mouseLayer (surface on which cursor outline is drawn)
+        Sets self.boardLayer to tiled static layer of the side in the current zoom and rotation (tileRenderer.TiledLayer). Layer is not rendered here -
+        only tiles visible on the screen are rendered by renderImage and they are cached until self.TILES_MEMORY_BUDGET is exceeded
+            side - side of the board ('T' or 'B')
         '''
-        self.boardLayer = pygame.Surface((Board.WIDTH * self.zoomScale,
-                                     Board.HEIGHT * self.zoomScale))
-        self.mouseLayer = pygame.Surface((Board.WIDTH, Board.HEIGHT))
-        self.mouseLayer.set_colorkey((Board.BLACK)) # set black as transparent
+        key = side, self.zoomScale, self.rotationAngle
+        layerSize = Board.WIDTH * self.zoomScale, Board.HEIGHT * self.zoomScale
+        self.boardLayer = tileRenderer.TiledLayer(layerSize, key, self.tileCache,
+                                                  lambda surface: self.renderStaticLayer(surface, side), Board.TILE_SIZE)
+
+    def clearStaticLayers(self):
+        '''
+        Clears cached tiles of static layers. Must be called when geometry of the board is changed
+        '''
+        self.tileCache.clear()
 
     def updateLayers(self, boardLayerData, mouseLayerData, netComponents=[]):
         '''
-        Updates layers - draws marker on board layer, cursor outline on mouse layer, and marks component on selected net
+        Updates overlay data - marker, cursor outline and components on selected net. Overlays are drawn on top of the static layer by renderImage
             boardLayerData = side, ('T' or 'B')
                              markerData (True/False, (x,y))
             mouseLayerData = cursorCoords, (x, y)
@@ -337,20 +696,26 @@ class Board():
             netComponents = sequence of ((x, y), side)
         '''
         side, markerData = boardLayerData
-        self.renderBoardLayer(self.boardLayer, side, markerData, netComponents)
-
-        cursorCoords, cursorColor = mouseLayerData
-        if cursorCoords:
-            self.renderCursorOutline(self.mouseLayer, cursorCoords, cursorColor)
+        self.createLayers(side)
+        self.overlayData = side, markerData, mouseLayerData, netComponents
 
     def renderImage(self, targetSurface):
         '''
-        Prepares image by bliting board layer and mouseLayer into target surface
+        Prepares image by bliting visible tiles of static board layer into target surface (moving the board only changes the blit position) and rendering overlays on top of it
             targetSurface - surface with final image
         '''
+        side, markerData, mouseLayerData, netComponents = self.overlayData
+        offset = self.xMoveOffset, self.yMoveOffset
+
         targetSurface.fill(Board.BLACK)
-        targetSurface.blit(self.boardLayer, (self.xMoveOffset, self.yMoveOffset))
-        targetSurface.blit(self.mouseLayer, (0, 0))
+        with self.profiler.measure('blit tiles'):
+            self.boardLayer.blitTo(targetSurface, offset)
+        with self.profiler.measure('render overlays'):
+            self.renderOverlayLayer(targetSurface, side, markerData, netComponents, offset)
+
+        cursorCoords, cursorColor = mouseLayerData
+        if cursorCoords:
+            self.renderCursorOutline(targetSurface, cursorCoords, cursorColor)
 
     def renderCursorOutline(self, layer, coords, color):
         '''
@@ -360,17 +725,27 @@ class Board():
         x, y = coords
         pygame.draw.rect(layer, color, (x - self.boxOutlineWidth // 2, y - self.boxOutlineHeight // 2, self.boxOutlineWidth, self.boxOutlineHeight), 3)
 
-    def renderNetComponents(self, surface, side, netComponents):
+    def renderNetComponents(self, surface, side, netComponents, offset=(0, 0)):
         '''
-        Renders circular outline around each of the passed netComponents. Radius = 10 * self.zoomScale
+        Renders circular outline around each of the passed netComponents that is inside of the visible window. Radius = 10 * self.zoomScale
             surface - pygame surface with components
             side - currently drawn side
             netComponents - sequence of ((x, y), side), where (x, y) defines coordinates of component in component coordinate system (coords in schematic file)
+            offset - (x, y) position of the board layer on the surface
         '''
-        componentsOnSide = [componentCoords for componentCoords, componentSide in netComponents if componentSide == side]
+        offsetX, offsetY = offset
+        invertX = side == 'T'
+
+        ## visible window in board coords extended by the circle radius
+        margin = 10 * self.zoomScale + 1
+        width, height = surface.get_size()
+        (minX, maxX), (minY, maxY) = self._visibleBoardArea(self.boardLayer, (-offsetX - margin, -offsetY - margin, width + 2 * margin, height + 2 * margin), invertX)
+
+        componentsOnSide = [componentCoords for componentCoords, componentSide in netComponents
+                            if componentSide == side and minX <= componentCoords[0] <= maxX and minY <= componentCoords[1] <= maxY]
         for componentCoords in componentsOnSide:
-            invertX = side == 'T'
-            center = self.screenPoint(self.boardLayer, componentCoords, invertX)
+            centerX, centerY = self.screenPoint(self.boardLayer, componentCoords, invertX)
+            center = centerX + offsetX, centerY + offsetY
             pygame.draw.circle(surface, Board.VIOLET, center, 10 * self.zoomScale, width=3)
             pygame.draw.circle(surface, Board.VIOLET2, center, 10 * self.zoomScale - 3, width=1)
             pygame.draw.circle(surface, Board.VIOLET2, center, 10 * self.zoomScale, width=1)
@@ -386,6 +761,7 @@ class Board():
             self.xMoveOffset += x
         if abs(y) < self.maxRelativeDistance or forceChange:
             self.yMoveOffset += y
+        self._invalidateTransformMatrices()
         return self.xMoveOffset, self.yMoveOffset
 
     def zoom(self, coords, sign='+'):
@@ -397,42 +773,63 @@ class Board():
         x, y = coords
         deltaX, deltaY = 0, 0
         if sign == '+':
-            if self.zoomScale + 0.2 < 5:
+            if self.zoomScale + 0.2 < Board.MAX_ZOOM:
                 self.zoomScale += 0.2
                 deltaX = -(x * 0.2)
                 deltaY = -(y * 0.2)
         elif sign == '-':
-            if self.zoomScale - 0.2 > .5:
+            if self.zoomScale - 0.2 > Board.MIN_ZOOM:
                 self.zoomScale -= 0.2
                 deltaX = (x * 0.2)
                 deltaY = (y * 0.2)
 
+        self._invalidateTransformMatrices()
         return deltaX, deltaY
 
-    def findComponentUsingName(self, surface, componentName):
+    def findComponentName(self, componentName, ignoreCase=False):
         '''
-        Iterates over self.testPoints + self.components + self.holes. If component exists then it returns its screen coords and side for setting up a marker. If there is no such component
+        Returns name of the test point or component as it is stored in the board or None if there is no such component
+            componentName - name of component
+            ignoreCase - if True letter case of componentName is not taken into account
+        '''
+        if componentName in self.nameIndex:
+            return componentName
+        if ignoreCase:
+            return self.caseInsensitiveNames.get(componentName.lower())
+        return None
+
+    def findComponentUsingName(self, surface, componentName, ignoreCase=False):
+        '''
+        Finds test point or component in self.nameIndex. If component exists then it returns its screen coords and side for setting up a marker. If there is no such component
         then (None, None), None is returned
             surface - surface on which components are drawn
             componentName - name of component
+            ignoreCase - if True letter case of componentName is not taken into account
         '''
+        componentName = self.findComponentName(componentName, ignoreCase)
+        if componentName is None:
+            return (None, None), None
 
-        searchList = self.testPoints + self.components + self.holes
+        component = self.nameIndex[componentName]
+        invertX = component.side == 'T'
+        screenX, screenY = self.screenPoint(surface, component.coords, invertX)
+        return (float(screenX), float(screenY)), component.side
 
-        for component in searchList:
-            if component.name == componentName:
-                invertX = component.side == 'T'
-                coords = component.coords
-                if not isinstance(coords[0], float):
-                    continue
-                screenX, screenY = self.screenPoint(surface, coords, invertX)
-                return (float(screenX), float(screenY)), component.side
-        return (None, None), None
+    def findHoleUsingName(self, surface, holeName, invertX=False):
+        '''
+        Returns screen coords of the centroid of the holes with given name or (None, None) if there is no such hole
+            surface - surface on which holes are drawn
+            holeName - name of the hole
+            invertX - True if the top side is drawn
+        '''
+        if holeName not in self.holeCentroids:
+            return None, None
+        return self.screenPoint(surface, self.holeCentroids[holeName], invertX)
 
     def findComponentUsingClick(self, surface, screenCoords, side):
         '''
-        Iterates over self.testPoints + self.components + self.holes. If given coords collide with any of the collision area of the component it returns its name.
-        If no component is found then None is returned.
+        Gets candidates from spatial index of the drawn side and checks them in order holes -> test points -> components. If given coords collide with
+        any of the collision area of the component it returns its name. If no component is found then None is returned.
             surface - surface on which components are drawn
             screenCoords - absolute coordinates of cursor
             side - currently drawn side of pcba
@@ -441,12 +838,18 @@ class Board():
         pointX, pointY = self.inverseScreenPoint(surface, screenCoords, invertX)
         #print(screenCoords, pointX, pointY, f'offsets:{self.xBaseOffset}+{self.xMoveOffset}, scale:{self.baseScale}')
 
-        searchList = self.holes + self.testPoints + self.components # holes are searched first because TH has priority
-        for component in searchList:
-            if component.side in (side, None): # check if component is on the currently drawn side or it is a hole (boardObjects.Component has default side=None)
-                if component.checkCollision((pointX, pointY), self.baseScale * self.zoomScale):
-                    isHole = not component.side
-                    return component.name, isHole
+        if side not in self.spatialIndex:
+            return None, None
+
+        scale = self.baseScale * self.zoomScale
+        holeRadius = 3 / scale # the same as collision area of boardObjects.Component
+        candidates = self.spatialIndex[side].queryPoint((pointX, pointY), holeRadius)
+
+        for i in sorted(candidates): # holes are searched first because TH has priority
+            component = self.searchList[i]
+            if component.checkCollision((pointX, pointY), scale):
+                isHole = not component.side
+                return component.name, isHole
 
         return None, None
 
@@ -458,20 +861,25 @@ class Board():
         self.yMoveOffset = 0
         self.zoomScale = 1
         self.rotationAngle = 0
+        self._invalidateTransformMatrices()
 
     def setRotationAngle(self, angleDeg):
         '''
         Setter for self.rotationAngle
         '''
-        self.rotationAngle = angleDeg
+        if angleDeg != self.rotationAngle:
+            self.rotationAngle = angleDeg
+            self._invalidateTransformMatrices()
 
     def setComponentsCustomScale(self, scale):
         '''
         Updates case dimension by multiplying each point by given scale and calls __init__ to update parameters
             scale - int or float
         '''
-        for component in (self.components + self.testPoints):
-            component.setCustomCaseScale(scale)
+        self.model.setCaseScale(scale)
+        self._buildSpatialIndex()
+        self._buildRenderArrays()
+        self.clearStaticLayers()
 
 #### camcad and gencad
 '''
@@ -545,7 +953,7 @@ if __name__ == '__main__':
             moveVector = board.getSetMoveVector(currentPosRel)
 
         ## 1. create surfaces with PCB
-        board.createLayers()
+        board.createLayers(side)
 
         ## 2. update marker coords
         markerCoords, markerSide = board.findComponentUsingName(board.boardLayer, 'TP617')
@@ -646,7 +1054,7 @@ if __name__ == '__main__':
             moveVector = board.getSetMoveVector(currentPosRel)
 
         ## 1. create surfaces with PCB
-        board.createLayers()
+        board.createLayers(side)
 
         ## 2. update marker coords
         markerCoords, markerSide = board.findComponentUsingName(board.boardLayer, 'TP617')
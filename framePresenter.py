@@ -0,0 +1,70 @@
+import sys
+import pygame
+from PIL import Image, ImageTk
+import frameProfiler
+
+class FramePresenter():
+    '''
+    Presents frames rendered by pygame on tkinter canvas. Frame surface stores pixels in the byte order that PIL can read directly, so PIL image
+    shares memory with the surface (no pygame.image.tostring and Image.frombytes copies). One PhotoImage and one canvas item are created and then
+    reused for every frame.
+    '''
+    def __init__(self, canvas, size, canvasOffset):
+        '''
+        Creates FramePresenter instance. Attributes:
+            self.canvas - tkinter canvas on which frames are shown
+            self.size - (width, height) of the frame
+            self.canvasOffset - (x, y) position of the frame center on the canvas
+            self.surface - pygame surface into which frames must be rendered
+            self.rawMode - PIL raw mode of self.surface pixels
+            self.image - ImageTk.PhotoImage shown on the canvas
+            self.canvasItem - id of the canvas image item (None until the first frame is presented)
+            self.profiler - frameProfiler.FrameProfiler that measures stages of presenting (disabled by default)
+        '''
+        self.canvas = canvas
+        self.size = size
+        self.canvasOffset = canvasOffset
+
+        ## 32 bit surface with R, G, B in the lowest bytes -> 'RGBX' in memory on little endian machines
+        self.surface = pygame.Surface(size, 0, 32, (0xFF, 0xFF00, 0xFF0000, 0))
+        self.rawMode = FramePresenter._getRawMode(self.surface)
+
+        self.image = ImageTk.PhotoImage('RGB', size)
+        self.canvasItem = None
+        self.profiler = frameProfiler.FrameProfiler()
+
+    @staticmethod
+    def _getRawMode(surface):
+        '''
+        Returns PIL raw mode ('RGBX', 'XBGR', ...) that describes order of bytes of 32 bit surface pixel in memory
+            surface - 32 bit pygame surface
+        '''
+        rawMode = ['X'] * 4
+        for channel, shift, mask in zip('RGB', surface.get_shifts(), surface.get_masks()):
+            if mask:
+                byteIndex = shift // 8
+                rawMode[byteIndex if sys.byteorder == 'little' else 3 - byteIndex] = channel
+        return ''.join(rawMode)
+
+    def present(self):
+        '''
+        Pastes self.surface into PhotoImage and shows it on the canvas. Canvas item is created only for the first frame - later frames only update the image.
+        Surface is locked only during pasting, so it can be used for rendering again after this method returns.
+        '''
+        with self.profiler.measure('present PIL'):
+            pixelsView = self.surface.get_view('1')
+            imagePIL = Image.frombuffer('RGBX', self.size, pixelsView, 'raw', self.rawMode, self.surface.get_pitch(), 1)
+        with self.profiler.measure('present PhotoImage'):
+            self.image.paste(imagePIL)
+
+        ## release the surface lock (it is held as long as the buffer is exported)
+        del imagePIL, pixelsView
+
+        ## PhotoImage is updated in place, so the canvas item shows new frame without being reconfigured
+        if self.canvasItem is None:
+            self.canvasItem = self.canvas.create_image(self.canvasOffset, image=self.image)
+
+        ## canvas is redrawn when tkinter is idle - it is forced only when profiling, so time of the redraw can be measured
+        if self.profiler.enabled:
+            with self.profiler.measure('present canvas'):
+                self.canvas.update_idletasks()
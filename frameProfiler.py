@@ -0,0 +1,214 @@
+import bisect
+import collections
+import contextlib
+import json
+import os
+import threading
+import time
+import pygame
+
+class FrameProfiler():
+    '''
+    Opt-in instrumentation of drawing and loading. Stages are timed with measure() context manager; times of the same stage measured during one frame
+    (between beginFrame and endFrame) are summed. Last HISTORY_SIZE samples of every stage are kept, shown as an overlay on the frame and saved
+    as rolling histograms to a JSON file. When the profiler is disabled measure() returns shared empty context, so instrumented code costs almost nothing.
+    '''
+    HISTORY_SIZE = 600 # samples kept for every stage (10 s of frames at 60 FPS)
+    HISTOGRAM_BINS = (0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 33, 66, 133) # upper limits of histogram bins in ms (last bin is unlimited)
+    EXPORT_INTERVAL = 1 # s between saving of histograms file
+    OVERLAY_FONT_SIZE = 14
+    OVERLAY_COLOR = 255, 255, 255
+    OVERLAY_BACKGROUND = 0, 0, 0, 170
+
+    def __init__(self, enabled=False, exportPath=None):
+        '''
+        Creates FrameProfiler instance. Attributes:
+            self.enabled - if False nothing is measured
+            self.exportPath - path of JSON file with histograms (None -> histograms are not saved)
+            self.samples - dict (stageName: deque of last times in seconds)
+            self.frameTimes - dict (stageName: seconds) of stages measured in the current frame (None outside of frame - measured times are added to samples directly)
+            self.frameStart - start time of the current frame
+            self.lastExportTime - time of the last saving of histograms
+            self.lock - lock of self.samples (sections of the loading task are added from worker thread)
+        '''
+        self.enabled = enabled
+        self.exportPath = exportPath
+        self.samples = {}
+        self.frameTimes = None
+        self.frameStart = 0
+        self.lastExportTime = 0
+        self.lock = threading.RLock()
+        self.font = None
+        self._nullContext = contextlib.nullcontext()
+
+    def setEnabled(self, enabled):
+        '''
+        Enables or disables measuring. Samples are cleared, so statistics describe only the current session
+        '''
+        with self.lock:
+            self.enabled = enabled
+            self.samples = {}
+        self.frameTimes = None
+
+    def measure(self, stageName):
+        '''
+        Returns context manager that measures time of its body as stageName
+        '''
+        if not self.enabled:
+            return self._nullContext
+        return self._measure(stageName)
+
+    @contextlib.contextmanager
+    def _measure(self, stageName):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            if self.frameTimes is not None:
+                self.frameTimes[stageName] = self.frameTimes.get(stageName, 0) + seconds
+            else:
+                self.addSample(stageName, seconds)
+
+    def addSample(self, stageName, seconds):
+        '''
+        Adds time of the stage to its samples (also from other threads - e.g. sections of the loading task)
+        '''
+        if not self.enabled:
+            return
+        with self.lock:
+            if stageName not in self.samples:
+                self.samples[stageName] = collections.deque(maxlen=FrameProfiler.HISTORY_SIZE)
+            self.samples[stageName].append(seconds)
+
+    def beginFrame(self):
+        if self.enabled:
+            self.frameTimes = {}
+            self.frameStart = time.perf_counter()
+
+    def endFrame(self):
+        '''
+        Adds times of stages measured during the frame and total time of the frame to samples. Saves histograms every EXPORT_INTERVAL seconds
+        '''
+        if not self.enabled or self.frameTimes is None:
+            return
+        frameTimes, self.frameTimes = self.frameTimes, None
+        frameTimes['frame'] = time.perf_counter() - self.frameStart
+        for stageName, seconds in frameTimes.items():
+            self.addSample(stageName, seconds)
+
+        if self.exportPath and time.perf_counter() - self.lastExportTime >= FrameProfiler.EXPORT_INTERVAL:
+            self.lastExportTime = time.perf_counter()
+            self.saveHistograms(self.exportPath)
+
+    def sectionTimer(self, progressCallback=None, prefix='load'):
+        '''
+        Returns SectionTimer - progressCallback for loaders that measures time of every section and passes calls to progressCallback
+        '''
+        return SectionTimer(self, progressCallback, prefix)
+
+    def getStatistics(self, stageName):
+        '''
+        Returns dict with count, last, mean, p95 and max time of the stage in ms
+        '''
+        with self.lock:
+            lastTime = self.samples[stageName][-1]
+            times = sorted(self.samples[stageName])
+        return {'count': len(times),
+                'last': lastTime * 1000,
+                'mean': sum(times) / len(times) * 1000,
+                'p95': times[min(len(times) - 1, int(0.95 * len(times)))] * 1000,
+                'max': times[-1] * 1000}
+
+    def getHistogram(self, stageName):
+        '''
+        Returns list of counts of samples of the stage in bins (see HISTOGRAM_BINS)
+        '''
+        counts = [0] * (len(FrameProfiler.HISTOGRAM_BINS) + 1)
+        with self.lock:
+            times = list(self.samples[stageName])
+        for seconds in times:
+            counts[bisect.bisect_left(FrameProfiler.HISTOGRAM_BINS, seconds * 1000)] += 1
+        return counts
+
+    def saveHistograms(self, filePath):
+        '''
+        Saves statistics and histograms of all stages to JSON file. File is replaced at once, so readers never see partially written file
+        '''
+        with self.lock:
+            stageNames = [stageName for stageName in self.samples if self.samples[stageName]]
+        data = {'binsMs': list(FrameProfiler.HISTOGRAM_BINS) + [None],
+                'stages': {stageName: dict(self.getStatistics(stageName), histogram=self.getHistogram(stageName)) for stageName in stageNames}}
+        temporaryPath = filePath + '.tmp'
+        try:
+            with open(temporaryPath, 'w') as file:
+                json.dump(data, file, indent=2)
+            os.replace(temporaryPath, filePath)
+        except OSError:
+            pass
+
+    def renderOverlay(self, surface, stageNames, position=(10, 10)):
+        '''
+        Renders table of statistics (last, mean, p95 time in ms) of given stages on the surface. Stages without samples are skipped
+            surface - pygame surface (frame)
+            stageNames - names of shown stages in order of rows
+            position - (x, y) of the top left corner of the table
+        '''
+        if not self.enabled:
+            return
+        if self.font is None:
+            self.font = pygame.font.SysFont('consolas,dejavusansmono,monospace', FrameProfiler.OVERLAY_FONT_SIZE)
+
+        rows = [('stage', 'last', 'mean', 'p95')]
+        for stageName in stageNames:
+            if self.samples.get(stageName):
+                statistics = self.getStatistics(stageName)
+                rows.append((stageName, f'{statistics["last"]:.2f}', f'{statistics["mean"]:.2f}', f'{statistics["p95"]:.2f}'))
+
+        ## cells are rendered separately and aligned in columns (names to the left, times to the right), so font does not have to be monospaced
+        cellSurfaces = [[self.font.render(cell, True, FrameProfiler.OVERLAY_COLOR) for cell in row] for row in rows]
+        columnWidths = [max([row[i].get_width() for row in cellSurfaces]) + 10 for i in range(len(rows[0]))]
+        lineHeight = self.font.get_linesize()
+        background = pygame.Surface((sum(columnWidths) + 10, lineHeight * len(rows) + 10), pygame.SRCALPHA)
+        background.fill(FrameProfiler.OVERLAY_BACKGROUND)
+        surface.blit(background, position)
+
+        y = position[1] + 5
+        for row in cellSurfaces:
+            x = position[0] + 5
+            for i, cellSurface in enumerate(row):
+                cellX = x if i == 0 else x + columnWidths[i] - 10 - cellSurface.get_width()
+                surface.blit(cellSurface, (cellX, y))
+                x += columnWidths[i]
+            y += lineHeight
+
+class SectionTimer():
+    '''
+    progressCallback for loaders (see schematicLoader.SchematicLoader.loadSchematic). Section lasts from its call to the next call or to finish()
+    '''
+    def __init__(self, profiler, progressCallback=None, prefix='load'):
+        '''
+        Creates SectionTimer instance. Attributes:
+            self.profiler - FrameProfiler that gets samples '{prefix} {sectionName}'
+            self.progressCallback - function called with the same arguments (or None)
+            self.section - (name, start time) of the current section or None
+        '''
+        self.profiler = profiler
+        self.progressCallback = progressCallback
+        self.prefix = prefix
+        self.section = None
+
+    def __call__(self, sectionName, stepNumber, stepsCount):
+        self.finish()
+        self.section = sectionName, time.perf_counter()
+        if self.progressCallback:
+            self.progressCallback(sectionName, stepNumber, stepsCount)
+
+    def finish(self):
+        '''
+        Ends the current section
+        '''
+        if self.section:
+            sectionName, start = self.section
+            self.profiler.addSample(f'{self.prefix} {sectionName}', time.perf_counter() - start)
+            self.section = None
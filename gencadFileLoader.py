@@ -6,39 +6,60 @@ class GenCADLoader():
     ## default values for shapes
     CIRCLE_DIMENSIONS = [(0.050, 0.050), (0.025, 0.025)]
     RECTANGLE_DIMENSIONS = [(-0.020, -0.016), (0.020, 0.016)]
+    SECTIONS = ('BOARD', 'PADS', 'PADSTACKS', 'SHAPES', 'COMPONENTS', 'SIGNALS', 'MECH', 'TESTPINS')
+    COMPONENT_PARAMETERS = ('PLACE', 'LAYER', 'ROTATION', 'SHAPE')
+    THT_MARKING = ('thmt',)
 
     def __init__(self):
         '''
         Creates GenCADLoader instance. Attributes:
-            self.sections - dict of sections in file (sectionName:[sectionStart, sectionEnd], where sectionStart, sectionEnd are line's numbers)
-            self.schematic  - list of lines in .cad file
+            self.sectionHandlers - dict of methods that parse lines of sections (sectionName: handler). Lines of other sections are skipped
             self.components - dict of components (componentName: [(x, y), side, case])
             self.holes - dict of TH holes (componentName: [(x, y), ...])
             self.nets - dict of nets (netName:{component:[pins]})
             self.boardOutlines -  dict {'AREA':[(x1, y1), (x2, y2)], 'LINES':[[(x11, y11), (x12, y12)], [(x21, y21), (x22, y22)], ...], 'ARCS':[[(x11, y11), (x12, y12), (x13, y13)], ...]}
             self.shapes - dict of shapes
+            self.shapeHoles - dict of TH pins of shapes with INSERT thmt line (shapeName: [(x, y), ...])
+            self.componentsData - list of components read from COMPONENTS section [componentName, (x, y), side, angle, shapeName]
+            self.mechHoles - list of holes read from MECH section [(holeName, (x, y)), ...]
+        Parsing state kept between lines of a section:
+            self.boardArea - [minX, maxX, minY, maxY] of board outline lines
+            self.isArtwork - True after ARTWORK line of BOARD section was read
+            self.shapeName, self.mountType, self.holesCoords - name, mount type and pins of the current shape
+            self.componentName, self.componentData, self.readParameters - current component, its parameters and number of parameters read so far
+            self.netName - name of the current signal
         '''
-        self.sections = {'BOARD':[],
-                         'PADS':[],
-                         'PADSTACKS':[],
-                         'SHAPES':[],
-                         'COMPONENTS':[],
-                         'SIGNALS':[],
-                         'MECH':[],
-                         'TESTPINS':[]}
-        self.schematic = []
+        self.sectionHandlers = {'BOARD': self._parseBoardLine,
+                                'SHAPES': self._parseShapesLine,
+                                'COMPONENTS': self._parseComponentsLine,
+                                'SIGNALS': self._parseSignalsLine,
+                                'MECH': self._parseMechLine}
         self.components ={}
         self.holes ={}
         self.nets = {}
         self.boardOutlines = {'AREA':[], 'LINES':[], 'ARCS':[]}
         self.shapes = {}
-
-    def loadSchematic(self, name, path='Schematic'):
+        self.shapeHoles = {}
+        self.componentsData = []
+        self.mechHoles = []
+
+        self.boardArea = [float('Inf'), float('-Inf'), float('Inf'), float('-Inf')]
+        self.isArtwork = False
+        self.shapeName = None
+        self.mountType = None
+        self.holesCoords = []
+        self.componentName = None
+        self.componentData = None
+        self.readParameters = len(GenCADLoader.COMPONENT_PARAMETERS)
+        self.netName = None
+
+    def loadSchematic(self, name, path='Schematic', progressCallback=None):
         '''
         Opens a .gcd file and returns dict of components, dict of nets, dict of holes and list of board vertexes. For manual processig of file use
         (openFile, getShapes, getComponents, getHoles, getBoardOutlines methods)
+            progressCallback - function called before each section is processed with arguments (sectionName, stepNumber, stepsCount)
         '''
-        self.openFile(name, path)
+        self.openFile(name, path, progressCallback)
 
         nets = self.getNets()
         shapes = self.getShapes()
@@ -49,180 +70,195 @@ class GenCADLoader():
         return components, nets, holes, boardOutlines, None, None
 
 
-    def openFile(self, name, path='Schematic'):
+    def openFile(self, name, path='Schematic', progressCallback=None):
         '''
-        Opens a .gcd file and creates a dict of sections (sectionName:[sectionStart, sectionEnd], where sectionStart, sectionEnd are line's numbers)
+        Opens a .gcd file and parses it in one pass. Every line is passed to the handler of its section (see self.sectionHandlers) as soon as it is read.
+        Lines are not stored - only parsed data is kept. If a section appears more than once, only its first occurrence is parsed.
+            progressCallback - function called at the beginning of each section with arguments (sectionName, stepNumber, stepsCount)
         '''
+        progress = progressCallback or (lambda sectionName, stepNumber, stepsCount: None)
         filePath = os.path.join(os.getcwd(), path, name)
 
+        parsedSections = []
+        handler = None
         with open(filePath, 'r') as file:
-            for i, line in enumerate(file):
+            for line in file:
                 line = line.replace('\n', '').replace('  ',' ')
-                if line[1:] in self.sections or line[4:] in self.sections:
-                    key = line[1:].replace('END', '')
-                    self.sections[key].append(i)
-                self.schematic.append(line)
+                if line[1:] in GenCADLoader.SECTIONS:
+                    sectionName = line[1:]
+                    if sectionName not in parsedSections:
+                        progress(sectionName, len(parsedSections), len(GenCADLoader.SECTIONS))
+                        parsedSections.append(sectionName)
+                        handler = self.sectionHandlers.get(sectionName)
+                    continue
+                elif line[4:] in GenCADLoader.SECTIONS:
+                    handler = None
+                    continue
+
+                if handler:
+                    handler(line)
+
+    def _parseBoardLine(self, line):
+        '''
+        Parses line of BOARD section into self.boardOutlines. Lines after ARTWORK line are skipped
+        '''
+        if self.isArtwork:
+            return
+
+        line = line.split(' ')
+        shape = line[0]
+        if shape == 'LINE':
+            point1 = float(line[1]), float(line[2])
+            point2 = float(line[3]), float(line[4])
+            self.boardOutlines['LINES'].append([point1, point2])
+
+            minX, maxX, minY, maxY = self.boardArea
+            self.boardArea = [min([minX, point1[0], point2[0]]), max([maxX, point1[0], point2[0]]),
+                              min([minY, point1[1], point2[1]]), max([maxY, point1[1], point2[1]])]
+
+        elif shape == 'ARC':
+            point1 = float(line[1]), float(line[2])
+            point2 = float(line[3]), float(line[4])
+            point3 = float(line[5]), float(line[6])
+            self.boardOutlines['ARCS'].append([point1, point2, point3])
+
+        if shape == 'ARTWORK': # artwork -> data about printed lines on pcb, not needed for this project
+            self.isArtwork = True
 
     def getBoardOutlines(self):
         '''
-        Gets components from self.schematic. Iterates over BOARDOUTLINE Section.
+        Returns board outlines read from BOARD section.
         Returns dict {'AREA':[(x1, y1), (x2, y2)], 'LINES':[[(x11, y11), (x12, y12)], [(x21, y21), (x22, y22)], ...], 'ARCS':[[(x11, y11), (x12, y12), (x13, y13)], ...]}
         '''
         ## closest and furthest point from 0,0
-        maxX, minX = float('-Inf'), float('Inf')
-        maxY, minY = float('-Inf'), float('Inf')
-
-        for i in self._getRange('BOARD'):
-            line = self.schematic[i].split(' ')
-            shape = line[0]
-            if shape == 'LINE':
-                point1 = float(line[1]), float(line[2])
-                point2 = float(line[3]), float(line[4])
-                self.boardOutlines['LINES'].append([point1, point2])
-
-                minX = min([minX, point1[0], point2[0]])
-                maxX = max([maxX, point1[0], point2[0]])
-                minY = min([minY, point1[1], point2[1]])
-                maxY = max([maxY, point1[1], point2[1]])
-
-            elif shape == 'ARC':
-                point1 = float(line[1]), float(line[2])
-                point2 = float(line[3]), float(line[4])
-                point3 = float(line[5]), float(line[6])
-                self.boardOutlines['ARCS'].append([point1, point2, point3])
-            
-            if shape == 'ARTWORK': # artwork -> data about printed lines on pcb, not needed for this project
-                break
-
+        minX, maxX, minY, maxY = self.boardArea
         self.boardOutlines['AREA'] = [(minX, minY), (maxX, maxY)]
         return self.boardOutlines
 
-    def getShapes(self):
+    def _parseShapesLine(self, line):
         '''
-        Gets shapes from self.schematic. Iterates over SHAPES section and returns dict {shapeName, shapeType, shapeCoords1, shapeCoords2}.
-        Shape coords are assigned as a class constants and not read from file. BY default all shapes are classified as RECT. Testpoints are then changed to CIRCLE
+        Parses line of SHAPES section. Shape coords are assigned as a class constants and not read from file. BY default all shapes are classified as RECT.
+        Pins of the shape are stored in self.shapeHoles when the next shape begins if there is INSERT thmt line
         '''
-        i = self.sections['SHAPES'][0] + 1
-        iEnd = self.sections['SHAPES'][1]
-
-        while i < iEnd:
-            while 'SHAPE' not in self.schematic[i]:
-                i += 1
-            line = self.schematic[i].split(' ')
+        buffer = line.split(' ')
+        if 'SHAPE' in line:
             try:
-                shapeName = line[1]
+                shapeName = buffer[1]
                 shapeType = 'RECT'
                 shapeCoords = GenCADLoader.RECTANGLE_DIMENSIONS
-                self.shapes[shapeName] = [shapeName, shapeType] + shapeCoords        
+                self.shapes[shapeName] = [shapeName, shapeType] + shapeCoords
             except IndexError:
                 pass
-            i += 1
-        
+
+        ## get every pin of shape if in shape there is INSERT thmt line
+        if buffer[0] == 'SHAPE':
+            if self.mountType in GenCADLoader.THT_MARKING:
+                self.shapeHoles[self.shapeName] = self.holesCoords
+
+            self.holesCoords = []
+            self.shapeName = buffer[1]
+        elif buffer[0] == 'INSERT':
+            self.mountType = buffer[1]
+        elif buffer[0] == 'PIN':
+            self.holesCoords.append(tuple([float(buffer[-5]), float(buffer[-4])]))
+
+    def getShapes(self):
+        '''
+        Returns dict of shapes read from SHAPES section {shapeName: [shapeName, shapeType, shapeCoords1, shapeCoords2]}. Testpoints are changed to CIRCLE by getComponents
+        '''
         return self.shapes
 
+    def _parseComponentsLine(self, line):
+        '''
+        Parses line of COMPONENTS section. 4 parameters must be read after COMPONENT line. Order can be random, so they are stored in dict
+        and component is added to self.componentsData when all of them are read
+        '''
+        buffer = line.split(' ')
+        if self.readParameters == len(GenCADLoader.COMPONENT_PARAMETERS):
+            if 'COMPONENT' == buffer[0]:
+                self.componentName = buffer[1]
+                self.componentData = dict.fromkeys(GenCADLoader.COMPONENT_PARAMETERS)
+                self.readParameters = 0
+            return
+
+        if buffer[0] in self.componentData:
+            self.componentData[buffer[0]] = buffer[1:]
+            self.readParameters += 1
+
+        if self.readParameters == len(GenCADLoader.COMPONENT_PARAMETERS):
+            componentCoords = tuple([float(coord) for coord in self.componentData['PLACE']])
+            componentSide = self.componentData['LAYER'][0][0] # first letter
+            componentAngle = self.componentData['ROTATION'][0]
+            componentCase = self.componentData['SHAPE'][0]
+            self.componentsData.append([self.componentName, componentCoords, componentSide, componentAngle, componentCase])
+
     def getComponents(self, testPointChars='TP'):
         '''
-        Gets components from self.schematic. Iterates over Components Section and adds matching componentCase
+        Matches components read from COMPONENTS section with their shapes.
         Returns dict of components (componentName: [(x, y), side, case]). Arguments:
             testPointChars - string based on which testpoints are recognized
         '''
-        i = self.sections['COMPONENTS'][0] + 1
-        iEnd = self.sections['COMPONENTS'][1]
-
-        while i < iEnd:
-            firstWord = self.schematic[i].split(' ')[0]
-            if 'COMPONENT' == firstWord:
-                componentName = self.schematic[i].split(' ')[1]
-                i += 1
-                ## 4 parameters must be read. Order can be random. This solution stores them in dict and gets data from it later
-                readParameters = 0
-                componentData = {'PLACE':None, 'LAYER':None, 'ROTATION':None, 'SHAPE':None}
-                while readParameters != 4:
-                    buffer = self.schematic[i].split(' ')
-                    if buffer[0] in componentData:
-                        componentData[buffer[0]] = buffer[1:]
-                        readParameters += 1
-                    i += 1
-                componentCoords = componentData['PLACE']
-                componentCoords = tuple([float(coord) for coord in componentCoords])
-                componentSide = componentData['LAYER'][0][0] # first letter
-                componentAngle = componentData['ROTATION'][0]
-                componentCase = componentData['SHAPE'][0]
-
-                ## replace testpoints with circles
-                self.components[componentName] = [componentCoords, componentSide, componentAngle, self.shapes[componentCase]]
-                if testPointChars in componentName:
-                    self.components[componentName][3][1] = 'CIRCLE'
-                    self.components[componentName][3][2], self.components[componentName][3][3] = GenCADLoader.CIRCLE_DIMENSIONS
-            else:
-                i += 1
+        for componentName, componentCoords, componentSide, componentAngle, componentCase in self.componentsData:
+            ## replace testpoints with circles
+            self.components[componentName] = [componentCoords, componentSide, componentAngle, self.shapes[componentCase]]
+            if testPointChars in componentName:
+                self.components[componentName][3][1] = 'CIRCLE'
+                self.components[componentName][3][2], self.components[componentName][3][3] = GenCADLoader.CIRCLE_DIMENSIONS
 
         return self.components
 
-    def getNets(self):
+    def _parseSignalsLine(self, line):
         '''
-        Gets components from self.schematic. Iterates over SIGNAL Section.
-        Returns dict of nets (netName:{component:[pins]})
+        Parses line of SIGNALS section into self.nets
         '''
-        i = self.sections['SIGNALS'][0] + 1
-        iEnd = self.sections['SIGNALS'][1]
-
-        while i < iEnd:
-            line = self.schematic[i].split(' ')
-            if 'SIGNAL' in line:
-                netName = line[1]
-                self.nets[netName] = {}
-            elif 'NODE' in line:
-                componentName = line[1]
-                componentPin = line[2]
-                if not componentName in self.nets[netName]:
-                    self.nets[netName][componentName] = [componentPin]
-                else:
-                    self.nets[netName][componentName].append(componentPin)
-
-            i += 1
+        line = line.split(' ')
+        if 'SIGNAL' in line:
+            self.netName = line[1]
+            self.nets[self.netName] = {}
+        elif 'NODE' in line:
+            componentName = line[1]
+            componentPin = line[2]
+            if not componentName in self.nets[self.netName]:
+                self.nets[self.netName][componentName] = [componentPin]
+            else:
+                self.nets[self.netName][componentName].append(componentPin)
 
+    def getNets(self):
+        '''
+        Returns dict of nets read from SIGNALS section (netName:{component:[pins]})
+        '''
         return self.nets
 
+    def _parseMechLine(self, line):
+        '''
+        Parses line of MECH section into self.mechHoles
+        '''
+        line = line.split(' ')
+        if 'HOLE' in line[0]:
+            holeName = line[0]
+            holeCoords = float(line[1]), float(line[2])
+        else:
+            holeName = line[1]
+            try:
+                holeCoords = float(line[-6]), float(line[-5])
+            except IndexError:
+                return
+        self.mechHoles.append((holeName, holeCoords))
+
     def getHoles(self):
         '''
-        Gets holes from self.schematic. Iterates over SHAPES (pin -> component) and MECH Section.
+        Gets holes from TH pins of shapes (pin -> component) and MECH section. Use after getComponents
         Returns dict of holes (holeName: [(x1, y1), (x2, y2)...])
         '''
-        ## get every pin of shape if in shape there is INSERT thmt line
-        i = self.sections['SHAPES'][0] + 1
-        iEnd = self.sections['SHAPES'][1]
-
-        shapeHoles = {}
-        mountType = None
-        holesCoords = []
-        THTMarking = ['thmt']
-        while i < iEnd:
-            buffer = self.schematic[i].split(' ')           
-            if buffer[0] == 'SHAPE':
-                if mountType in THTMarking:
-                    shapeHoles[shapeName] = holesCoords
-                
-                holesCoords = []
-                shapeName = buffer[1]
-            elif buffer[0] == 'INSERT':
-                mountType = buffer[1]
-            elif buffer[0] == 'PIN':
-                holesCoords.append(tuple([float(buffer[-5]), float(buffer[-4])]))
-            
-            i += 1
-
         ## match shape with component names
-        i = self.sections['COMPONENTS'][0] + 1
-        iEnd = self.sections['COMPONENTS'][1]
         for component in self.components:
             componentCase = self.components[component][3][0]
-            if componentCase in shapeHoles:
+            if componentCase in self.shapeHoles:
                 componentCoords = self.components[component][0]
                 xComponent, yComponent = [float(coord) for coord in componentCoords]
                 componentAngle = float(self.components[component][2])
-                
-                for hole in shapeHoles[componentCase]:
+
+                for hole in self.shapeHoles[componentCase]:
                     ## rotate point by given angle
                     xHole, yHole = hole
                     xRotated, yRotated = mathFunctions.rotatePoint((xHole, yHole), componentAngle)
@@ -232,56 +268,13 @@ class GenCADLoader():
                     if component not in self.holes:
                         self.holes[component] = []
                     self.holes[component].append(resultCoords)
-        '''
-        while i < iEnd:
-            componentName = self.schematic[i].split(' ')[1]
-            componentCoords = self.schematic[i + 2].split(' ')[1:]
-            xComponent, yComponent = [float(coord) for coord in componentCoords]
-            componentAngle = float(self.schematic[i + 4].split(' ')[1])
-            componentCase = self.schematic[i + 5].split(' ')[1]
-
-            if componentCase in shapeHoles:
-                self.holes[componentName] = []
-                for hole in shapeHoles[componentCase]:
-                    ## rotate point by given angle
-                    xHole, yHole = hole
-                    xRotated, yRotated = mathFunctions.rotatePoint((xHole, yHole), componentAngle)
-
-                    resultCoords = xComponent + xRotated, yComponent + yRotated
-                    self.holes[componentName].append(resultCoords)
-            i += 6
-        '''
 
         ## add mechanical holes
-        i = self.sections['MECH'][0] + 1
-        iEnd = self.sections['MECH'][1]
-
-        while i < iEnd:
-            line = self.schematic[i].split(' ')
-            if 'HOLE' in line[0]:
-                holeName = line[0]
-                holeCoords = float(line[1]), float(line[2])
-            else:
-                holeName = line[1]
-                try:
-                    holeCoords = float(line[-6]), float(line[-5])
-                except IndexError:
-                    i += 1
-                    continue
+        for holeName, holeCoords in self.mechHoles:
             self.holes[holeName] = [holeCoords]
-            i += 1
 
         return self.holes
 
-    def _getRange(self, sectionName):
-        '''
-        Helper method for getting range of a section. Returns range
-        '''
-        rangeStart = self.sections[sectionName][0]
-        rangeEnd = self.sections[sectionName][1]
-
-        return range(rangeStart, rangeEnd)
-
 if __name__ == '__main__':
     a = GenCADLoader()
     #a.openFile('nexyM.gcd')
@@ -292,7 +285,7 @@ if __name__ == '__main__':
     a.getComponents()
     a.getNets()
     a.getHoles()
-    
+
 
     ## get data with interface
     #b = GenCADLoader()
@@ -87,6 +87,31 @@ def translate2D(point, vector):
     u, v = vector
     return x + u, y + v
 
+def invertAffineMatrix(matrix):
+    '''
+    Returns inverse of 2D affine matrix. Matrix is given as a tuple (a, b, c, d, e, f) that maps point (x, y) to (a*x + c*y + e, b*x + d*y + f)
+        matrix - (a, b, c, d, e, f) tuple
+    '''
+    a, b, c, d, e, f = matrix
+    determinant = a * d - b * c
+    aInv = d / determinant
+    bInv = -b / determinant
+    cInv = -c / determinant
+    dInv = a / determinant
+    eInv = -(aInv * e + cInv * f)
+    fInv = -(bInv * e + dInv * f)
+    return aInv, bInv, cInv, dInv, eInv, fInv
+
+def applyAffineMatrix(matrix, point):
+    '''
+    Transforms point by 2D affine matrix. Returns (xTransformed, yTransformed)
+        matrix - (a, b, c, d, e, f) tuple (see invertAffineMatrix)
+        point - (x, y) tuple
+    '''
+    a, b, c, d, e, f = matrix
+    x, y = point
+    return a * x + c * y + e, b * x + d * y + f
+
 if __name__ == '__main__':
     print(getQuadrant(1, 1))
     print(quadrantAngle(1, -1) * 180/math.pi)
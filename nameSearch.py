@@ -0,0 +1,163 @@
+import array
+import bisect
+import collections
+import heapq
+import math
+
+class NameSearchIndex():
+    '''
+    Search index of names (components, test points, holes, nets). Names are searched case-insensitively in sorted arrays of keys of each length
+    (prefix matches) and in trigram index (fuzzy matches for typos and substrings). Results are ranked: exact match -> prefix matches (shorter names first)
+    -> fuzzy matches. Fuzzy matches are searched only if no name begins with the query, so looking up a designator does not scan trigram postings.
+    Ranges of prefix matches of the previous query are remembered, so every next typed letter narrows the ranges instead of searching all keys.
+    '''
+    FUZZY_THRESHOLD = 0.3 # min similarity (common trigrams / all trigrams) of fuzzy match
+    FREQUENT_TRIGRAM_RATIO = 0.02 # trigrams found in more than this part of names are not counted by fuzzy search
+
+    def __init__(self, names):
+        '''
+        Creates NameSearchIndex instance. Arguments:
+            names - iterable of (name, kind) where kind describes the name (e.g. 'COMPONENT', 'HOLE', 'NET')
+        Attributes:
+            self.names, self.kinds - lists of indexed names and their kinds. Position in the list is id of the name
+            self.keyLengths - sorted list of lengths of lowercase names
+            self.keys - dict (length: sorted list of lowercase names of the length)
+            self.keyIds - dict (length: array of ids of self.keys[length])
+            self.trigrams - dict (trigram: array of ids of names that contain the trigram)
+            self.lastQuery, self.lastRanges - previous query and dict (length: range of self.keys[length] that begin with it) of not empty ranges
+            self.minNameLength - length of the shortest name (used for rejecting fuzzy candidates before checking them)
+        '''
+        self.names = []
+        self.kinds = []
+        for name, kind in names:
+            self.names.append(name)
+            self.kinds.append(kind)
+
+        ## keys sorted by length and alphabetically, split into lists of the same length
+        keys = [name.lower() for name in self.names]
+        order = sorted(range(len(keys)), key=lambda i: (len(keys[i]), keys[i]))
+        self.keys = {}
+        self.keyIds = {}
+        for i in order:
+            length = len(keys[i])
+            if length not in self.keys:
+                self.keys[length] = []
+                self.keyIds[length] = array.array('I')
+            self.keys[length].append(keys[i])
+            self.keyIds[length].append(i)
+        self.keyLengths = sorted(self.keys)
+
+        self.trigrams = {}
+        for i, key in enumerate(keys):
+            for trigram in self._getTrigrams(key):
+                if trigram not in self.trigrams:
+                    self.trigrams[trigram] = array.array('I')
+                self.trigrams[trigram].append(i)
+
+        self.lastQuery = ''
+        self.lastRanges = {length: (0, len(self.keys[length])) for length in self.keyLengths}
+        self.minNameLength = min([len(name) for name in self.names], default=0)
+
+    def __len__(self):
+        return len(self.names)
+
+    @staticmethod
+    def _getTrigrams(key):
+        '''
+        Returns set of trigrams of the key. Key is padded, so beginning of the name has more weight
+        '''
+        paddedKey = f'  {key} '
+        return {paddedKey[i:i + 3] for i in range(len(paddedKey) - 2)}
+
+    def _getPrefixRanges(self, key):
+        '''
+        Returns list of (length, start, end) - not empty ranges of self.keys[length] that begin with the key, ordered by length. Search is limited
+        to ranges of the previous query if the key extends it
+        '''
+        if key.startswith(self.lastQuery):
+            previousRanges = self.lastRanges
+        else:
+            previousRanges = {length: (0, len(self.keys[length])) for length in self.keyLengths}
+
+        ranges = {}
+        for length, (start, end) in previousRanges.items():
+            if length < len(key):
+                continue
+            keys = self.keys[length]
+            start = bisect.bisect_left(keys, key, start, end)
+            end = bisect.bisect_left(keys, key + '\U0010FFFF', start, end)
+            if start < end:
+                ranges[length] = start, end
+
+        self.lastQuery, self.lastRanges = key, ranges
+        return [(length, start, end) for length, (start, end) in sorted(ranges.items())]
+
+    def _getFuzzyIds(self, key, limit):
+        '''
+        Returns ids of up to limit names similar to the key (similarity = common trigrams / all trigrams of both texts) ordered from the most similar.
+        Similar name must have at least minCommon trigrams of the key. Postings of the most frequent trigrams of the key (up to keyTrigrams - minCommon)
+        are not counted - names found by the other trigrams are checked for them directly, so short queries do not count most of the names
+        '''
+        keyTrigrams = sorted(self._getTrigrams(key), key=lambda trigram: len(self.trigrams.get(trigram, ())))
+        minCommon = max(1, math.ceil(NameSearchIndex.FUZZY_THRESHOLD * len(keyTrigrams)))
+        frequentCount = len([trigram for trigram in keyTrigrams if len(self.trigrams.get(trigram, ())) > len(self.names) * NameSearchIndex.FREQUENT_TRIGRAM_RATIO])
+        frequentCount = min(frequentCount, len(keyTrigrams) - minCommon)
+        rareTrigrams = keyTrigrams[:len(keyTrigrams) - frequentCount]
+        frequentTrigrams = keyTrigrams[len(rareTrigrams):]
+
+        counter = collections.Counter()
+        for trigram in rareTrigrams:
+            counter.update(self.trigrams.get(trigram, ()))
+
+        ## similarity of the shortest name with all trigrams found gives min number of trigrams that must be found in postings
+        threshold = NameSearchIndex.FUZZY_THRESHOLD
+        minFoundCommon = max(minCommon, math.ceil(threshold * (len(keyTrigrams) + self.minNameLength + 1) / (1 + threshold)))
+        minRareCount = minFoundCommon - len(frequentTrigrams)
+        candidates = []
+        for nameId, commonCount in [item for item in counter.items() if item[1] >= minRareCount]:
+            name = self.names[nameId]
+            maxCommonCount = commonCount + len(frequentTrigrams)
+            if maxCommonCount < NameSearchIndex.FUZZY_THRESHOLD * (len(keyTrigrams) + len(name) + 1 - maxCommonCount):
+                continue
+            if frequentTrigrams:
+                paddedName = f'  {name.lower()} '
+                commonCount += sum([trigram in paddedName for trigram in frequentTrigrams])
+            similarity = commonCount / (len(keyTrigrams) + len(name) + 1 - commonCount)
+            if similarity >= NameSearchIndex.FUZZY_THRESHOLD:
+                candidates.append((-similarity, len(name), nameId))
+
+        return [nameId for _, _, nameId in heapq.nsmallest(limit, candidates)]
+
+    def search(self, query, limit=20):
+        '''
+        Returns list of up to limit (name, kind) tuples that match the query ordered from the best match
+            query - searched text (letter case is ignored)
+            limit - max number of results
+        '''
+        key = query.lower()
+        if not key:
+            return []
+
+        ## exact and prefix matches - shorter names first, then alphabetically (ranges are ordered by length and keys of each length are sorted)
+        resultIds = []
+        for length, start, end in self._getPrefixRanges(key):
+            resultIds += self.keyIds[length][start:min(end, start + limit - len(resultIds))]
+            if len(resultIds) >= limit:
+                break
+
+        ## fuzzy matches - names that have most of the trigrams of the query (only if no name begins with the query)
+        if not resultIds:
+            resultIds = self._getFuzzyIds(key, limit)
+
+        return [(self.names[nameId], self.kinds[nameId]) for nameId in resultIds]
+
+if __name__ == '__main__':
+    import random
+    import time
+
+    names = [(f'{random.choice("CRLUQD")}{i}', 'COMPONENT') for i in range(100000)] + [(f'TP{i}', 'TESTPOINT') for i in range(5000)]
+    index = NameSearchIndex(names)
+    for query in ('C', 'C1', 'C12', 'C123', 'C1234', 'TP12', 'c1234x', '1234'):
+        start = time.perf_counter()
+        results = index.search(query, limit=50)
+        print(query, f'{(time.perf_counter() - start) * 1000:.3f} ms', results[:5])
@@ -1,32 +1,60 @@
 import os
+import io
 import tarfile
+import concurrent.futures
 
 class OdbPlusPlusv7FileLoader():
     CIRCLE_DIMENSIONS = [(0.050, 0.050), (0.025, 0.025)]
     RECTANGLE_DIMENSIONS = [(-0.020, -0.016), (0.020, 0.016)] #[(0.039, 0.039), (0.013, 0.013)]
 
+    ## partial paths of needed tar members and their types. If more members match the same partial path, the first one in the archive is used
+    MEMBER_TYPES = {'netlists/cadnet/netlist': 'NETLIST',           # netlist file
+                    'layers/comp_+_bot/components': 'COMPONENTS_B',  # components files
+                    'layers/comp_+_top/components': 'COMPONENTS_T',
+                    'layers/drill/features': 'DRILL',                # holes file
+                    'layers/outline/features': 'OUTLINE',            # board dimension file
+                    '/profile': 'PROFILE'
+                    }
+    MAX_WORKERS = None # number of processes used by parallel mode (None - number of processors)
+
     def __init__(self, testPointPrefix='TP'):
         '''
-        Creates OdbPlusPlusv7FileLoader instance. 
+        Creates OdbPlusPlusv7FileLoader instance.
             testPointPrefix -> unique string common for all testpoints
         Attributes:
             self.components - dict of components (componentName: [(x, y), side, case])
             self.holes - dict of TH holes (componentName: [(x, y), ...])
             self.nets - dict of nets (netName:{component:[pins]})
             self.boardOutlines -  dict {'AREA':[(x1, y1), (x2, y2)], 'LINES':[[(x11, y11), (x12, y12)], [(x21, y21), (x22, y22)], ...], 'ARCS':[[(x11, y11), (x12, y12), (x13, y13)], ...]}
+            self.memberNames - dict of used tar members (memberType: memberName)
+            self.sideComponents - dict of not scaled components read from components files ('B' or 'T': {componentName: [(x, y), side, angle, case]})
+            self.sidePins - dict of component pins read from components files ('B' or 'T': {'{pinX} {pinY}': [componentName, pinNumber]})
+            self.netPins - list of (netName, '{pinX} {pinY}') read from netlist file
+            self.outlines - dict of board outlines read from outline and profile files ('OUTLINE' or 'PROFILE': boardOutlines)
+            self.componentsMinX, self.componentsMaxX - min and max not scaled X coordinate of components (see findComponentLayerScale)
         '''
         self.components ={}
         self.holes ={}
         self.nets = {}
         self.boardOutlines = {'AREA':[], 'LINES':[], 'ARCS':[]}
         self.testpointPrefix = testPointPrefix
+        self.memberNames = {}
+        self.sideComponents = {'B': {}, 'T': {}}
+        self.sidePins = {'B': {}, 'T': {}}
+        self.netPins = []
+        self.outlines = {}
+        self.componentsMinX, self.componentsMaxX = float('Inf'), float('-Inf')
 
-    def loadSchematic(self, name, path='Schematic'):
+    def loadSchematic(self, name, path='Schematic', progressCallback=None, parallel=False):
         '''
         Opens a .tgz file and returns dict of components, dict of nets, dict of holes and list of board vertexes. For manual processig of file use
-        (openFile, getComponents, getNets, getHoles, getBoardOutlines methods)
+        (getFile, readFile, getBoardOutlines, findComponentLayerScale, getComponents, getNets, getHoles methods)
+            progressCallback - function called before each tar member is processed with arguments (memberName, stepNumber, stepsCount)
+            parallel = True/False - if True tar members are parsed concurrently in a process pool (see readFile)
         '''
-        self.getFile(name, path)        
+        self.getFile(name, path)
+        self.readFile(progressCallback, parallel)
+
         boardOutlines = self.getBoardOutlines()
         maxX = self.findComponentLayerScale()
         scalingFactor = boardOutlines['AREA'][1][0] / maxX if 'profile' not in self.dimensionFile else 1
@@ -38,256 +66,351 @@ class OdbPlusPlusv7FileLoader():
 
     def getFile(self, name, path='Schematic'):
         '''
-        Sets self.filePath to chosen file and sets location of files with net list, components, holes and dimensions
+        Sets self.filePath to chosen file
         '''
         self.filePath = os.path.join(os.getcwd(), path, name)
-        with tarfile.open(self.filePath, 'r') as file:
-            self.tarNames = file.getnames()
-
-        ## dict with partial path to needed files
-        filesDict = {'netlists/cadnet/netlist':None,        # netlist file
-                     'layers/comp_+_bot/components':None,   # components files
-                     'layers/comp_+_top/components':None,
-                     'layers/drill/features':None,          # holes file
-                     'layers/outline/features':None,        # board dimension file
-                     '/profile':None
-                     }
-        
-        ## get path by matching partial path
-        for fileSubstring in filesDict:
-            for tarName in self.tarNames:
-                if fileSubstring in tarName:
-                    filesDict[fileSubstring] = tarName
-                    break
+
+    def readFile(self, progressCallback=None, parallel=False):
+        '''
+        Reads the .tgz file in one sequential pass (archive is decompressed only once). Every needed member (see MEMBER_TYPES) is passed to its parser as soon
+        as it is found. Parsers do not depend on each other, so order of members in the archive does not matter - data that depends on other members
+        (scaling of components, pins of nets) is calculated after the pass. Sets location of files with net list, components, holes and dimensions
+            progressCallback - function called before each member is parsed with arguments (memberName, stepNumber, stepsCount)
+            parallel = True/False - if True content of every member is sent to the process pool and parsed there while the archive is still being read.
+                                    Parsed data is joined (_mergeParsedData) when all members are parsed
+        '''
+        progress = progressCallback or (lambda memberName, stepNumber, stepsCount: None)
+        executor = concurrent.futures.ProcessPoolExecutor(OdbPlusPlusv7FileLoader.MAX_WORKERS) if parallel else None
+        futures = {}
+        try:
+            with tarfile.open(self.filePath, 'r|*') as file:
+                for member in file:
+                    memberType = self._getMemberType(member.name)
+                    if not memberType or not member.isfile():
+                        continue
+
+                    progress(member.name, len(self.memberNames), len(OdbPlusPlusv7FileLoader.MEMBER_TYPES))
+                    self.memberNames[memberType] = member.name
+                    with file.extractfile(member) as extractedFile:
+                        if executor:
+                            future = executor.submit(parseMember, self.testpointPrefix, memberType, extractedFile.read())
+                            futures[future] = memberType
+                        else:
+                            self._parseMember(memberType, extractedFile)
+
+            ## join data parsed by the process pool
+            for i, future in enumerate(concurrent.futures.as_completed(futures)):
+                memberType = futures[future]
+                progress(f'{self.memberNames[memberType]} (parsed)', i, len(futures))
+                self._mergeParsedData(memberType, future.result())
+        finally:
+            if executor:
+                executor.shutdown(cancel_futures=True)
 
         ## save needed paths to variables
-        self.netListFile = filesDict['netlists/cadnet/netlist']
-        self.componentsFilesList = [filesDict['layers/comp_+_bot/components'], filesDict['layers/comp_+_top/components']]
-        self.holesFile = filesDict['layers/drill/features']
-        self.dimensionFile = filesDict['layers/outline/features'] or filesDict['/profile']
+        self.netListFile = self.memberNames.get('NETLIST')
+        self.componentsFilesList = [self.memberNames.get('COMPONENTS_B'), self.memberNames.get('COMPONENTS_T')]
+        self.holesFile = self.memberNames.get('DRILL')
+        self.dimensionFile = self.memberNames.get('OUTLINE') or self.memberNames.get('PROFILE')
+
+    @staticmethod
+    def _iterLines(extractedFile):
+        '''
+        Generator of lines of the extracted tar member. File is read and decoded line by line, so the whole member is never kept in memory
+        '''
+        for line in extractedFile:
+            yield line.decode('utf-8').replace('\n', '')
+
+    def _parseMember(self, memberType, extractedFile):
+        '''
+        Passes extracted member to the parser of its type
+        '''
+        if memberType == 'NETLIST':
+            self._parseNetListFile(extractedFile)
+        elif memberType in ('COMPONENTS_B', 'COMPONENTS_T'):
+            self._parseComponentsFile(extractedFile, memberType[-1])
+        elif memberType == 'DRILL':
+            self._parseHolesFile(extractedFile)
+        elif memberType == 'OUTLINE':
+            self._parseOutlineFile(extractedFile)
+        elif memberType == 'PROFILE':
+            self._parseProfileFile(extractedFile)
+
+    def _getParsedData(self, memberType):
+        '''
+        Returns data parsed from member of given type (sent from the process pool to _mergeParsedData)
+        '''
+        if memberType == 'NETLIST':
+            return self.netPins
+        elif memberType in ('COMPONENTS_B', 'COMPONENTS_T'):
+            side = memberType[-1]
+            return self.sideComponents[side], self.sidePins[side], self.componentsMinX, self.componentsMaxX
+        elif memberType == 'DRILL':
+            return self.holes
+        return self.outlines[memberType]
+
+    def _mergeParsedData(self, memberType, parsedData):
+        '''
+        Joins data returned by _getParsedData of other instance
+        '''
+        if memberType == 'NETLIST':
+            self.netPins = parsedData
+        elif memberType in ('COMPONENTS_B', 'COMPONENTS_T'):
+            side = memberType[-1]
+            self.sideComponents[side], self.sidePins[side], componentsMinX, componentsMaxX = parsedData
+            self.componentsMinX = min(self.componentsMinX, componentsMinX)
+            self.componentsMaxX = max(self.componentsMaxX, componentsMaxX)
+        elif memberType == 'DRILL':
+            self.holes = parsedData
+        else:
+            self.outlines[memberType] = parsedData
+
+    def _getMemberType(self, memberName):
+        '''
+        Helper method that returns type of the tar member (see MEMBER_TYPES) or None if the member is not needed or member of this type was already found
+        '''
+        for fileSubstring, memberType in OdbPlusPlusv7FileLoader.MEMBER_TYPES.items():
+            if fileSubstring in memberName and memberType not in self.memberNames:
+                return memberType
+        return None
+
+    def _parseComponentsFile(self, extractedFile, componentSide):
+        '''
+        Parses components file of the side into self.sideComponents (coords are not scaled) and self.sidePins in one forward pass. Range of X coords
+        used by findComponentLayerScale is updated in the same pass
+            extractedFile - file object of '.../layers/comp_+_bot/components' or '.../layers/comp_+_top/components'
+            componentSide - 'B' or 'T'
+        '''
+        components = self.sideComponents[componentSide]
+        componentPinsDict = self.sidePins[componentSide]
+        fileLines = self._iterLines(extractedFile)
+        for line in fileLines:
+            if '# CMP ' in line:
+                buffer = next(fileLines).split(' ')
+                componentCoords = float(buffer[2]), float(buffer[3])
+                self.componentsMinX = min(self.componentsMinX, componentCoords[0])
+                self.componentsMaxX = max(self.componentsMaxX, componentCoords[0])
+                componentAngle = float(buffer[4])
+                componentName = buffer[6]
+                caseName = ''
+                if self.testpointPrefix in componentName:
+                    caseShape = 'CIRCLE'
+                    caseDimensions = OdbPlusPlusv7FileLoader.CIRCLE_DIMENSIONS
+                else:
+                    caseShape = 'RECT'
+                    caseDimensions = OdbPlusPlusv7FileLoader.RECTANGLE_DIMENSIONS
+                caseData = [caseName, caseShape] + caseDimensions
+                components[componentName] = [componentCoords, componentSide, componentAngle, caseData]
+            elif 'TOP' in line:
+                buffer = line.split(' ')
+                pinNumber = buffer[1]
+                try:
+                    pinCoordsKey = f'{buffer[2]} {buffer[3]}'
+                    componentPinsDict[pinCoordsKey] = [componentName, pinNumber]
+                except IndexError:
+                    pass
 
     def getComponents(self, scalingFactor=1):
         '''
-        Opens files inside .tgz file. Extracts data of components from '.../layers/comp_+_bot/components' and 'odbjob_v7/steps/stp/layers/comp_+_top/components'.
-            testPointChars - string that is common for all testpoints
+        Scales components read from '.../layers/comp_+_bot/components' and 'odbjob_v7/steps/stp/layers/comp_+_top/components' (use after readFile).
+            scalingFactor - factor by which coords of components are multiplied
 
-        Returns: 
+        Returns:
             self.components - dict of components (componentName: [(x, y), side, [caseName, caseShape, (caseX1, caseY1), (caseX2, caseY2)]])
-            componentPinsDict - dict '{pinX} {pinY}': [componentName, f'{pinNumber}'] 
-        '''
-        with tarfile.open(self.filePath, 'r') as file:
-            componentPinsDict = {}
-            for sideNumber, componentFile in enumerate(self.componentsFilesList):
-                componentSide = 'B' if sideNumber == 0 else 'T'                
-                ## file not present
-                if not componentFile:
-                    continue 
-                with file.extractfile(componentFile) as extractedFile:
-                    fileLines = (line.decode('utf-8').replace('\n', '') for line in extractedFile.readlines())
-                    for i, line in enumerate(fileLines):
-                        if '# CMP ' in line:
-                            buffer = next(fileLines).split(' ')
-                            componentCoords = float(buffer[2]) * scalingFactor, float(buffer[3]) * scalingFactor; 
-                            componentAngle = float(buffer[4])
-                            componentName = buffer[6]
-                            caseName = ''
-                            if self.testpointPrefix in componentName:
-                                caseShape = 'CIRCLE'
-                                caseDimensions = OdbPlusPlusv7FileLoader.CIRCLE_DIMENSIONS
-                            else:
-                                caseShape = 'RECT'
-                                caseDimensions = OdbPlusPlusv7FileLoader.RECTANGLE_DIMENSIONS
-                            caseData = [caseName, caseShape] + caseDimensions
-                            self.components[componentName] = [componentCoords, componentSide, componentAngle, caseData]
-                        elif 'TOP' in line:
-                            buffer = line.split(' ')
-                            pinNumber = buffer[1]
-                            try:
-                                pinCoordsKey = f'{buffer[2]} {buffer[3]}'
-                                componentPinsDict[pinCoordsKey] = [componentName, pinNumber]
-                            except IndexError:
-                                pass
+            componentPinsDict - dict '{pinX} {pinY}': [componentName, f'{pinNumber}']
+        '''
+        componentPinsDict = {}
+        for componentSide in ('B', 'T'):
+            for componentName, (componentCoords, _, componentAngle, caseData) in self.sideComponents[componentSide].items():
+                x, y = componentCoords
+                self.components[componentName] = [(x * scalingFactor, y * scalingFactor), componentSide, componentAngle, caseData]
+            componentPinsDict.update(self.sidePins[componentSide])
 
         return self.components, componentPinsDict
-    
+
     def findComponentLayerScale(self):
         '''
         Shity workaround about the fact that components are scaled down by some unkown factor (or rather I cant find the way to find it in better way).
-        It iterates over the components file and finds minimum and maximum value of X coordinate. It is used to caclulate scaling factor.
+        Minimum and maximum value of X coordinate are found while the components files are parsed. It is used to caclulate scaling factor.
         Returns abs(maxX - minX) - value close to the components layer width
         '''
-        with tarfile.open(self.filePath, 'r') as file:
-            maxX = float('-Inf')
-            minX = float('Inf')
-            for componentFile in self.componentsFilesList:
-                ## file not present
-                if not componentFile:
-                    continue 
-                with file.extractfile(componentFile) as extractedFile:
-                    fileLines = (line.decode('utf-8').replace('\n', '') for line in extractedFile.readlines())
-                    for i, line in enumerate(fileLines):
-                        if '# CMP ' in line:
-                            buffer = next(fileLines).split(' ')
-                            maxX = max(maxX, float(buffer[2]))
-                            minX = min(minX, float(buffer[2]))
-        return abs(maxX - minX)
-    
+        return abs(self.componentsMaxX - self.componentsMinX)
+
+    def _parseHolesFile(self, extractedFile):
+        '''
+        Parses '.../layers/drill/features' file into self.holes
+        '''
+        holeNamesDict = {}
+        fileLines = self._iterLines(extractedFile)
+        for line in fileLines:
+            if len(line) > 0:
+                if line[0] == '&':
+                    buffer = line.split(' ')
+                    key = buffer[0][1:]
+                    name = buffer[1]
+                    holeNamesDict[key] = name
+                elif line[0] == 'P':
+                    buffer = line.split(' ')
+                    holeCoords = float(buffer[1]), float(buffer[2])
+                    buffer = buffer[-1].split(';')[1]
+
+                    ## assumed that .drill is always "1"
+                    netType, drillType = buffer.split(',')[:2]
+                    nameID = netType.split('=')[1]
+                    netName = holeNamesDict[nameID]
+
+                    ## 1=2 -> .drill=via, 1=1 ->.drill=not plated
+                    if drillType in ('1=2','1=1') or 'VIA' in netName:
+                        continue
+
+                    if netName not in self.holes:
+                        self.holes[netName] = []
+                    self.holes[netName].append(holeCoords)
+
     def getHoles(self):
         '''
-        Gets holes from '.../layers/drill/features' file of .tgz.
-        Returns dict of holes (holeName: [(x1, y1), (x2, y2)...])
-        '''
-        with tarfile.open(self.filePath, 'r') as file:
-            with file.extractfile(self.holesFile) as holesFile:
-                holeNamesDict = {}
-                fileLines = (line.decode('utf-8').replace('\n', '') for line in holesFile.readlines())
-                for line in fileLines:
-                    if len(line) > 0:
-                        if line[0] == '&':
-                            buffer = line.split(' ')
-                            key = buffer[0][1:]
-                            name = buffer[1]
-                            holeNamesDict[key] = name
-                        elif line[0] == 'P':
-                            buffer = line.split(' ')
-                            holeCoords = float(buffer[1]), float(buffer[2])
-                            buffer = buffer[-1].split(';')[1]
-
-                            ## assumed that .drill is always "1"
-                            netType, drillType = buffer.split(',')[:2]
-                            nameID = netType.split('=')[1]
-                            netName = holeNamesDict[nameID]
-
-                            ## 1=2 -> .drill=via, 1=1 ->.drill=not plated
-                            if drillType in ('1=2','1=1') or 'VIA' in netName:
-                                continue
-
-                            if netName not in self.holes:                                
-                                self.holes[netName] = []
-                            self.holes[netName].append(holeCoords)
+        Returns dict of holes read from '.../layers/drill/features' file of .tgz (holeName: [(x1, y1), (x2, y2)...])
+        '''
         return self.holes
-    
+
+    def _parseNetListFile(self, extractedFile):
+        '''
+        Parses '.../netlists/cadnet/netlist' file into self.netPins. Pins are matched with components by getNets
+        '''
+        netnameDict = {}
+        fileLines = self._iterLines(extractedFile)
+        for line in fileLines:
+            if len(line) > 0:
+                if line[0] == '$':
+                    buffer = line.split(' ')
+                    key = buffer[0][1:]
+                    name = buffer[1]
+                    netnameDict[key] = name
+                elif line[0].isdigit():
+                    buffer = line.split(' ')
+                    netID = buffer[0]
+                    pinCoords = f'{buffer[2]} {buffer[3]}'
+                    self.netPins.append((netnameDict[netID], pinCoords))
+
     def getNets(self, componentPins):
         '''
-        Gets components from '.../netlists/cadnet/netlist'. Use after getComponents method and pass componentPins from getComponents as input
+        Matches pins read from '.../netlists/cadnet/netlist' with components. Use after getComponents method and pass componentPins from getComponents as input
         Returns dict of nets (netName:{component:[pins]})
         '''
-        with tarfile.open(self.filePath, 'r') as file:
-            with file.extractfile(self.netListFile) as netListFile:
-                netnameDict = {}
-                fileLines = (line.decode('utf-8').replace('\n', '') for line in netListFile.readlines())
-                for line in fileLines:
-                    if len(line) > 0:
-                        if line[0] == '$':
-                            buffer = line.split(' ')
-                            key = buffer[0][1:]
-                            name = buffer[1]
-                            netnameDict[key] = name
-                        elif line[0].isdigit():
-                            buffer = line.split(' ')
-                            netID = buffer[0]
-                            pinCoords = f'{buffer[2]} {buffer[3]}'
-            
-                            netName = netnameDict[netID]
-                            try:
-                                componentName, componentPin = componentPins[pinCoords]
-                            except KeyError:
-                                continue
-                            if netName not in self.nets:
-                                self.nets[netName] = {}
-                            if componentName not in self.nets[netName]:
-                                self.nets[netName][componentName] = []
-                            self.nets[netName][componentName].append(componentPin)
+        for netName, pinCoords in self.netPins:
+            try:
+                componentName, componentPin = componentPins[pinCoords]
+            except KeyError:
+                continue
+            if netName not in self.nets:
+                self.nets[netName] = {}
+            if componentName not in self.nets[netName]:
+                self.nets[netName][componentName] = []
+            self.nets[netName][componentName].append(componentPin)
         return self.nets
 
     def getBoardOutlines(self):
         '''
-        Opens file '.../layers/outline/features' or '.../profile' inside .tgz file and gets board shape data.
+        Returns board shape data read from '.../layers/outline/features' or (if it is not present) '.../profile' file.
         Returns dict {'AREA':[(x1, y1), (x2, y2)], 'LINES':[[(x11, y11), (x12, y12)], [(x21, y21), (x22, y22)], ...], 'ARCS':[[(x11, y11), (x12, y12), (x13, y13)], ...]}
         '''
-        if 'profile' in self.dimensionFile:
-            minX, minY, maxX, maxY = self.extractProfileFile()
-        else:
-            with tarfile.open(self.filePath, 'r') as file:
-                with file.extractfile(self.dimensionFile) as outlineFile:
-                    fileLines = (line.decode('utf-8').replace('\n', '') for line in outlineFile.readlines())
-                    
-                    minX, minY = float('Inf'), float('Inf')
-                    maxX, maxY = float('-Inf'), float('-Inf')
-                    for line in fileLines:
-                        if line and line[0] in ('A', 'L'):
-                            buffer = line.split(' ')
-                            shape = buffer[0]
-                            if shape == 'A':
-                                point1 = float(buffer[1]), float(buffer[2])
-                                point2 = float(buffer[3]), float(buffer[4])
-                                point3 = float(buffer[5]), float(buffer[6])
-                                self.boardOutlines['ARCS'].append([point1, point2, point3])
-                            elif shape == 'L':
-                                point1 = float(buffer[1]), float(buffer[2])
-                                point2 = float(buffer[3]), float(buffer[4])
-                                self.boardOutlines['LINES'].append([point1, point2])
-
-                                minX = min(minX, point1[0], point2[0])
-                                maxX = max(maxX, point1[0], point2[0])
-                                minY = min(minY, point1[1], point2[1])
-                                maxY = max(maxY, point1[1], point2[1])
-
-        self.boardOutlines['AREA'] = [(minX, minY), (maxX, maxY)]
-
+        self.boardOutlines = self.outlines.get('OUTLINE') or self.outlines['PROFILE']
         return self.boardOutlines
-    
-    def extractProfileFile(self):
-        '''
-        Opens file '.../profile' inside .tgz file and gets board shape data.
-        Returns minX, minY, maxX, maxY
-        '''
-        with tarfile.open(self.filePath, 'r') as file:
-            with file.extractfile(self.dimensionFile) as outlineFile:
-                fileLines = (line.decode('utf-8').replace('\n', '') for line in outlineFile.readlines())
-
-                minX, minY = float('Inf'), float('Inf')
-                maxX, maxY = float('-Inf'), float('-Inf')
-                pointCoordsQueue = []
-                for line in fileLines:
-                    if line and line[0] in ('O',):
-                        buffer = line.split(' ')
-                        shape = buffer[0]
-                        if shape == 'OC':
-                            point1 = pointCoordsQueue.pop(0)
-                            point2 = float(buffer[1]), float(buffer[2])
-                            point3 = float(buffer[3]), float(buffer[4])
-                            self.boardOutlines['ARCS'].append([point1, point2, point3])
-
-                            pointCoordsQueue.append(point3)
-                        else:
-                            try:
-                                point = float(buffer[1]), float(buffer[2])
-                            except IndexError:
-                                continue
-                            pointCoordsQueue.append(point)
-                            if len(pointCoordsQueue) == 2:
-                                point1, point2 = pointCoordsQueue
-                                self.boardOutlines['LINES'].append([point1, point2])
-
-                                minX = min(minX, point1[0], point2[0])
-                                maxX = max(maxX, point1[0], point2[0])
-                                minY = min(minY, point1[1], point2[1])
-                                maxY = max(maxY, point1[1], point2[1])
-                                pointCoordsQueue.pop(0)
-        return minX, minY, maxX, maxY                     
-            
+
+    def _parseOutlineFile(self, extractedFile):
+        '''
+        Parses '.../layers/outline/features' file into self.outlines['OUTLINE']
+        '''
+        boardOutlines = {'AREA':[], 'LINES':[], 'ARCS':[]}
+        fileLines = self._iterLines(extractedFile)
+
+        minX, minY = float('Inf'), float('Inf')
+        maxX, maxY = float('-Inf'), float('-Inf')
+        for line in fileLines:
+            if line and line[0] in ('A', 'L'):
+                buffer = line.split(' ')
+                shape = buffer[0]
+                if shape == 'A':
+                    point1 = float(buffer[1]), float(buffer[2])
+                    point2 = float(buffer[3]), float(buffer[4])
+                    point3 = float(buffer[5]), float(buffer[6])
+                    boardOutlines['ARCS'].append([point1, point2, point3])
+                elif shape == 'L':
+                    point1 = float(buffer[1]), float(buffer[2])
+                    point2 = float(buffer[3]), float(buffer[4])
+                    boardOutlines['LINES'].append([point1, point2])
+
+                    minX = min(minX, point1[0], point2[0])
+                    maxX = max(maxX, point1[0], point2[0])
+                    minY = min(minY, point1[1], point2[1])
+                    maxY = max(maxY, point1[1], point2[1])
+
+        boardOutlines['AREA'] = [(minX, minY), (maxX, maxY)]
+        self.outlines['OUTLINE'] = boardOutlines
+
+    def _parseProfileFile(self, extractedFile):
+        '''
+        Parses '.../profile' file into self.outlines['PROFILE']
+        '''
+        boardOutlines = {'AREA':[], 'LINES':[], 'ARCS':[]}
+        fileLines = self._iterLines(extractedFile)
+
+        minX, minY = float('Inf'), float('Inf')
+        maxX, maxY = float('-Inf'), float('-Inf')
+        pointCoordsQueue = []
+        for line in fileLines:
+            if line and line[0] in ('O',):
+                buffer = line.split(' ')
+                shape = buffer[0]
+                if shape == 'OC':
+                    point1 = pointCoordsQueue.pop(0)
+                    point2 = float(buffer[1]), float(buffer[2])
+                    point3 = float(buffer[3]), float(buffer[4])
+                    boardOutlines['ARCS'].append([point1, point2, point3])
+
+                    pointCoordsQueue.append(point3)
+                else:
+                    try:
+                        point = float(buffer[1]), float(buffer[2])
+                    except IndexError:
+                        continue
+                    pointCoordsQueue.append(point)
+                    if len(pointCoordsQueue) == 2:
+                        point1, point2 = pointCoordsQueue
+                        boardOutlines['LINES'].append([point1, point2])
+
+                        minX = min(minX, point1[0], point2[0])
+                        maxX = max(maxX, point1[0], point2[0])
+                        minY = min(minY, point1[1], point2[1])
+                        maxY = max(maxY, point1[1], point2[1])
+                        pointCoordsQueue.pop(0)
+
+        boardOutlines['AREA'] = [(minX, minY), (maxX, maxY)]
+        self.outlines['PROFILE'] = boardOutlines
+
+def parseMember(testPointPrefix, memberType, data):
+    '''
+    Parses content of one tar member in the process of the pool (see OdbPlusPlusv7FileLoader.readFile). Returns parsed data
+        testPointPrefix - unique string common for all testpoints
+        memberType - type of the member (see OdbPlusPlusv7FileLoader.MEMBER_TYPES)
+        data - bytes of the member
+    '''
+    loader = OdbPlusPlusv7FileLoader(testPointPrefix)
+    loader._parseMember(memberType, io.BytesIO(data))
+    return loader._getParsedData(memberType)
+
 if __name__ == '__main__':
     a = OdbPlusPlusv7FileLoader()
     a.getFile('odb_15020617_01.tgz') #660891125.tgz
+    a.readFile()
     a.getBoardOutlines()
     a.getHoles()
     maxX = a.findComponentLayerScale()
     scalingFactor = a.boardOutlines['AREA'][1][0] / maxX
     _, pins = a.getComponents(scalingFactor=scalingFactor)
     a.getNets(pins)
-    
+
     print(a.boardOutlines['AREA'], scalingFactor)
 
     #b = OdbPlusPlusv7FileLoader()
-    #b.loadSchematic('odb_15020617_01.tgz')
\ No newline at end of file
+    #b.loadSchematic('odb_15020617_01.tgz')
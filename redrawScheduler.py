@@ -0,0 +1,55 @@
+import time
+
+class RedrawScheduler():
+    '''
+    Coalesces redraw requests of tkinter widget. Every request only marks the view as dirty - the redraw is scheduled with widget.after() and
+    all requests made before it is executed are merged into one redraw. Redraws are limited to maxFPS frames per second.
+    '''
+    def __init__(self, widget, redrawCallback, maxFPS):
+        '''
+        Creates RedrawScheduler instance. Attributes:
+            self.widget - tkinter widget used for scheduling (after, after_cancel)
+            self.redrawCallback - function that draws current state of the view
+            self.frameInterval - min time between two redraws in seconds (1 / maxFPS)
+            self.isDirty - True if redraw was requested and not executed yet
+            self.job - id of scheduled after() job or None
+            self.lastFrameTime - time.perf_counter() value of the last redraw
+        '''
+        self.widget = widget
+        self.redrawCallback = redrawCallback
+        self.frameInterval = 1 / maxFPS
+        self.isDirty = False
+        self.job = None
+        self.lastFrameTime = float('-Inf')
+
+    def requestRedraw(self):
+        '''
+        Marks the view as dirty and schedules redraw if it is not scheduled yet. Redraw is delayed so that time between frames is not shorter than self.frameInterval
+        '''
+        self.isDirty = True
+        if self.job is not None:
+            return
+
+        delay = max(0, self.lastFrameTime + self.frameInterval - time.perf_counter())
+        self.job = self.widget.after(int(delay * 1000), self._redraw)
+
+    def cancel(self):
+        '''
+        Cancels scheduled redraw
+        '''
+        if self.job is not None:
+            self.widget.after_cancel(self.job)
+            self.job = None
+        self.isDirty = False
+
+    def _redraw(self):
+        '''
+        Executes scheduled redraw if view is still dirty
+        '''
+        self.job = None
+        if not self.isDirty:
+            return
+
+        self.isDirty = False
+        self.lastFrameTime = time.perf_counter()
+        self.redrawCallback()
@@ -0,0 +1,134 @@
+import hashlib
+import os
+import pickle
+import tempfile
+
+class SchematicCache():
+    '''
+    On-disk cache of parsed schematic files. Data returned by a loader is stored in binary (pickle) files named after the key, which is made of
+    content hash of the source file, version of the loaders and testpoints' prefix, so changed files are parsed again.
+    Least recently used files are removed when size of the cache exceeds its limit.
+    '''
+    FILE_EXTENSION = '.cache'
+    HASH_CHUNK_SIZE = 1024 * 1024
+    DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+
+    def __init__(self, cacheDirectory=None, maxSize=DEFAULT_MAX_SIZE):
+        '''
+        Creates SchematicCache instance. Attributes:
+            self.cacheDirectory - directory of cache files (None -> Cache directory in working directory of the first use of the cache, see getCacheDirectory).
+                                  It is created on first save
+            self.maxSize - max number of bytes used by cache files
+        '''
+        self.cacheDirectory = cacheDirectory
+        self.maxSize = maxSize
+
+    def getCacheDirectory(self):
+        '''
+        Returns directory of cache files. Default directory is resolved on first use (not when the cache is created), so it follows working directory
+        set by the application
+        '''
+        if self.cacheDirectory is None:
+            self.cacheDirectory = os.path.join(os.getcwd(), 'Cache')
+        return self.cacheDirectory
+
+    @staticmethod
+    def getKey(filePath, loaderVersion, testPointPrefix):
+        '''
+        Returns key of the file (hex string) made of its content hash, version of the loaders and testpoints' prefix
+        '''
+        fileHash = hashlib.sha256()
+        with open(filePath, 'rb') as file:
+            for chunk in iter(lambda: file.read(SchematicCache.HASH_CHUNK_SIZE), b''):
+                fileHash.update(chunk)
+
+        key = hashlib.sha256()
+        key.update(f'{loaderVersion}\0{testPointPrefix}\0'.encode('utf-8'))
+        key.update(fileHash.digest())
+        return key.hexdigest()
+
+    def _getCacheFilePath(self, key):
+        return os.path.join(self.getCacheDirectory(), key + SchematicCache.FILE_EXTENSION)
+
+    def load(self, key):
+        '''
+        Returns data stored under the key or None if there is no such (or readable) cache file. Modification time of the file is updated, so it is
+        removed as the last one
+        '''
+        cacheFilePath = self._getCacheFilePath(key)
+        try:
+            with open(cacheFilePath, 'rb') as file:
+                data = pickle.load(file)
+            os.utime(cacheFilePath)
+            return data
+        except FileNotFoundError:
+            return None
+        except Exception:
+            ## damaged or foreign file (unpickling may raise almost any exception, e.g. ValueError of unsupported protocol) - remove it so that
+            ## the schematic is parsed and saved again
+            self._removeFile(cacheFilePath)
+            return None
+
+    def save(self, key, data):
+        '''
+        Stores data under the key and removes least recently used files if the cache is too big. Errors of writing are ignored, because cache is optional
+        '''
+        try:
+            cacheDirectory = self.getCacheDirectory()
+            os.makedirs(cacheDirectory, exist_ok=True)
+            ## write to temporary file first, so other processes never read partially written file
+            fileDescriptor, temporaryPath = tempfile.mkstemp(dir=cacheDirectory, suffix='.tmp')
+            try:
+                with os.fdopen(fileDescriptor, 'wb') as file:
+                    pickle.dump(data, file, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(temporaryPath, self._getCacheFilePath(key))
+            except BaseException:
+                self._removeFile(temporaryPath)
+                raise
+            self.evict()
+        except OSError:
+            pass
+
+    def evict(self):
+        '''
+        Removes least recently used (read or written) cache files until their total size is not bigger than self.maxSize
+        '''
+        cacheFiles = []
+        for cacheFilePath in self._listCacheFiles():
+            try:
+                fileStat = os.stat(cacheFilePath)
+            except OSError:
+                continue
+            cacheFiles.append((fileStat.st_mtime, fileStat.st_size, cacheFilePath))
+
+        usedSize = sum([fileSize for _, fileSize, _ in cacheFiles])
+        for _, fileSize, cacheFilePath in sorted(cacheFiles):
+            if usedSize <= self.maxSize:
+                break
+            self._removeFile(cacheFilePath)
+            usedSize -= fileSize
+
+    def clear(self):
+        '''
+        Removes all cache files
+        '''
+        for cacheFilePath in self._listCacheFiles():
+            self._removeFile(cacheFilePath)
+
+    def _listCacheFiles(self):
+        '''
+        Returns list of paths of cache files (empty list if the cache directory does not exist)
+        '''
+        cacheDirectory = self.getCacheDirectory()
+        try:
+            fileNames = os.listdir(cacheDirectory)
+        except OSError:
+            return []
+        return [os.path.join(cacheDirectory, fileName) for fileName in fileNames if fileName.endswith(SchematicCache.FILE_EXTENSION)]
+
+    @staticmethod
+    def _removeFile(filePath):
+        try:
+            os.remove(filePath)
+        except OSError:
+            pass
@@ -1,24 +1,63 @@
 import camcadFileLoader
 import gencadFileLoader
 import obpPlusPlusv7FileLoader
+import schematicCache
+import boardFileLoader
 import os
 
 class SchematicLoader():
+    ## change when data returned by any of the loaders changes, so old cache files are not used
+    LOADER_VERSION = 1
+    cache = schematicCache.SchematicCache()
+
+    @staticmethod
+    def loadSchematic(name, path='Schematic', testPointPrefix='TP', progressCallback=None, useCache=True, parallel=False):
+        '''
+        Recognizes format of the file and loads it with matching loader. Returns components, nets, holes, boardOutlines, pads, packages
+            progressCallback - function called by the loader before each section (or tar member) is processed with arguments (sectionName, stepNumber, stepsCount).
+                               Exception raised by it stops loading
+            useCache = True/False - if True data is read from SchematicLoader.cache when the file was already parsed with the same testPointPrefix
+                                    and parsed data is stored there. Board files (.bnb) are never cached
+            parallel = True/False - if True members of ODB++ files are parsed in a process pool (see OdbPlusPlusv7FileLoader.readFile)
+        '''
+        if not useCache or name.lower().endswith(boardFileLoader.BoardFileLoader.FILE_EXTENSION):
+            return SchematicLoader._parseSchematic(name, path, testPointPrefix, progressCallback, parallel)
+
+        filePath = os.path.join(os.getcwd(), path, name)
+        key = SchematicLoader.cache.getKey(filePath, SchematicLoader.LOADER_VERSION, testPointPrefix)
+        data = SchematicLoader.cache.load(key)
+        ## foreign file that is a valid pickle but not data of a loader is a cache miss as well
+        if isinstance(data, tuple) and len(data) == 6:
+            if progressCallback:
+                progressCallback('cache', 0, 1)
+            return data
+
+        data = SchematicLoader._parseSchematic(name, path, testPointPrefix, progressCallback, parallel)
+        if data is not None:
+            SchematicLoader.cache.save(key, data)
+        return data
+
     @staticmethod
-    def loadSchematic(name, path='Schematic', testPointPrefix='TP'):
+    def _parseSchematic(name, path, testPointPrefix, progressCallback, parallel=False):
+        '''
+        Parses the file with loader matching its format. Returns components, nets, holes, boardOutlines, pads, packages
+        '''
         filePath = os.path.join(os.getcwd(), path, name)
-        if '.tgz' in name:
+        if name.lower().endswith(boardFileLoader.BoardFileLoader.FILE_EXTENSION):
+            schematic = boardFileLoader.BoardFileLoader()
+            return schematic.loadSchematic(name, path, progressCallback)
+        elif '.tgz' in name:
             schematic = obpPlusPlusv7FileLoader.OdbPlusPlusv7FileLoader(testPointPrefix)
-            return schematic.loadSchematic(name, path)
+            return schematic.loadSchematic(name, path, progressCallback, parallel)
         else:
             with open(filePath, 'r') as file:
                 char = file.read(1)
                 if char == ';':
                     schematic = camcadFileLoader.CamCADLoader()
-                    return schematic.loadSchematic(name, path)
+                    return schematic.loadSchematic(name, path, progressCallback)
                 elif char == '$':
                     schematic = gencadFileLoader.GenCADLoader()
-                    return schematic.loadSchematic(name, path)
+                    return schematic.loadSchematic(name, path, progressCallback)
 
 if __name__ == '__main__':
     data = SchematicLoader.loadSchematic('nexyM.gcd')
@@ -0,0 +1,91 @@
+import math
+
+class SpatialGrid():
+    '''
+    Uniform grid spatial index. Plane is divided into square cells and every item is stored in each cell that its bounding box overlaps.
+    Querying an area visits only cells overlapped by that area, so the cost of a query depends on the local density of items and not on the size of the board.
+    '''
+    MAX_CELLS_PER_ITEM = 256
+
+    def __init__(self, cellSize):
+        '''
+        Creates SpatialGrid instance. Attributes:
+            self.cellSize - length of the cell edge (in the same units as inserted areas)
+            self.cells - dict of cells ((cellX, cellY): [item1, item2, ...])
+            self.oversizedItems - list of items that cover more than MAX_CELLS_PER_ITEM cells. They are returned by every query
+        '''
+        self.cellSize = cellSize
+        self.cells = {}
+        self.oversizedItems = []
+
+    @staticmethod
+    def calculateCellSize(boardArea, itemsCount):
+        '''
+        Calculates cell size so that on average there is about one item per cell. Returns cell size
+            boardArea - [(x1, y1), (x2, y2)] - area covered by items
+            itemsCount - number of items to be inserted
+        '''
+        (x1, y1), (x2, y2) = boardArea
+        area = abs(x2 - x1) * abs(y2 - y1)
+        if not area or not itemsCount:
+            return 1
+        return math.sqrt(area / itemsCount)
+
+    def _cellRange(self, area):
+        '''
+        Helper method that returns range of cells in X axis and range of cells in Y axis that are overlapped by the area
+            area - ((minX, maxX), (minY, maxY))
+        '''
+        (minX, maxX), (minY, maxY) = area
+        xRange = range(math.floor(minX / self.cellSize), math.floor(maxX / self.cellSize) + 1)
+        yRange = range(math.floor(minY / self.cellSize), math.floor(maxY / self.cellSize) + 1)
+        return xRange, yRange
+
+    def insert(self, item, area):
+        '''
+        Inserts item into every cell overlapped by the area
+            item - any hashable object (e.g. index of the component)
+            area - ((minX, maxX), (minY, maxY)) - bounding box of the item
+        '''
+        xRange, yRange = self._cellRange(area)
+        if len(xRange) * len(yRange) > SpatialGrid.MAX_CELLS_PER_ITEM:
+            self.oversizedItems.append(item)
+            return
+
+        for cellX in xRange:
+            for cellY in yRange:
+                key = cellX, cellY
+                if key not in self.cells:
+                    self.cells[key] = []
+                self.cells[key].append(item)
+
+    def query(self, area):
+        '''
+        Returns set of items stored in cells overlapped by the area. Items must be checked for exact collision by the caller
+            area - ((minX, maxX), (minY, maxY))
+        '''
+        xRange, yRange = self._cellRange(area)
+        foundItems = set(self.oversizedItems)
+
+        ## area bigger than the grid itself - iterate over existing cells only
+        if len(xRange) * len(yRange) > len(self.cells):
+            for (cellX, cellY), items in self.cells.items():
+                if cellX in xRange and cellY in yRange:
+                    foundItems.update(items)
+            return foundItems
+
+        for cellX in xRange:
+            for cellY in yRange:
+                items = self.cells.get((cellX, cellY))
+                if items:
+                    foundItems.update(items)
+        return foundItems
+
+    def queryPoint(self, coords, tolerance=0):
+        '''
+        Returns set of items stored in cells overlapped by the square with center in coords
+            coords - (x, y)
+            tolerance - half of the square edge
+        '''
+        x, y = coords
+        return self.query(((x - tolerance, x + tolerance), (y - tolerance, y + tolerance)))
@@ -0,0 +1,39 @@
+import os
+import tempfile
+import unittest
+import boardFileLoader
+import boardGenerator
+import schematicLoader
+
+class BoardFileRoundTripTest(unittest.TestCase):
+    '''
+    Data loaded from a saved .bnb file must be equal to data returned by the loader of the source file (including types of angles)
+    '''
+    SCHEMATIC_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Schematic')
+
+    def assertRoundTrip(self, filePath):
+        schematicData = schematicLoader.SchematicLoader.loadSchematic(filePath, useCache=False)
+        with tempfile.TemporaryDirectory() as directory:
+            boardFileName = 'board' + boardFileLoader.BoardFileLoader.FILE_EXTENSION
+            boardFileLoader.BoardFileLoader.saveSchematic(os.path.join(directory, boardFileName), *schematicData[:4])
+            boardData = boardFileLoader.BoardFileLoader().loadSchematic(boardFileName, directory)
+
+        for loadedData, boardFileData in zip(schematicData[:4], boardData[:4]):
+            self.assertEqual(loadedData, boardFileData)
+
+    def testGenCAD(self):
+        ## angles are texts
+        self.assertRoundTrip(os.path.join(BoardFileRoundTripTest.SCHEMATIC_DIRECTORY, 'sample1.gcd'))
+
+    def testSyntheticFormats(self):
+        ## ODB++ angles are floats
+        with tempfile.TemporaryDirectory() as directory:
+            generator = boardGenerator.SyntheticBoardGenerator(300, 100, seed=1)
+            for extension in ('.cad', '.gcd', '.tgz'):
+                filePath = os.path.join(directory, 'synthetic' + extension)
+                generator.write(filePath)
+                with self.subTest(extension=extension):
+                    self.assertRoundTrip(filePath)
+
+if __name__ == '__main__':
+    unittest.main()
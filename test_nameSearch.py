@@ -0,0 +1,33 @@
+import unittest
+import nameSearch
+
+class NameSearchIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.names = [(f'C{i}', 'COMPONENT') for i in range(1, 20001)] + [(f'TP{i}', 'TESTPOINT') for i in range(1, 100)] + [('GND', 'NET')]
+        self.index = nameSearch.NameSearchIndex(self.names)
+
+    def searchNames(self, query, limit=20):
+        return [name for name, _ in self.index.search(query, limit)]
+
+    def testPrefixMatchesAreRankedByLengthBeforeLimit(self):
+        ## C11-C19 are shorter than C100, so they are ranked before names that come earlier alphabetically
+        expected = ['C1'] + [f'C1{i}' for i in range(10)] + [f'C1{i:02}' for i in range(9)]
+        self.assertEqual(self.searchNames('C1'), expected)
+
+    def testExactMatchIsFirst(self):
+        self.assertEqual(self.searchNames('c1234', limit=3), ['C1234', 'C12340', 'C12341'])
+        self.assertEqual(self.index.search('gnd', limit=1), [('GND', 'NET')])
+
+    def testTypedQueryMatchesNewSearch(self):
+        ## ranges of previous queries must not change results of the next (extending or not) query
+        newIndex = nameSearch.NameSearchIndex(self.names)
+        for query in ('T', 'TP', 'TP1', 'TP', 'C', 'C2', 'TP1'):
+            newIndex.lastQuery = '\0'
+            self.assertEqual(self.index.search(query, 20), newIndex.search(query, 20))
+
+    def testFuzzyMatchesOnlyWithoutPrefixMatches(self):
+        self.assertEqual(self.searchNames('C19999'), ['C19999'])
+        self.assertIn('C19999', self.searchNames('C1999x'))
+
+if __name__ == '__main__':
+    unittest.main()
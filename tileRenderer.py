@@ -0,0 +1,149 @@
+import collections
+import pygame
+
+class LayerTile(pygame.Surface):
+    '''
+    Surface that is a part of a bigger layer. Points rendered on it are moved by its origin and mirrored with the width of the whole layer.
+    '''
+    def __init__(self, size, origin, layerWidth):
+        '''
+        Creates LayerTile instance. Attributes:
+            size - (width, height) of the tile
+            self.origin - (x, y) coords of the top-left corner of the tile in the layer
+            self.layerWidth - width of the whole layer
+        '''
+        super().__init__(size)
+        self.origin = origin
+        self.layerWidth = layerWidth
+
+class TileCache():
+    '''
+    Cache of rendered tiles. Least recently used tiles are removed when memory used by tiles exceeds memory budget.
+    '''
+    def __init__(self, memoryBudget):
+        '''
+        Creates TileCache instance. Attributes:
+            self.tiles - OrderedDict of tiles (key: LayerTile), key is (side, zoomScale, rotationAngle, tileX, tileY)
+            self.memoryBudget - max number of bytes used by tiles
+            self.usedMemory - number of bytes used by tiles
+        '''
+        self.tiles = collections.OrderedDict()
+        self.memoryBudget = memoryBudget
+        self.usedMemory = 0
+
+    def get(self, key):
+        '''
+        Returns tile of given key and marks it as recently used. If tile is not cached then None is returned
+        '''
+        tile = self.tiles.get(key)
+        if tile is not None:
+            self.tiles.move_to_end(key)
+        return tile
+
+    def put(self, key, tile):
+        '''
+        Adds tile to the cache and removes least recently used tiles if memory budget is exceeded
+        '''
+        self.tiles[key] = tile
+        self.usedMemory += tile.get_width() * tile.get_height() * tile.get_bytesize()
+
+        while self.usedMemory > self.memoryBudget and len(self.tiles) > 1:
+            _, oldTile = self.tiles.popitem(last=False)
+            self.usedMemory -= oldTile.get_width() * oldTile.get_height() * oldTile.get_bytesize()
+
+    def clear(self):
+        '''
+        Removes all tiles
+        '''
+        self.tiles.clear()
+        self.usedMemory = 0
+
+class TiledLayer():
+    '''
+    Board layer split into square tiles. Layer is never allocated as a whole - only tiles visible on the target surface are rendered and cached.
+    Implements get_width, get_height and get_size methods so it can be used in place of a pygame surface when calculating coords.
+    '''
+    def __init__(self, size, key, tileCache, renderCallback, tileSize=256):
+        '''
+        Creates TiledLayer instance. Attributes:
+            size - (width, height) of the whole layer
+            key - tuple that identifies the layer content in the tileCache (side, zoomScale, rotationAngle)
+            tileCache - TileCache instance
+            renderCallback - function that renders layer content on given LayerTile
+            tileSize - edge length of the tile in px
+        '''
+        self.width, self.height = int(size[0]), int(size[1])
+        self.key = key
+        self.tileCache = tileCache
+        self.renderCallback = renderCallback
+        self.tileSize = tileSize
+
+    def get_width(self):
+        return self.width
+
+    def get_height(self):
+        return self.height
+
+    def get_size(self):
+        return self.width, self.height
+
+    def _visibleTiles(self, targetSize, offset):
+        '''
+        Returns list of (tileX, tileY) tiles that are visible on the target surface when the layer is blitted at offset
+            targetSize - (width, height) of the target surface
+            offset - (x, y) position of the layer on the target surface
+        '''
+        targetWidth, targetHeight = targetSize
+        offsetX, offsetY = offset
+
+        ## visible part of the layer limited to the layer size
+        minX, maxX = max(0, -offsetX), min(self.width, targetWidth - offsetX)
+        minY, maxY = max(0, -offsetY), min(self.height, targetHeight - offsetY)
+        if minX >= maxX or minY >= maxY:
+            return []
+
+        xRange = range(int(minX) // self.tileSize, (int(maxX) - 1) // self.tileSize + 1)
+        yRange = range(int(minY) // self.tileSize, (int(maxY) - 1) // self.tileSize + 1)
+        return [(tileX, tileY) for tileX in xRange for tileY in yRange]
+
+    def _tileRect(self, tileX, tileY):
+        '''
+        Returns pygame.Rect of the tile in the layer coords. Tiles on the right and bottom edges of the layer are cut to the layer size
+        '''
+        x, y = tileX * self.tileSize, tileY * self.tileSize
+        return pygame.Rect(x, y, min(self.tileSize, self.width - x), min(self.tileSize, self.height - y))
+
+    def _renderTiles(self, tiles):
+        '''
+        Renders given tiles with one call of renderCallback (on the region that covers all of them), cuts the region into tiles and puts them into cache.
+        Returns dict of rendered tiles ((tileX, tileY): LayerTile)
+        '''
+        rects = {tile: self._tileRect(*tile) for tile in tiles}
+        region = pygame.Rect(rects[tiles[0]]).unionall(list(rects.values()))
+
+        regionSurface = LayerTile(region.size, region.topleft, self.width)
+        self.renderCallback(regionSurface)
+
+        renderedTiles = {}
+        for tile, rect in rects.items():
+            layerTile = LayerTile(rect.size, rect.topleft, self.width)
+            layerTile.blit(regionSurface, (0, 0), area=rect.move(-region.x, -region.y))
+            self.tileCache.put(self.key + tile, layerTile)
+            renderedTiles[tile] = layerTile
+        return renderedTiles
+
+    def blitTo(self, targetSurface, offset):
+        '''
+        Blits visible tiles of the layer into the target surface. Tiles missing in the cache are rendered first
+            targetSurface - pygame surface
+            offset - (x, y) position of the layer on the target surface
+        '''
+        offsetX, offsetY = int(offset[0]), int(offset[1]) # the same rounding as pygame uses for blit position of the whole layer
+        visibleTiles = {tile: self.tileCache.get(self.key + tile) for tile in self._visibleTiles(targetSurface.get_size(), (offsetX, offsetY))}
+        missingTiles = [tile for tile, layerTile in visibleTiles.items() if layerTile is None]
+        if missingTiles:
+            visibleTiles.update(self._renderTiles(missingTiles))
+
+        for layerTile in visibleTiles.values():
+            tileX, tileY = layerTile.origin
+            targetSurface.blit(layerTile, (tileX + offsetX, tileY + offsetY))
@@ -0,0 +1,124 @@
+import tkinter as tk
+
+class VirtualListbox():
+    '''
+    Virtual scrolling for tkinter Listbox. Listbox holds only rows that are visible (its height), items are kept in a python list and visible rows
+    are replaced when the list is scrolled, so the number of items does not change the cost of filling and scrolling the listbox.
+    Clicking and keyboard selection work on visible rows, so listbox.get(listbox.curselection()) returns selected item as usual.
+    '''
+    def __init__(self, listbox, scrollbar=None):
+        '''
+        Creates VirtualListbox instance. Attributes:
+            self.listbox - tkinter Listbox that shows visible items. Its height is the number of visible rows
+            self.scrollbar - tkinter Scrollbar updated with position of visible rows (or None). Its command should call self.yview
+            self.items - list of all items
+            self.firstIndex - index of item shown in the first row of the listbox
+            self.selectedIndex - index of selected item or None
+        '''
+        self.listbox = listbox
+        self.scrollbar = scrollbar
+        self.items = []
+        self.firstIndex = 0
+        self.selectedIndex = None
+
+        self.listbox.bind('<<ListboxSelect>>', lambda event: self._updateSelectedIndex())
+        self.listbox.bind('<MouseWheel>', lambda event: self.scroll(-1 if event.delta > 0 else 1, 'units'))
+        self.listbox.bind('<Button-4>', lambda event: self.scroll(-1, 'units'))
+        self.listbox.bind('<Button-5>', lambda event: self.scroll(1, 'units'))
+        self.listbox.bind('<Up>', lambda event: self._moveSelection(-1))
+        self.listbox.bind('<Down>', lambda event: self._moveSelection(1))
+        self.listbox.bind('<Prior>', lambda event: self.scroll(-1, 'pages'))
+        self.listbox.bind('<Next>', lambda event: self.scroll(1, 'pages'))
+
+    @property
+    def rowsCount(self):
+        return int(self.listbox['height'])
+
+    def setItems(self, items):
+        '''
+        Replaces all items and scrolls to the top
+        '''
+        self.items = items
+        self.firstIndex = 0
+        self.selectedIndex = None
+        self._render()
+
+    def see(self, index):
+        '''
+        Scrolls the list so that item of given index is visible
+        '''
+        if index < self.firstIndex:
+            self.firstIndex = index
+        elif index >= self.firstIndex + self.rowsCount:
+            self.firstIndex = index - self.rowsCount + 1
+        self._render()
+
+    def select(self, index):
+        '''
+        Selects item of given index (or clears selection if index is None)
+        '''
+        self.selectedIndex = index
+        self._render()
+
+    def clearSelection(self):
+        self.select(None)
+
+    def yview(self, *args):
+        '''
+        Command of the scrollbar. Arguments are the same as for Listbox.yview: ('moveto', fraction) or ('scroll', number, 'units' or 'pages')
+        '''
+        if args[0] == 'moveto':
+            self.firstIndex = int(float(args[1]) * len(self.items))
+            self._render()
+        elif args[0] == 'scroll':
+            self.scroll(int(args[1]), args[2])
+
+    def scroll(self, number, what='units'):
+        '''
+        Scrolls the list by number of rows ('units') or visible pages ('pages'). Returns 'break', so default bindings of the listbox are not used
+        '''
+        rows = number * self.rowsCount if what == 'pages' else number
+        self.firstIndex += rows
+        self._render()
+        return 'break'
+
+    def _moveSelection(self, delta):
+        '''
+        Moves selection by delta rows and scrolls to it. Generates <<ListboxSelect>> like keyboard navigation of Listbox
+        '''
+        if not self.items:
+            return 'break'
+        if self.selectedIndex is None:
+            self.selectedIndex = self.firstIndex
+        else:
+            self.selectedIndex = min(max(self.selectedIndex + delta, 0), len(self.items) - 1)
+        self.see(self.selectedIndex)
+        self.listbox.activate(self.selectedIndex - self.firstIndex)
+        self.listbox.event_generate('<<ListboxSelect>>')
+        return 'break'
+
+    def _updateSelectedIndex(self):
+        '''
+        Saves index of item selected by clicking on the listbox
+        '''
+        selection = self.listbox.curselection()
+        if selection:
+            self.selectedIndex = self.firstIndex + selection[0]
+
+    def _render(self):
+        '''
+        Replaces rows of the listbox with visible items and updates the scrollbar
+        '''
+        self.firstIndex = min(max(self.firstIndex, 0), max(len(self.items) - self.rowsCount, 0))
+        lastIndex = min(self.firstIndex + self.rowsCount, len(self.items))
+
+        self.listbox.delete(0, tk.END)
+        self.listbox.insert(0, *self.items[self.firstIndex:lastIndex])
+        if self.selectedIndex is not None and self.firstIndex <= self.selectedIndex < lastIndex:
+            self.listbox.select_set(self.selectedIndex - self.firstIndex)
+
+        if self.scrollbar:
+            if self.items:
+                self.scrollbar.set(self.firstIndex / len(self.items), lastIndex / len(self.items))
+            else:
+                self.scrollbar.set(0, 1)